@@ -0,0 +1,111 @@
+"""
+Build time of a COCO-style SingularDataset (one image + several bboxes per sample) through:
+    - `SingularDataset.from_lists`, with an `Element` per row (what providers used to do),
+    - `ElementTableBuilder.append`, one call per row without `Element` objects,
+    - `ElementTableBuilder.extend_columns`, with plain lists.
+The pre-builder path (`Element.to_dict` records passed to `pd.DataFrame`) is timed as well.
+
+Usage:
+    python benchmarks/build_table.py --n-samples 100000 --boxes-per-sample 7
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.dataset import SingularDataset
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.element import Element
+from bridge.utils.constants import INDICES
+from bridge.utils.data_objects import BoundingBox, ClassLabel
+
+
+def raw_rows(n_samples: int, boxes_per_sample: int):
+    images = [(f"{i}_img", i, f"/data/{i:012d}.jpg", {"width": 640, "height": 480}) for i in range(n_samples)]
+    boxes = [
+        (f"{i}_{j}", i, BoundingBox(np.array([0.0, 0.0, 10.0, 10.0]), ClassLabel(j)), {"area": 100.0, "iscrowd": 0})
+        for i in range(n_samples)
+        for j in range(boxes_per_sample)
+    ]
+    return images, boxes
+
+
+def with_elements(images, boxes, from_records: bool):
+    image_elements = [
+        Element(
+            element_id=e_id,
+            sample_id=s_id,
+            etype="image",
+            load_mechanism=LoadMechanism.from_url_string(url, "image"),
+            metadata=meta,
+        )
+        for e_id, s_id, url, meta in images
+    ]
+    box_elements = [
+        Element(element_id=e_id, sample_id=s_id, etype="bbox", load_mechanism=LoadMechanism(box, "obj"), metadata=meta)
+        for e_id, s_id, box, meta in boxes
+    ]
+    if from_records:
+        samples_df = pd.DataFrame([e.to_dict() for e in image_elements]).set_index(INDICES)
+        annotations_df = pd.DataFrame([e.to_dict() for e in box_elements]).set_index(INDICES)
+        return SingularDataset(samples_df, annotations_df)
+    return SingularDataset.from_lists(image_elements, box_elements)
+
+
+def with_append(images, boxes):
+    image_builder, box_builder = ElementTableBuilder(), ElementTableBuilder()
+    for e_id, s_id, url, meta in images:
+        image_builder.append_load_mechanism(e_id, s_id, "image", LoadMechanism.from_url_string(url, "image"), **meta)
+    for e_id, s_id, box, meta in boxes:
+        box_builder.append(e_id, s_id, "bbox", box, "obj", **meta)
+    return SingularDataset.from_builders(image_builder, box_builder)
+
+
+def with_extend_columns(images, boxes):
+    image_builder, box_builder = ElementTableBuilder(), ElementTableBuilder()
+    image_builder.extend_columns(
+        element_id=[r[0] for r in images],
+        sample_id=[r[1] for r in images],
+        etype="image",
+        url_or_data=[LoadMechanism.from_url_string(r[2], "image").url_or_data for r in images],
+        category="image",
+        width=[r[3]["width"] for r in images],
+        height=[r[3]["height"] for r in images],
+    )
+    box_builder.extend_columns(
+        element_id=[r[0] for r in boxes],
+        sample_id=[r[1] for r in boxes],
+        etype="bbox",
+        url_or_data=[r[2] for r in boxes],
+        category="obj",
+        area=[r[3]["area"] for r in boxes],
+        iscrowd=[r[3]["iscrowd"] for r in boxes],
+    )
+    return SingularDataset.from_builders(image_builder, box_builder)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-samples", type=int, default=100_000)
+    parser.add_argument("--boxes-per-sample", type=int, default=7)
+    args = parser.parse_args()
+
+    images, boxes = raw_rows(args.n_samples, args.boxes_per_sample)
+    paths = {
+        "Element + to_dict records": lambda: with_elements(images, boxes, from_records=True),
+        "Element + from_lists": lambda: with_elements(images, boxes, from_records=False),
+        "builder.append": lambda: with_append(images, boxes),
+        "builder.extend_columns": lambda: with_extend_columns(images, boxes),
+    }
+    print(f"{len(images) + len(boxes)} elements")
+    for name, build in paths.items():
+        start = time.perf_counter()
+        ds = build()
+        print(f"{name:>28}: {time.perf_counter() - start:.2f}s ({len(ds)} samples)")
+
+
+if __name__ == "__main__":
+    main()
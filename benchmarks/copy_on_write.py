@@ -0,0 +1,85 @@
+"""
+Peak memory allocated by common table queries, with Copy-on-Write views vs. defensive deep copies.
+
+The synthetic table mimics a COCO-sized detection dataset: one image element and several bbox elements per sample,
+with `BoundingBox` payloads in the data column.
+
+Usage:
+    python benchmarks/copy_on_write.py --n-samples 120000 --boxes-per-sample 7
+"""
+
+import argparse
+import tracemalloc
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.dataset import SingularDataset
+from bridge.utils.constants import ELEMENT_COLS, INDICES
+from bridge.utils.data_objects import BoundingBox, ClassLabel
+
+
+def synthetic_singular_dataset(n_samples: int, boxes_per_sample: int, first_id: int = 0) -> SingularDataset:
+    sample_ids = np.arange(first_id, first_id + n_samples)
+    images = pd.DataFrame(
+        {
+            ELEMENT_COLS.SAMPLE_ID: sample_ids,
+            ELEMENT_COLS.ID: [f"{i}_img" for i in sample_ids],
+            ELEMENT_COLS.ETYPE: "image",
+            ELEMENT_COLS.LOAD_MECHANISM.CATEGORY: "image",
+            ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA: [f"/data/{i}.jpg" for i in sample_ids],
+            "width": 640,
+        }
+    ).set_index(INDICES)
+    n_boxes = n_samples * boxes_per_sample
+    box = BoundingBox(np.array([0.0, 0.0, 10.0, 10.0]), class_label=ClassLabel(1))
+    annotations = pd.DataFrame(
+        {
+            ELEMENT_COLS.SAMPLE_ID: np.repeat(sample_ids, boxes_per_sample),
+            ELEMENT_COLS.ID: [f"box_{first_id * boxes_per_sample + i}" for i in range(n_boxes)],
+            ELEMENT_COLS.ETYPE: "bbox",
+            ELEMENT_COLS.LOAD_MECHANISM.CATEGORY: "obj",
+            ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA: [box] * n_boxes,
+            "area": np.random.default_rng(0).random(n_boxes),
+        }
+    ).set_index(INDICES)
+    return SingularDataset(images, annotations)
+
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-samples", type=int, default=120_000)
+    parser.add_argument("--boxes-per-sample", type=int, default=7)
+    args = parser.parse_args()
+
+    ds = synthetic_singular_dataset(args.n_samples, args.boxes_per_sample)
+    other = synthetic_singular_dataset(1000, args.boxes_per_sample, first_id=args.n_samples)
+
+    queries = {
+        "elements": lambda: ds.elements,
+        "select(etype == bbox)": lambda: ds.select(lambda e: e[ELEMENT_COLS.ETYPE] == "bbox"),
+        "assign(foo=1)": lambda: ds.assign(foo=1),
+        "merge(small)": lambda: ds.merge(other),
+        "samples view": lambda: ds.samples,
+    }
+    print(f"{len(ds.elements)} elements")
+    print(f"{'query':>24} {'copy-on-write (MB)':>20} {'deep copy (MB)':>16}")
+    for name, query in queries.items():
+        cow = peak_mb(query)
+        with mock.patch("bridge.primitives.dataset.dataset.cow_copy", lambda df: df.copy()):
+            deep = peak_mb(query)
+        print(f"{name:>24} {cow:>20.1f} {deep:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
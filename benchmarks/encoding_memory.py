@@ -0,0 +1,100 @@
+"""
+Memory of an elements table with Python-object id and type columns, versus categorical `element_type` / `category`
+columns (what `Dataset` now stores) and int64-coded ids (`Dataset.encode_ids`). Also times `get` by sample id.
+
+The synthetic table has one image and `--boxes-per-image` bboxes per sample, with string sample ids
+(`f"{img_id:012d}"`) and element ids (`f"{img_id}_img"`, `f"{img_id}_{j}"`), built through `ElementTableBuilder`.
+All elements share one payload object, so the numbers are about the id and type columns.
+
+Usage:
+    python benchmarks/encoding_memory.py --n-elements 10000000
+"""
+
+import argparse
+import gc
+import time
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.dataset import Dataset
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
+from bridge.primitives.element.data.uri_components import URIComponents
+
+
+def build(n_elements: int, boxes_per_image: int) -> pd.DataFrame:
+    per_sample = boxes_per_image + 1
+    n_samples = n_elements // per_sample
+    sample_ids = [f"{i:012d}" for i in range(n_samples)]
+    builder = ElementTableBuilder()
+    payloads = [URIComponents(path="/data/payload")] * n_samples
+    builder.extend_columns(
+        element_id=[f"{i}_img" for i in range(n_samples)],
+        sample_id=sample_ids,
+        etype="image",
+        url_or_data=payloads,
+        category="image",
+    )
+    for j in range(boxes_per_image):
+        builder.extend_columns(
+            element_id=[f"{i}_{j}" for i in range(n_samples)],
+            sample_id=sample_ids,
+            etype="bbox",
+            url_or_data=payloads,
+            category="obj",
+        )
+    return builder.build()
+
+
+def table_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=False).sum() + df.index.memory_usage(deep=True))
+
+
+def time_gets(ds: Dataset, sample_ids, n: int = 2000) -> float:
+    ds.get(sample_ids[0])  # build the sample index
+    start = time.perf_counter()
+    for sample_id in sample_ids[:n]:
+        ds.get(sample_id)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-elements", type=int, default=10_000_000)
+    parser.add_argument("--boxes-per-image", type=int, default=7)
+    args = parser.parse_args()
+
+    raw = build(args.n_elements, args.boxes_per_image)
+    raw_bytes = table_bytes(raw)
+
+    start = time.perf_counter()
+    ds = Dataset(raw)
+    categorize_s = time.perf_counter() - start
+    del raw
+    gc.collect()
+    categorical_bytes = table_bytes(ds._elements)
+    rng = np.random.default_rng(0)
+    probes = rng.choice(ds.sample_index.sample_ids.to_numpy(), size=2000)
+    get_us = time_gets(ds, probes)
+
+    start = time.perf_counter()
+    encoded, codes = ds.encode_ids()
+    encode_s = time.perf_counter() - start
+    del ds
+    gc.collect()
+    encoded_bytes = table_bytes(encoded._elements)
+    dictionary_bytes = sum(int(ids.memory_usage(deep=True)) for ids in codes.ids.values())
+    encoded_get_us = time_gets(encoded, codes.encode("sample_id", probes))
+
+    mb = 2**20
+    print(f"n_elements:                     {len(encoded._elements)}")
+    print(f"object columns:                 {raw_bytes / mb:,.0f} MB")
+    print(f"categorical etype/category:     {categorical_bytes / mb:,.0f} MB (+{categorize_s:.2f}s)")
+    print(f"+ int64 ids:                    {encoded_bytes / mb:,.0f} MB (+{encode_s:.2f}s)")
+    print(f"  reverse dictionary:           {dictionary_bytes / mb:,.0f} MB")
+    print(f"get(sample_id), string ids:     {get_us:.1f}us")
+    print(f"get(sample_id), int64 ids:      {encoded_get_us:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+`Dataset.get` latency for samples with many annotations, e.g. dense detection datasets with hundreds of boxes per
+image. Samples are built from `ElementView`s backed by the table's rows, so this mostly measures how much work is
+done per element.
+
+The synthetic SingularDataset has one image and `--annotations` bboxes per sample, with a few metadata columns on
+both tables. Also times touching every annotation's `id`, `etype` and `metadata` after the get, which decodes the
+views' fields.
+
+Usage:
+    python benchmarks/get_latency.py --samples 1000 --annotations 10 100 300 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bridge.primitives.dataset import SingularDataset
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
+from bridge.primitives.element.data.uri_components import URIComponents
+
+
+def build(n_samples: int, n_annotations: int) -> SingularDataset:
+    sample_ids = np.arange(n_samples)
+    samples, annotations = ElementTableBuilder(), ElementTableBuilder()
+    samples.extend_columns(
+        element_id=[f"img_{i}" for i in sample_ids],
+        sample_id=sample_ids,
+        etype="image",
+        url_or_data=[URIComponents(path=f"/data/{i}.jpg") for i in sample_ids],
+        category="image",
+        width=640,
+        height=480,
+    )
+    box_sample_ids = np.repeat(sample_ids, n_annotations)
+    boxes = np.zeros(4)
+    annotations.extend_columns(
+        element_id=[f"box_{i}_{j}" for i in sample_ids for j in range(n_annotations)],
+        sample_id=box_sample_ids,
+        etype="bbox",
+        url_or_data=[boxes] * len(box_sample_ids),
+        category="obj",
+        area=np.ones(len(box_sample_ids)),
+        category_id=np.zeros(len(box_sample_ids), dtype=np.int64),
+        iscrowd=0,
+    )
+    return SingularDataset.from_builders(samples, annotations)
+
+
+def time_gets(ds: SingularDataset, sample_ids, touch: bool) -> float:
+    start = time.perf_counter()
+    for sample_id in sample_ids:
+        sample = ds.get(sample_id)
+        if touch:
+            for annotation in sample.annotations["bbox"]:
+                annotation.id, annotation.etype, annotation.metadata
+    return (time.perf_counter() - start) / len(sample_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--annotations", type=int, nargs="+", default=[10, 100, 300, 1000])
+    parser.add_argument("--n-gets", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'annotations':>12} {'get (us)':>10} {'get + fields (us)':>18}")
+    for n_annotations in args.annotations:
+        ds = build(args.samples, n_annotations)
+        sample_ids = rng.integers(0, args.samples, size=args.n_gets)
+        ds.get(sample_ids[0])  # build the sample index
+        get_us = time_gets(ds, sample_ids, touch=False) * 1e6
+        touched_us = time_gets(ds, sample_ids, touch=True) * 1e6
+        print(f"{n_annotations:>12} {get_us:>10.0f} {touched_us:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Reopening a COCO-style SingularDataset from parquet versus building it from Element objects.
+
+Builds a synthetic detection dataset (image URIs plus `--boxes-per-image` bounding boxes with class labels and
+metadata per image) the way `Coco2017Detection.build_dataset` does, then times `to_parquet` and `read_parquet`.
+
+Usage:
+    python benchmarks/parquet_io.py --n-images 700000 --boxes-per-image 7
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from bridge.primitives.dataset import SingularDataset
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.element import Element
+from bridge.utils.data_objects import BoundingBox, ClassLabel
+
+
+def build(n_images: int, boxes_per_image: int) -> SingularDataset:
+    rng = np.random.default_rng(0)
+    images, bboxes = [], []
+    for i in range(n_images):
+        images.append(
+            Element(
+                element_id=f"img_{i}",
+                etype="image",
+                load_mechanism=LoadMechanism.from_url_string(f"/data/coco/train2017/{i:012d}.jpg", category="image"),
+                sample_id=i,
+                metadata={"width": 640, "height": 480},
+            )
+        )
+        for j in range(boxes_per_image):
+            bboxes.append(
+                Element(
+                    element_id=f"ann_{i}_{j}",
+                    etype="bbox",
+                    load_mechanism=LoadMechanism(
+                        BoundingBox(rng.uniform(0, 480, 4), class_label=ClassLabel(int(rng.integers(80)))), "obj"
+                    ),
+                    sample_id=i,
+                    metadata={"area": float(rng.uniform(0, 1e4)), "iscrowd": 0},
+                )
+            )
+    return SingularDataset.from_lists(images, bboxes)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-images", type=int, default=100_000)
+    parser.add_argument("--boxes-per-image", type=int, default=7)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ds = build(args.n_images, args.boxes_per_image)
+    build_s = time.perf_counter() - start
+    n_elements = len(ds.elements)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "coco"
+        start = time.perf_counter()
+        ds.to_parquet(path)
+        write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        SingularDataset.read_parquet(path)
+        read_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        SingularDataset.read_parquet(path, columns=[], annotations_columns=["area"], filters=[("sample_id", "<", 1000)])
+        filtered_s = time.perf_counter() - start
+
+    print(f"n_elements:            {n_elements}")
+    print(f"build from Elements:   {build_s:.2f}s")
+    print(f"to_parquet:            {write_s:.2f}s")
+    print(f"read_parquet:          {read_s:.2f}s")
+    print(f"read_parquet filtered: {filtered_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
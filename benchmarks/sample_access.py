@@ -0,0 +1,71 @@
+"""
+Per-sample access latency of `Dataset.iget` / `Dataset.get` as the elements table grows.
+
+Builds synthetic elements tables (two elements per sample: an image and a class label) directly as DataFrames, so
+that building the 10M-element table doesn't dominate the run, and times random accesses.
+
+Usage:
+    python benchmarks/sample_access.py --sizes 10000 100000 1000000 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.dataset import Dataset
+from bridge.utils.constants import ELEMENT_COLS, INDICES
+
+
+def synthetic_elements(n_elements: int, interleaved: bool = False) -> pd.DataFrame:
+    n_samples = n_elements // 2
+    sample_ids = np.repeat(np.arange(n_samples), 2)
+    etypes = np.tile(np.array(["image", "class_label"], dtype=object), n_samples)
+    if interleaved:  # all images first, then all labels, like a SingularDataset
+        sample_ids = np.concatenate([sample_ids[0::2], sample_ids[1::2]])
+        etypes = np.concatenate([etypes[0::2], etypes[1::2]])
+    df = pd.DataFrame(
+        {
+            ELEMENT_COLS.SAMPLE_ID: sample_ids,
+            ELEMENT_COLS.ID: np.arange(len(sample_ids)),
+            ELEMENT_COLS.ETYPE: etypes,
+            ELEMENT_COLS.LOAD_MECHANISM.CATEGORY: "obj",
+            ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA: None,
+        }
+    )
+    return df.set_index(INDICES)
+
+
+def time_accesses(fn, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--n-accesses", type=int, default=1000)
+    parser.add_argument("--interleaved", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n_elements':>12} {'index build (s)':>16} {'len (us)':>10} {'iget (us)':>10} {'get (us)':>10}")
+    for n_elements in args.sizes:
+        ds = Dataset(synthetic_elements(n_elements, args.interleaved))
+        start = time.perf_counter()
+        n_samples = len(ds)
+        build = time.perf_counter() - start
+
+        positions = rng.integers(0, n_samples, size=args.n_accesses)
+        sample_ids = [ds.sample_ids[p] for p in positions]
+        len_us = time_accesses(lambda _: len(ds), positions) * 1e6
+        iget_us = time_accesses(ds.iget, positions) * 1e6
+        get_us = time_accesses(ds.get, sample_ids) * 1e6
+        print(f"{n_elements:>12} {build:>16.3f} {len_us:>10.1f} {iget_us:>10.1f} {get_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
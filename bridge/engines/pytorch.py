@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, List
 
 from torch.utils.data import Dataset as PytorchDataset
 
+from bridge.primitives.sample import Sample
+
 if TYPE_CHECKING:
     from bridge.primitives.dataset import Dataset
 
@@ -17,9 +18,9 @@ class PytorchEngineDataset(PytorchDataset):
         return len(self._dataset)
 
     def __getitem__(self, index) -> Any:
-        elements = self._dataset.iget(index).elements
-        outs = defaultdict(list)
-        for etype, e_list in elements.items():
-            for e in e_list:
-                outs[str(etype)].append(e.data)
-        return dict(outs)
+        return self.__getitems__([index])[0]
+
+    def __getitems__(self, indices: List[int]) -> List[Any]:
+        # `DataLoader` fetches whole batches through this (torch>=2.1), so each category is loaded with one `load_many`
+        samples = [self._dataset.iget(index) for index in indices]
+        return [{str(etype): data for etype, data in outs.items()} for outs in Sample.load_batch(samples)]
@@ -1,4 +1,8 @@
+from bridge.primitives.dataset.chain_dataset import ChainDataset
 from bridge.primitives.dataset.dataset import Dataset
+from bridge.primitives.dataset.memory import MemoryUsage
+from bridge.primitives.dataset.result_cache import ResultCache
 from bridge.primitives.dataset.singular_dataset import SingularDataset
+from bridge.primitives.dataset.stats import DatasetStats
 
-__all__ = ["SingularDataset", "Dataset"]
+__all__ = ["SingularDataset", "Dataset", "ChainDataset", "DatasetStats", "MemoryUsage", "ResultCache"]
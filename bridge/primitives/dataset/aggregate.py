@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from bridge.utils.constants import ELEMENT_COLS
+
+Aggregation = Tuple[str, Union[str, Callable, np.ufunc]]
+
+
+def aggregate_by_sample(rows: pd.DataFrame, sample_ids: pd.Index, aggregations: Dict[str, Aggregation]) -> pd.DataFrame:
+    """
+    Reduce the rows of an elements table per sample, in one vectorized pass per aggregation.
+
+    `aggregations` maps output names to `(column, func)` pairs, as in pandas named aggregation. `func` is the name of
+    a pandas reduction ("count", "size", "sum", "mean", "min", "max", "nunique", ...), a NumPy ufunc, which is reduced
+    with `ufunc.reduceat` over contiguous per-sample runs, or any other callable, passed to `GroupBy.agg`.
+
+    The result has one row per entry of `sample_ids`, in that order. Samples without rows get 0 for counts and sums,
+    the ufunc's identity if it has one, and NaN otherwise. Rows of samples not in `sample_ids` are ignored.
+    """
+    assert len(aggregations) > 0, "No aggregations given."
+    codes = sample_ids.get_indexer(rows.index.get_level_values(ELEMENT_COLS.SAMPLE_ID))
+    kept = codes >= 0
+    if not kept.all():
+        rows, codes = rows[kept], codes[kept]
+    n_samples = len(sample_ids)
+    # row positions sorted by sample, so that every sample owns a contiguous run
+    order = None if np.all(codes[1:] >= codes[:-1]) else np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=n_samples)
+    starts = np.cumsum(counts) - counts
+
+    results = {}
+    for name, (column, func) in aggregations.items():
+        assert column in rows.columns or column in rows.index.names, f"Unknown column {column}."
+        values = rows[column] if column in rows.columns else rows.index.get_level_values(column).to_series()
+        if isinstance(func, np.ufunc):
+            results[name] = _reduceat(func, values.to_numpy(), order, counts, starts)
+        elif isinstance(func, str):
+            groups = pd.Categorical.from_codes(codes, categories=pd.RangeIndex(n_samples))
+            results[name] = values.groupby(groups, observed=False).agg(func).to_numpy()
+        else:
+            result = values.groupby(codes).agg(func)
+            results[name] = result.reindex(pd.RangeIndex(n_samples)).to_numpy()
+    return pd.DataFrame(results, index=sample_ids)
+
+
+def _reduceat(
+    func: np.ufunc, values: np.ndarray, order: np.ndarray | None, counts: np.ndarray, starts: np.ndarray
+) -> np.ndarray:
+    if order is not None:
+        values = values[order]
+    nonempty = counts > 0
+    reduced = func.reduceat(values, starts[nonempty]) if len(values) > 0 else values[:0]
+    if nonempty.all():
+        return reduced
+    if func.identity is not None:
+        result = np.full(len(counts), func.identity, dtype=reduced.dtype)
+    else:
+        result = np.full(len(counts), np.nan, dtype=np.result_type(reduced.dtype, np.float64))
+    result[nonempty] = reduced
+    return result
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Sequence
+
+import numpy as np
+import pandas as pd
+from typing_extensions import Self
+
+from bridge.primitives.dataset.dataset import Dataset
+from bridge.primitives.dataset.sample_index import SampleIndex
+from bridge.utils import optional_dependencies
+from bridge.utils.constants import ELEMENT_COLS, INDICES
+
+with optional_dependencies("raise", ["arrow"]):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+if TYPE_CHECKING:
+    from bridge.display.display_engine import DisplayEngine
+    from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+
+ROW_REF_COL_NAME = "__row__"
+DICTIONARY_COLS = [ELEMENT_COLS.ETYPE, ELEMENT_COLS.LOAD_MECHANISM.CATEGORY]
+
+
+class ArrowElementsTable:
+    """
+    Columnar storage for an elements table.
+
+    Index and metadata columns are kept as Arrow arrays, with `element_type` and `category` dictionary-encoded.
+    Columns Arrow can't represent (the `data` column with its Python payloads, or mixed-type columns) live in a side
+    store of object arrays. Every table row carries a reference into the side store, so filters, sorts and takes
+    only move Arrow arrays and never copy or touch payloads. The side store is shared between tables derived from
+    one another, and copied by a table the first time it writes to it.
+    """
+
+    def __init__(self, table: pa.Table, objects: Dict[str, np.ndarray], columns: List[str]):
+        self._table = table
+        self._objects = objects
+        self._owned_objects = set()
+        self._columns = columns  # original column order, index columns included
+        self._pandas = None
+        self._element_positions = None
+
+    @classmethod
+    def from_pandas(cls, elements: pd.DataFrame) -> Self:
+        df = elements.reset_index()
+        arrays = {}
+        objects = {}
+        for col in df.columns:
+            if col == ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA:
+                objects[col] = df[col].to_numpy(dtype=object)
+                continue
+            try:
+                array = pa.Array.from_pandas(df[col])
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                objects[col] = df[col].to_numpy(dtype=object)
+                continue
+            if col in DICTIONARY_COLS and not pa.types.is_dictionary(array.type):
+                array = array.dictionary_encode()
+            arrays[col] = array
+        arrays[ROW_REF_COL_NAME] = pa.array(np.arange(len(df), dtype=np.int64))
+        return cls(pa.table(arrays), objects, df.columns.to_list())
+
+    @property
+    def table(self) -> pa.Table:
+        return self._table
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self._table.num_rows
+
+    def column(self, name: str) -> np.ndarray:
+        if name in self._objects:
+            return self._objects[name][self._row_refs()]
+        return self._table.column(name).to_numpy()
+
+    def to_pandas(self) -> pd.DataFrame:
+        if self._pandas is None:
+            self._pandas = self._to_pandas(self._table)
+        return self._pandas
+
+    def rows_to_pandas(self, rows: slice | Sequence[int] | np.ndarray) -> pd.DataFrame:
+        """
+        The rows `rows` as a DataFrame, converting only those rows and without deriving a table from them.
+        """
+        if isinstance(rows, slice):
+            table = self._table.slice(rows.start, rows.stop - rows.start)
+        else:
+            table = self._table.take(pa.array(np.asarray(rows, dtype=np.int64)))
+        return self._to_pandas(table)
+
+    def concat(self, other: ArrowElementsTable) -> Self:
+        """
+        The rows of this table followed by the rows of `other`. Columns missing from one of the tables are null in its
+        rows. A column held in a side store by either table, or with types Arrow can't unify, goes to the side store.
+        """
+        columns = self._columns + [name for name in other._columns if name not in self._columns]
+        size, other_size = self._store_size(), other._store_size()
+        objects = {}
+        for name in columns:
+            if name in self._objects or name in other._objects or not _unifiable(self._type(name), other._type(name)):
+                store = np.full(size + other_size, None, dtype=object)
+                store[self._row_refs()] = self._object_column(name)
+                store[other._row_refs() + size] = other._object_column(name)
+                objects[name] = store
+        tables = []
+        for table, offset in [(self._table, 0), (other._table, size)]:
+            table = table.drop_columns([name for name in objects if name in table.column_names])
+            row_refs = pc.add(table.column(ROW_REF_COL_NAME), offset)
+            table = table.set_column(table.column_names.index(ROW_REF_COL_NAME), ROW_REF_COL_NAME, row_refs)
+            tables.append(table)
+        table = pa.concat_tables(tables, promote_options="permissive").combine_chunks()
+        new = type(self)(table, objects, columns)
+        new._owned_objects = set(objects)
+        return new
+
+    def take(self, indices: Sequence[int] | np.ndarray) -> Self:
+        return self._derive(self._table.take(pa.array(np.asarray(indices, dtype=np.int64))))
+
+    def slice(self, start: int, stop: int) -> Self:
+        return self._derive(self._table.slice(start, stop - start))
+
+    def filter(self, mask: Sequence[bool] | np.ndarray | pa.Array | pa.ChunkedArray) -> Self:
+        if not isinstance(mask, (pa.Array, pa.ChunkedArray)):
+            mask = pa.array(np.asarray(mask, dtype=bool))
+        return self._derive(self._table.filter(mask))
+
+    def sort(self, by: str, ascending: bool = True) -> Self:
+        if by in self._objects:
+            order = pd.Series(self.column(by)).sort_values(ascending=ascending, kind="stable").index.to_numpy()
+        else:
+            column = self._table.column(by)
+            if pa.types.is_dictionary(column.type):
+                column = column.cast(column.type.value_type)
+            # arrow's sort_indices is stable
+            order = pc.sort_indices(
+                pa.table({by: column}), sort_keys=[(by, "ascending" if ascending else "descending")]
+            )
+        return self._derive(self._table.take(order))
+
+    def assign_columns(self, values: Dict[str, Any]) -> Self:
+        table = self._table
+        objects = dict(self._objects)
+        columns = list(self._columns)
+        for name, value in values.items():
+            series = pd.Series(value) if not pd.api.types.is_scalar(value) else pd.Series([value] * len(self))
+            objects.pop(name, None)
+            if name in table.column_names:
+                table = table.drop_columns([name])
+            try:
+                table = table.append_column(name, pa.Array.from_pandas(series))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                # keep the side store aligned with row references, which may not be 0..n-1
+                store = np.empty(self._store_size(), dtype=object)
+                store[self._row_refs()] = series.to_numpy(dtype=object)
+                objects[name] = store
+            if name not in columns:
+                columns.append(name)
+        self._owned_objects.clear()
+        new = type(self)(table, objects, columns)
+        new._owned_objects = {name for name in values if name in objects}
+        return new
+
+    def update_element(self, element_id: Hashable, values: Dict[str, Any]):
+        """
+        Overwrite columns of a single element in place, used by `CacheMechanism` to swap in new load mechanisms.
+        """
+        position = self._element_position(element_id)
+        for name, value in values.items():
+            if name in self._objects:
+                if name not in self._owned_objects:
+                    self._objects[name] = self._objects[name].copy()
+                    self._owned_objects.add(name)
+                self._objects[name][self._row_refs()[position]] = value
+            elif self._table.column(name)[position].as_py() != value:
+                try:
+                    column = _replace_value(self._table.column(name), position, pa.scalar(value, self._type(name)))
+                except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                    # the value doesn't fit the column's type, the column moves to a side store of its own
+                    store = np.empty(self._store_size(), dtype=object)
+                    store[self._row_refs()] = self._object_column(name)
+                    store[self._row_refs()[position]] = value
+                    self._objects[name] = store
+                    self._owned_objects.add(name)
+                    self._table = self._table.drop_columns([name])
+                    continue
+                self._table = self._table.set_column(self._table.column_names.index(name), name, column)
+        self._pandas = None
+
+    def _element_position(self, element_id: Hashable) -> int:
+        if self._element_positions is None:
+            self._element_positions = pd.Index(self.column(ELEMENT_COLS.ID))
+        return self._element_positions.get_loc(element_id)
+
+    def _type(self, name: str) -> pa.DataType | None:
+        if name not in self._table.column_names:
+            return None
+        column_type = self._table.schema.field(name).type
+        return column_type.value_type if pa.types.is_dictionary(column_type) else column_type
+
+    def _object_column(self, name: str) -> np.ndarray:
+        if name in self._objects:
+            return self.column(name)
+        if name in self._table.column_names:
+            return self._table.column(name).to_numpy(zero_copy_only=False)
+        return np.full(len(self), np.nan, dtype=object)
+
+    def _row_refs(self) -> np.ndarray:
+        return self._table.column(ROW_REF_COL_NAME).to_numpy()
+
+    def _store_size(self) -> int:
+        return max((len(store) for store in self._objects.values()), default=0)
+
+    def _derive(self, table: pa.Table) -> Self:
+        # the side store is now shared, whichever table writes to it next has to copy it first
+        self._owned_objects.clear()
+        return type(self)(table, dict(self._objects), self._columns)
+
+    def _to_pandas(self, table: pa.Table) -> pd.DataFrame:
+        df = table.drop_columns([ROW_REF_COL_NAME]).to_pandas(split_blocks=True)
+        row_refs = table.column(ROW_REF_COL_NAME).to_numpy()
+        for name, store in self._objects.items():
+            df[name] = store[row_refs]
+        return df[self._columns].set_index(INDICES)
+
+
+def _replace_value(column: pa.ChunkedArray, position: int, value: pa.Scalar) -> pa.ChunkedArray:
+    """
+    `column` with the value at `position` replaced by `value`. Only the chunk holding the position is rebuilt.
+    """
+    chunks = list(column.chunks)
+    starts = np.cumsum([0] + [len(chunk) for chunk in chunks])
+    i = int(np.searchsorted(starts, position, side="right")) - 1
+    mask = np.zeros(len(chunks[i]), dtype=bool)
+    mask[position - starts[i]] = True
+    # dictionary chunks get the value added to their dictionary when it's new
+    chunks[i] = pc.if_else(pa.array(mask), value.cast(column.type), chunks[i])
+    return pa.chunked_array(chunks, type=column.type)
+
+
+def _unifiable(a: pa.DataType | None, b: pa.DataType | None) -> bool:
+    if a is None or b is None or a == b:
+        return True
+    numeric = (pa.types.is_integer, pa.types.is_floating, pa.types.is_boolean)
+    return any(check(a) for check in numeric) and any(check(b) for check in numeric)
+
+
+class ArrowDataset(Dataset):
+    """
+    A Dataset stored in an `ArrowElementsTable` instead of a pandas DataFrame.
+
+    Selects, sorts and per-sample slicing run on the columnar arrays, and the sample index is built from the Arrow
+    `sample_id` column. Samples convert only their own rows to pandas. `select` takes the same DataFrame selectors as
+    `Dataset.select`, and `select_arrow` takes selectors working on the Arrow table. `elements` is still a pandas
+    DataFrame, converted from the columnar table (zero-copy for numeric columns where Arrow allows it) and cached
+    until the table changes.
+    """
+
+    @property
+    def _elements(self) -> pd.DataFrame:
+        if self._pending:
+            self.compact()
+        return self._table.to_pandas()
+
+    @_elements.setter
+    def _elements(self, elements: pd.DataFrame | ArrowElementsTable):
+        if not isinstance(elements, ArrowElementsTable):
+            elements = ArrowElementsTable.from_pandas(elements)
+        self._table = elements
+
+    @property
+    def table(self) -> ArrowElementsTable:
+        if self._pending:
+            self.compact()
+        return self._table
+
+    @property
+    def sample_index(self) -> SampleIndex:
+        if self._pending:
+            self.compact()
+        if self._sample_index is None:
+            self._sample_index = SampleIndex.from_sample_ids(self._table.column(ELEMENT_COLS.SAMPLE_ID))
+        return self._sample_index
+
+    def select(self, selector: Callable[[pd.DataFrame], Any]) -> Self:
+        """
+        See `Dataset.select`, `selector` is called with the elements DataFrame. Boolean masks filter the Arrow table
+        directly. Use `select_arrow` to select without converting the table to pandas at all.
+        """
+        elements = self.elements
+        selected = selector(elements)
+        if isinstance(selected, (np.ndarray, pd.Series)) and selected.dtype == bool:
+            return self._with_table(self._table.filter(np.asarray(selected)))
+        positions = pd.Series(np.arange(len(elements)), index=elements.index).loc[selected]
+        return self._with_table(self._table.take(positions.to_numpy()))
+
+    def select_arrow(self, selector: Callable[[pa.Table], pa.Array | pa.ChunkedArray | np.ndarray | Sequence]) -> Self:
+        """
+        Keep the rows picked by `selector`, which is called with the Arrow table of the elements (index columns
+        included, columns Arrow can't hold, such as `data`, left out) and returns either a boolean mask, typically built
+        with `pyarrow.compute`, or a list of sample ids. Rows where the mask is null are dropped. The elements are
+        never converted to pandas.
+
+        Example:
+            >>> ds.select_arrow(lambda table: pc.equal(table[ELEMENT_COLS.ETYPE], "bbox"))
+        """
+        if self._pending:
+            self.compact()
+        selected = selector(self._table.table.drop_columns([ROW_REF_COL_NAME]))
+        if isinstance(selected, (pa.Array, pa.ChunkedArray)) and pa.types.is_boolean(selected.type):
+            return self._with_table(self._table.filter(selected))
+        if isinstance(selected, np.ndarray) and selected.dtype == bool:
+            return self._with_table(self._table.filter(selected))
+        sample_index = self.sample_index
+        positions = sample_index.sample_ids.get_indexer(pd.Index(selected))
+        if (positions < 0).any():
+            raise KeyError(f"Sample ids {list(pd.Index(selected)[positions < 0])} are not in the dataset.")
+        return self._with_table(self._table.take(sample_index.gather(positions)))
+
+    def assign(self, **kwargs: Dict[str, Callable[[pd.DataFrame], Sequence]]) -> Self:
+        elements = self._elements
+        values = {name: value(elements) if callable(value) else value for name, value in kwargs.items()}
+        ds = self._with_table(self._table.assign_columns(values))
+        ds._sample_index = self._sample_index
+        return ds
+
+    def sort(self, by: str, ascending: bool = True) -> Self:
+        return self._with_table(self._table.sort(by, ascending=ascending))
+
+    def merge(
+        self,
+        other: Dataset,
+        display_engine: DisplayEngine | None = None,
+        cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
+    ) -> Self:
+        if self._pending:
+            self.compact()
+        if isinstance(other, ArrowDataset):
+            other_table = other.table
+        else:
+            other_table = ArrowElementsTable.from_pandas(other._elements)
+        element_ids = pd.Index(self._table.column(ELEMENT_COLS.ID))
+        assert not element_ids.isin(
+            other_table.column(ELEMENT_COLS.ID)
+        ).any(), "Cannot merge Datasets with duplicate element ids."
+        return ArrowDataset(
+            self._table.concat(other_table),
+            display_engine if display_engine is not None else self._display_engine,
+            cache_mechanisms if cache_mechanisms is not None else self._cache_mechanisms,
+        )
+
+    def to_pandas(self) -> Dataset:
+        return Dataset(self.elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+
+    def _frame_rows(self, rows: slice | np.ndarray) -> pd.DataFrame:
+        return self._table.rows_to_pandas(rows)
+
+    def _with_table(self, table: ArrowElementsTable) -> Self:
+        return ArrowDataset(table, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+
+    def _connect_caches(self):
+        for cache in self._cache_mechanisms.values():
+            if cache is not None:
+                cache.set_elements_df(self._table)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, Iterator, List, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.dataset.dataset import Dataset
+from bridge.primitives.dataset.singular_dataset import SingularDataset
+from bridge.primitives.dataset.stats import DatasetStats, measure_payload_bytes
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
+from bridge.primitives.sample import Sample
+from bridge.utils.constants import ELEMENT_COLS
+
+if TYPE_CHECKING:
+    from bridge.display.display_engine import DisplayEngine
+    from bridge.primitives.element.element import Element
+
+
+class ChainDataset(Dataset):
+    """
+    Several datasets chained one after the other, without copying their element tables.
+
+    Every child dataset is kept as a segment. Samples are numbered segment by segment, and `iget` finds the segment
+    owning a position through a table of sample offsets. `get` looks the position up in an index of all sample ids,
+    built on first use. Element ids are checked for duplicates in a single pass over all segments. A sample id
+    appearing in several segments (as `merge` allows) is one sample made of the elements of all of them, numbered
+    where it first appears.
+
+    Row-level operations (`elements`, `select`, `sort`, ...) run on a unified elements table, which is concatenated
+    on first use and then cached. Samples are always read from the segments, with the segments' cache mechanisms.
+    `append_elements` adds the new elements as a new segment, the chained datasets are never modified.
+
+    Example:
+        >>> ds = Dataset.concat([shard_0, shard_1, shard_2])
+        >>> ds.iget(len(shard_0))  # first sample of shard_1
+    """
+
+    def __init__(self, datasets: Sequence[Dataset], display_engine: DisplayEngine | None = None):
+        assert len(datasets) > 0, "Can't chain an empty list of datasets."
+        segments = []
+        for ds in datasets:
+            segments.extend(ds.segments if isinstance(ds, ChainDataset) else [ds])
+        self._segments: List[Dataset] = segments
+        self._unified: pd.DataFrame | None = None
+        self._sample_ids: pd.Index | None = None
+        self._sample_cls = type(segments[0])._sample_cls
+        self._build_offset_table()
+        super().__init__(
+            elements=None,
+            display_engine=display_engine or segments[0]._display_engine,
+            cache_mechanisms=segments[0]._cache_mechanisms,
+        )
+
+    @property
+    def _elements(self) -> pd.DataFrame:
+        if self._unified is None:
+            self._unified = pd.concat([segment._elements for segment in self._segments])
+        return self._unified
+
+    @_elements.setter
+    def _elements(self, elements: pd.DataFrame | None):
+        self._unified = elements
+
+    @property
+    def segments(self) -> List[Dataset]:
+        return list(self._segments)
+
+    @property
+    def segment_offsets(self) -> np.ndarray:
+        """Sample number `i` belongs to segment `j` for `segment_offsets[j] <= i < segment_offsets[j + 1]`."""
+        return self._offsets
+
+    @property
+    def sample_ids(self) -> List[Hashable]:
+        return self._chain_sample_ids().to_list()
+
+    def _summary_stats(self) -> DatasetStats:
+        if self._stats is None:
+            stats = self._segments[0]._summary_stats()
+            for segment in self._segments[1:]:
+                stats = stats.combine(segment._summary_stats(), n_samples=0)
+            self._stats = dataclasses.replace(stats, n_samples=len(self))
+        return self._stats
+
+    def _measure_payload_bytes(self) -> int:
+        return measure_payload_bytes(segment._elements for segment in self._segments)
+
+    def iget(self, index: int) -> Sample:
+        n_samples = len(self)
+        if index < 0:
+            index += n_samples
+        if not 0 <= index < n_samples:
+            raise IndexError(f"Sample index {index} is out of range for a dataset with {n_samples} samples.")
+        i = int(np.searchsorted(self._offsets, index, side="right")) - 1
+        local = index - self._offsets[i]
+        if self._local_positions[i] is not None:
+            local = self._local_positions[i][local]
+        return self._sample_from_parts(self._spans.get(self._segments[i].sample_index.sample_ids[local], [(i, local)]))
+
+    def get(self, sample_id: Hashable) -> Sample:
+        return self.iget(self._chain_sample_ids().get_loc(sample_id))
+
+    def _iter_sample_chunks(self, step: int, display_engine: DisplayEngine | None = None) -> Iterator[List[Sample]]:
+        display_engine = display_engine or self._display_engine
+        for i, segment in enumerate(self._segments):
+            if i not in self._spanning_segments:
+                yield from segment._iter_sample_chunks(step, display_engine=display_engine)
+                continue
+            for start in range(self._offsets[i], self._offsets[i + 1], step):
+                yield [self.iget(p) for p in range(start, min(start + step, self._offsets[i + 1]))]
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def _chain_sample_ids(self) -> pd.Index:
+        # sample ids in chain order, built on first use, so that `get` finds a sample's number with one lookup
+        if self._sample_ids is None:
+            ids = [
+                segment.sample_index.sample_ids if positions is None else segment.sample_index.sample_ids[positions]
+                for segment, positions in zip(self._segments, self._local_positions)
+            ]
+            self._sample_ids = ids[0].append(ids[1:])
+        return self._sample_ids
+
+    def _sample_from_parts(self, parts: List[Tuple[int, int]]) -> Sample:
+        frames = []
+        for i, local in parts:
+            segment = self._segments[i]
+            frames.append(segment._frame_rows(segment.sample_index.rows(local)))
+        sample_df = frames[0] if len(frames) == 1 else pd.concat(frames)
+        return self._sample_cls.from_pd_dataframe(
+            sample_df,
+            display_engine=self._display_engine,
+            cache_mechanisms=self._segments[parts[0][0]]._cache_mechanisms,
+        )
+
+    def _build_offset_table(self):
+        self._seen_elements: Set[Hashable] = set()
+        self._seen_samples: Set[Hashable] = set()
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._local_positions: List[np.ndarray | None] = []
+        self._spans: Dict[Hashable, List[Tuple[int, int]]] = {}
+        self._spanning_segments: Set[int] = set()
+        for i in range(len(self._segments)):
+            self._index_segment(i)
+
+    def _index_segment(self, i: int):
+        # adds segment `i`, the last one indexed so far, to the offset table
+        segment = self._segments[i]
+        element_ids = segment._elements.index.get_level_values(ELEMENT_COLS.ID)
+        n_seen = len(self._seen_elements)
+        self._seen_elements.update(element_ids)
+        assert len(self._seen_elements) == n_seen + len(
+            element_ids
+        ), "Cannot chain Datasets with duplicate element ids."
+
+        sample_ids = segment.sample_index.sample_ids
+        shared = self._seen_samples.intersection(sample_ids)
+        self._seen_samples.update(sample_ids)
+        if len(shared) == 0:
+            self._local_positions.append(None)
+            self._offsets = np.append(self._offsets, self._offsets[-1] + len(sample_ids))
+            return
+        for sample_id in shared:
+            if sample_id not in self._spans:
+                self._spans[sample_id] = [self._first_part(sample_id, i)]
+            self._spans[sample_id].append((i, segment.sample_index.position(sample_id)))
+            self._spanning_segments.update(part for part, _ in self._spans[sample_id])
+        new = np.flatnonzero(~sample_ids.isin(list(shared)))
+        self._local_positions.append(new)
+        self._offsets = np.append(self._offsets, self._offsets[-1] + len(new))
+
+    def _first_part(self, sample_id: Hashable, before: int) -> Tuple[int, int]:
+        for i in range(before):
+            sample_index = self._segments[i].sample_index
+            if sample_id in sample_index.sample_ids:
+                return i, sample_index.position(sample_id)
+        raise KeyError(sample_id)
+
+    def append_elements(self, elements: Iterable[Element] | ElementTableBuilder):
+        """
+        Add elements in place as a new segment, see `Dataset.append_elements`. The segment is a SingularDataset when
+        the chain's segments are, and its elements are split into samples and annotations as by
+        `SingularDataset.append_elements`. Only the new segment is indexed, and the stats are extended with its own.
+        """
+        if isinstance(self._segments[0], SingularDataset):
+            segment = SingularDataset.from_builders(
+                ElementTableBuilder(), ElementTableBuilder(), self._display_engine, self._segments[-1]._cache_mechanisms
+            )
+        else:
+            segment = Dataset(ElementTableBuilder().build(), self._display_engine, self._segments[-1]._cache_mechanisms)
+        segment.append_elements(elements)
+        element_ids = segment._elements.index.get_level_values(ELEMENT_COLS.ID)
+        if len(element_ids) == 0:
+            return
+        duplicates = self._seen_elements.intersection(element_ids)
+        assert len(duplicates) == 0, f"Element ids {list(duplicates)[:10]} already exist in the dataset."
+        self._segments.append(segment)
+        self._index_segment(len(self._segments) - 1)
+        self._unified = None
+        if self._sample_ids is not None:
+            positions = self._local_positions[-1]
+            sample_ids = segment.sample_index.sample_ids
+            self._sample_ids = self._sample_ids.append(sample_ids if positions is None else sample_ids[positions])
+        if self._stats is not None:
+            self._stats = self._stats.combine(segment._summary_stats(), n_samples=len(self))
+
+    def _connect_caches(self):
+        pass  # segments stay connected to their own caches
@@ -1,57 +1,238 @@
 from __future__ import annotations
 
+import asyncio
+import collections
+import dataclasses
 import functools
+import itertools
+import warnings
+from pathlib import Path
 from types import GeneratorType
-from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, Iterator, List, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
 
+import numpy as np
 import pandas as pd
 from typing_extensions import Self
 
+from bridge.primitives.dataset.aggregate import Aggregation, aggregate_by_sample
+from bridge.primitives.dataset.encoding import IdCodes, categorize, concat_categorized, encode_ids
+from bridge.primitives.dataset.lazy import ELEMENTS, Assign, LazyDataset, PlanNode, Select, Sort
+from bridge.primitives.dataset.memory import MemoryUsage, memory_usage
 from bridge.primitives.dataset.sample_api import SampleAPI
+from bridge.primitives.dataset.sample_index import SampleIndex
+from bridge.primitives.dataset.stats import DatasetStats, measure_payload_bytes
 from bridge.primitives.dataset.table_api import TableAPI
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
+from bridge.primitives.element.element import Element
+from bridge.primitives.element.element_view import ElementRows
+from bridge.primitives.fingerprint import fingerprint, fingerprint_elements
 from bridge.primitives.sample import Sample
+from bridge.primitives.sample.transform import BatchSampleTransform, SampleTransform
+from bridge.primitives.utils import cow_copy
 from bridge.utils.constants import ELEMENT_COLS, INDICES
 from bridge.utils.helper import Displayable
 
+STATS_COLS = [ELEMENT_COLS.ETYPE, ELEMENT_COLS.LOAD_MECHANISM.CATEGORY, ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA]
+
 if TYPE_CHECKING:
     from bridge.display.display_engine import DisplayEngine
+    from bridge.primitives.dataset.chain_dataset import ChainDataset
+    from bridge.primitives.dataset.result_cache import ResultCache
+    from bridge.primitives.dataset.sharded import ShardedDataset
     from bridge.primitives.element.data.cache_mechanism import CacheMechanism
-    from bridge.primitives.element.element import Element
-    from bridge.primitives.sample.transform import SampleTransform
 
 
 class Dataset(TableAPI, SampleAPI, Displayable):
+    _sample_cls = Sample
+    _iter_chunk_size = 1024
+    _append_compaction_threshold = 100_000
+
     def __init__(
         self,
         elements: pd.DataFrame,
         display_engine: DisplayEngine = None,
         cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
     ):
+        self._pending: List[pd.DataFrame] = []  # appended rows not yet compacted into the table
+        self._element_ids: set | None = None
         self._elements = elements
         self._display_engine = display_engine
         self._cache_mechanisms = cache_mechanisms or {}
+        self._sample_index: SampleIndex | None = None
+        self._stats: DatasetStats | None = None
         self._connect_caches()
 
+    @property
+    def _elements(self) -> pd.DataFrame:
+        if self._pending:
+            self.compact()
+        return self._table_df
+
+    @_elements.setter
+    def _elements(self, elements: pd.DataFrame):
+        self._table_df = categorize(elements)
+
     @property
     def elements(self) -> pd.DataFrame:
-        return self._elements.copy()
+        return cow_copy(self._elements)
 
     @property
     def sample_ids(self) -> List[Hashable]:
-        return self._elements.index.get_level_values(ELEMENT_COLS.SAMPLE_ID).drop_duplicates().to_list()
+        return self.sample_index.sample_ids.to_list()
+
+    @property
+    def sample_index(self) -> SampleIndex:
+        if self._pending:
+            self.compact()
+        if self._sample_index is None:
+            self._sample_index = SampleIndex.from_elements(self._elements)
+        return self._sample_index
+
+    @property
+    def stats(self) -> DatasetStats:
+        """
+        Sample, element type and category counts and payload bytes, computed once and cached. Selects, sorts, assigns
+        and merges of a dataset whose counts were computed carry over what they can instead of recomputing it.
+        Payload bytes are only carried over by operations that keep the same rows (sorts, assigns), the others measure
+        them again when `stats` is read.
+        """
+        stats = self._summary_stats()
+        if stats.payload_bytes is None:
+            self._stats = stats = dataclasses.replace(stats, payload_bytes=self._measure_payload_bytes())
+        return stats
+
+    def _summary_stats(self) -> DatasetStats:
+        """
+        `stats`, without measuring payload bytes if they weren't measured yet. This is what `__repr__` shows.
+        """
+        if self._pending:
+            self.compact()
+        if self._stats is None:
+            self._stats = DatasetStats.from_elements(self._elements, len(self))
+        return self._stats
+
+    def _measure_payload_bytes(self) -> int:
+        return measure_payload_bytes([self._elements])
+
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        """
+        Bytes held by the elements table, per column and, for the `data` column, per element type and load category.
+
+        With `deep=True` the payloads in the `data` column are counted as well (ndarray and tensor buffers included),
+        and buffers shared between rows are counted once, see `MemoryUsage`. With `deep=False` only the table's own
+        buffers are counted, like `DataFrame.memory_usage(deep=False)`.
+
+        Example:
+            >>> usage = ds.memory_usage()
+            >>> usage.categories  # e.g. {"image": 153600000, "obj": 4000000}
+        """
+        return memory_usage(self._elements, deep=deep)
+
+    def fingerprint(self) -> str:
+        """
+        Stable digest of the elements table: column names and dtypes, then every element's ids, load source and
+        metadata. Payloads stored at local paths are fingerprinted by path, size and modification time, not loaded.
+        """
+        return fingerprint_elements(self._elements)
+
+    def append_elements(self, elements: Iterable[Element] | ElementTableBuilder):
+        """
+        Add elements to the dataset in place, for new samples or existing ones.
+
+        Element ids are checked against a hash set of the ids already in the dataset, and the rows are kept in an
+        append buffer. The buffer is compacted into the table in a single concat when it holds more than
+        `_append_compaction_threshold` rows, when the table is read, or when `compact` is called, so a run of appends
+        costs one copy of the table. The sample index and stats are extended with the new rows rather than rebuilt.
+        """
+        if isinstance(elements, ElementTableBuilder):
+            builder = elements
+        else:
+            builder = ElementTableBuilder()
+            for element in elements:
+                builder.append_element(element)
+        self._append_rows(builder.build())
+
+    def _append_rows(self, rows: pd.DataFrame):
+        if len(rows) == 0:
+            return
+        element_ids = rows.index.get_level_values(ELEMENT_COLS.ID)
+        if self._element_ids is None:
+            self._element_ids = set(self._elements.index.get_level_values(ELEMENT_COLS.ID))
+        new_ids = set(element_ids)
+        assert len(new_ids) == len(element_ids), "Appended elements contain duplicate element ids."
+        duplicates = self._element_ids.intersection(new_ids)
+        assert len(duplicates) == 0, f"Element ids {list(duplicates)[:10]} already exist in the dataset."
+        self._element_ids.update(new_ids)
+        self._pending.append(rows)
+        if sum(map(len, self._pending)) >= self._append_compaction_threshold:
+            self.compact()
+
+    def compact(self):
+        """
+        Merge appended rows into the elements table.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        rows = pending[0] if len(pending) == 1 else pd.concat(pending)
+        index, stats = self._sample_index, self._stats
+        self._elements = concat_categorized([self._elements, rows])
+        if index is not None:
+            self._sample_index = index.extend(rows.index.get_level_values(ELEMENT_COLS.SAMPLE_ID))
+        if stats is not None:
+            self._stats = stats.combine(DatasetStats.from_elements(rows, 0), n_samples=len(self.sample_index))
+        self._connect_caches()
 
     def select(self, selector: Callable):
-        selected = selector(self.elements)
-        elements = self.elements.loc[selected]
-        return Dataset(elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+        elements = self.elements
+        selected = selector(elements)
+        new_elements = elements.loc[selected]
+        return Dataset(new_elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
 
     def assign(self, **kwargs: Dict[str, Callable[[pd.DataFrame], Sequence]]) -> Self:
         new_elements = self._elements.assign(**kwargs)
-        return Dataset(new_elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+        ds = Dataset(new_elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+        ds._sample_index = self._sample_index  # assign keeps rows and their order, so the index stays valid
+        if kwargs.keys().isdisjoint(STATS_COLS):
+            ds._stats = self._stats
+        return ds
 
     def sort(self, by: str, ascending: bool = True):
-        new_elements = self._elements.sort_values(by=by, ascending=ascending)
-        return Dataset(new_elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+        new_elements = self._elements.sort_values(by=by, ascending=ascending, kind="stable")
+        ds = Dataset(new_elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+        ds._stats = self._stats  # the same rows, reordered
+        return ds
+
+    def lazy(self) -> LazyDataset:
+        """
+        Start a lazy chain of table operations, see `LazyDataset`.
+        """
+        return LazyDataset(self)
+
+    def _apply_plan(self, plan: Sequence[PlanNode]) -> Dataset:
+        elements = self.elements
+        for node in plan:
+            assert node.target == ELEMENTS, f"Dataset can't run operations on {node.target}."
+            if isinstance(node, Select):
+                for selector in node.selectors:
+                    elements = elements.loc[selector(elements)]
+            elif isinstance(node, Assign):
+                elements = elements.assign(**node.values)
+            elif isinstance(node, Sort):
+                elements = elements.sort_values(by=node.by, ascending=node.ascending, kind="stable")
+        return Dataset(elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
 
     def merge(
         self,
@@ -59,43 +240,222 @@ class Dataset(TableAPI, SampleAPI, Displayable):
         display_engine: DisplayEngine | None = None,
         cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
     ) -> "Dataset":
-        self_element_ids = self.elements.index.get_level_values(ELEMENT_COLS.ID)
-        other_element_ids = other.elements.index.get_level_values(ELEMENT_COLS.ID)
+        self_element_ids = self._elements.index.get_level_values(ELEMENT_COLS.ID)
+        other_element_ids = other._elements.index.get_level_values(ELEMENT_COLS.ID)
         assert (
             len(self_element_ids.intersection(other_element_ids)) == 0
         ), "Cannot merge Datasets with duplicate element ids."
-        elements = pd.concat([self.elements, other.elements])
+        elements = pd.concat([self._elements, other._elements])
         if display_engine is None:
             display_engine = self._display_engine
         if cache_mechanisms is None:
             cache_mechanisms = self._cache_mechanisms
-        return Dataset(elements, display_engine, cache_mechanisms=cache_mechanisms)
+        ds = Dataset(elements, display_engine, cache_mechanisms=cache_mechanisms)
+        if self._stats is not None and other._stats is not None:
+            shared = self.sample_index.sample_ids.intersection(other.sample_index.sample_ids)
+            ds._stats = self._stats.combine(other._stats, len(self) + len(other) - len(shared))
+        return ds
 
     def iget(self, index: int) -> Sample:
-        sample_id = self.sample_ids[index]
-        return self.get(sample_id)
+        return self._sample_from_rows(self.sample_index.rows(index))
 
     def get(self, sample_id: Hashable) -> Sample:
-        sample_df = self._elements.xs(sample_id, level=ELEMENT_COLS.SAMPLE_ID, drop_level=False)
-        return Sample.from_pd_dataframe(
+        return self._sample_from_rows(self.sample_index.rows_for_id(sample_id))
+
+    def _frame_rows(self, rows: slice | np.ndarray) -> pd.DataFrame:
+        return self._elements.iloc[rows]
+
+    def _sample_from_rows(self, rows: slice | np.ndarray) -> Sample:
+        sample_df = self._frame_rows(rows)
+        return self._sample_cls.from_pd_dataframe(
             sample_df, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms
         )
 
+    def iter_samples(
+        self, chunk_size: int | None = None, load_data: bool = False
+    ) -> Iterator[Sample] | Iterator[List[Sample]]:
+        """
+        Walk the elements table once, in sample order.
+
+        Rows are gathered chunk by chunk through the sample index, and the samples of a chunk are made of
+        `ElementView`s sharing one `ElementRows` block, which converts each column once per chunk. If `chunk_size` is
+        given, yields lists of (up to) `chunk_size` samples, otherwise yields samples one by one.
+
+        With `load_data`, the data of each chunk is loaded before its samples are yielded, with one `DataIO.load_many`
+        call per category (see `Sample.load_batch`), and kept in memory by the samples' elements.
+        """
+        for samples in self._iter_sample_chunks(chunk_size or self._iter_chunk_size):
+            if load_data:
+                for sample, data in zip(samples, Sample.load_batch(samples)):
+                    sample._keep_data(data)
+            if chunk_size is None:
+                yield from samples
+            else:
+                yield samples
+
+    def _iter_sample_chunks(self, step: int, display_engine: DisplayEngine | None = None) -> Iterator[List[Sample]]:
+        display_engine = display_engine or self._display_engine
+        index = self.sample_index
+        offsets = index.offsets
+        for start in range(0, len(index), step):
+            stop = min(start + step, len(index))
+            row_start, row_stop = offsets[start], offsets[stop]
+            if index.is_grouped:
+                chunk_df = self._frame_rows(slice(row_start, row_stop))
+            else:
+                chunk_df = self._frame_rows(index.order[row_start:row_stop])
+            rows = ElementRows(chunk_df)
+            samples = [
+                self._sample_cls.from_rows(
+                    rows,
+                    display_engine=display_engine,
+                    cache_mechanisms=self._cache_mechanisms,
+                    start=offsets[i] - row_start,
+                    stop=offsets[i + 1] - row_start,
+                )
+                for i in range(start, stop)
+            ]
+            yield samples
+
     def transform_samples(
         self,
-        transform: SampleTransform,
+        transform: SampleTransform | BatchSampleTransform,
         map_fn=map,
         cache_mechanisms: Dict[str, CacheMechanism] | None = None,
         display_engine: DisplayEngine | None = None,
+        chunk_size: int | None = None,
+        result_cache: ResultCache | None = None,
     ) -> Self:
+        """
+        Apply `transform` to every sample and build a new Dataset from the results.
+
+        Transformed samples are consumed as they come out of `map_fn` and their elements are appended to a table
+        builder, so at no point are all transformed samples held in memory. If `chunk_size` is given, `map_fn` is
+        called once per chunk of `chunk_size` samples, which bounds the number of in-flight samples for eager map
+        functions (e.g. `pmap`) as well. A `BatchSampleTransform` is called once per batch of `transform.batch_size`
+        samples, and `map_fn` then maps over batches. Pair it with cache mechanisms that have a `root_uri` to keep
+        transformed payloads on disk rather than in the table.
+
+        With a `result_cache`, samples that were already transformed by an identical transform (same fingerprint)
+        into the same cache mechanisms are read back from the cache, and only the other samples go through `map_fn`.
+        A transform that can't be fingerprinted is applied without the cache, with a warning.
+        """
+        builder = ElementTableBuilder()
+        for element in self._transformed_elements(
+            transform, map_fn, cache_mechanisms, display_engine, chunk_size, result_cache
+        ):
+            builder.append_element(element)
+        return Dataset(builder.build(), display_engine=display_engine)
+
+    def _transformed_elements(
+        self,
+        transform: SampleTransform | BatchSampleTransform,
+        map_fn,
+        cache_mechanisms: Dict[str, CacheMechanism] | None,
+        display_engine: DisplayEngine | None,
+        chunk_size: int | None,
+        result_cache: ResultCache | None = None,
+    ) -> Iterator[Element]:
+        if result_cache is not None:
+            try:
+                transform_key = fingerprint((transform, cache_mechanisms))
+            except TypeError as e:
+                warnings.warn(f"Not using the result cache, the transform can't be fingerprinted: {e}", UserWarning)
+            else:
+                yield from self._cached_transformed_elements(
+                    transform_key, transform, map_fn, cache_mechanisms, display_engine, chunk_size, result_cache
+                )
+                return
+        if isinstance(transform, BatchSampleTransform):
+            yield from self._batch_transformed_elements(transform, map_fn, cache_mechanisms, display_engine, chunk_size)
+            return
         fn = functools.partial(
             Sample.transform, transform=transform, cache_mechanisms=cache_mechanisms, display_engine=display_engine
         )
-        samples = map_fn(fn, self)
-        if isinstance(samples, GeneratorType):
-            samples = list(samples)
-        elements = [element for sample in samples for e_list in sample.elements.values() for element in e_list]
-        return Dataset.from_elements(elements, display_engine=display_engine)
+        if chunk_size is None:
+            chunks = [self]
+        else:
+            chunks = self.iter_samples(chunk_size=chunk_size)
+        for chunk in chunks:
+            for sample in map_fn(fn, chunk):
+                for e_list in sample.elements.values():
+                    yield from e_list
+
+    def _batch_transformed_elements(
+        self,
+        transform: BatchSampleTransform,
+        map_fn,
+        cache_mechanisms: Dict[str, CacheMechanism] | None,
+        display_engine: DisplayEngine | None,
+        chunk_size: int | None,
+    ) -> Iterator[Element]:
+        fn = functools.partial(
+            BatchSampleTransform.apply,
+            transform=transform,
+            cache_mechanisms=cache_mechanisms,
+            display_engine=display_engine,
+        )
+        batches = self.iter_samples(chunk_size=transform.batch_size)
+        # `map_fn` maps over batches here, a chunk holds as many whole batches as fit in `chunk_size` samples
+        batches_per_chunk = None if chunk_size is None else max(1, chunk_size // transform.batch_size)
+        while chunk := list(itertools.islice(batches, batches_per_chunk)):
+            for samples in map_fn(fn, chunk):
+                for sample in samples:
+                    for e_list in sample.elements.values():
+                        yield from e_list
+
+    def _cached_transformed_elements(
+        self,
+        transform_key: str,
+        transform: SampleTransform | BatchSampleTransform,
+        map_fn,
+        cache_mechanisms: Dict[str, CacheMechanism] | None,
+        display_engine: DisplayEngine | None,
+        chunk_size: int | None,
+        result_cache: ResultCache,
+    ) -> Iterator[Element]:
+        for chunk in self.iter_samples(chunk_size=chunk_size or self._iter_chunk_size):
+            keys = [fingerprint((transform_key, sample.fingerprint())) for sample in chunk]
+            cached = result_cache.get_many(keys)
+            missing = [sample for sample, key in zip(chunk, keys) if key not in cached]
+            outputs = self._transform_chunk(transform, map_fn, cache_mechanisms, display_engine, missing)
+            computed = {}
+            for key in keys:
+                if key in cached:
+                    records = cached[key]
+                else:
+                    sample = next(outputs)
+                    records = [element.to_dict() for e_list in sample.elements.values() for element in e_list]
+                    computed[key] = records
+                for record in records:
+                    yield Element.from_dict(record, display_engine=display_engine)
+            result_cache.put_many(computed)
+
+    @staticmethod
+    def _transform_chunk(
+        transform: SampleTransform | BatchSampleTransform,
+        map_fn,
+        cache_mechanisms: Dict[str, CacheMechanism] | None,
+        display_engine: DisplayEngine | None,
+        samples: List[Sample],
+    ) -> Iterator[Sample]:
+        if len(samples) == 0:
+            return
+        if not isinstance(transform, BatchSampleTransform):
+            fn = functools.partial(
+                Sample.transform, transform=transform, cache_mechanisms=cache_mechanisms, display_engine=display_engine
+            )
+            yield from map_fn(fn, samples)
+            return
+        fn = functools.partial(
+            BatchSampleTransform.apply,
+            transform=transform,
+            cache_mechanisms=cache_mechanisms,
+            display_engine=display_engine,
+        )
+        batches = [samples[i : i + transform.batch_size] for i in range(0, len(samples), transform.batch_size)]
+        for batch in map_fn(fn, batches):
+            yield from batch
 
     def map_samples(self, function: Callable[[Sample], Any], map_fn=map):
         outputs = map_fn(function, self)
@@ -103,6 +463,29 @@ class Dataset(TableAPI, SampleAPI, Displayable):
             return list(outputs)
         return outputs
 
+    def aggregate_samples(
+        self, where: Callable[[pd.DataFrame], Sequence] | None = None, **aggregations: Aggregation
+    ) -> pd.DataFrame:
+        """
+        Per-sample reductions over the elements table, computed with vectorized groupbys instead of building samples.
+
+        Every keyword maps an output column to a `(column, func)` pair, where `func` is a pandas reduction name
+        ("count", "size", "sum", "mean", "min", "max", ...), a NumPy ufunc or a callable. `where` selects the rows
+        to reduce, like `select`. The result has one row per sample, indexed by sample id in `sample_ids` order.
+
+        Example:
+            >>> ds.aggregate_samples(
+            ...     where=lambda df: df.element_type == "bbox",
+            ...     n_bboxes=("element_type", "size"),
+            ...     max_area=("area", "max"),
+            ... )
+        """
+        elements = self.elements
+        if where is not None:
+            elements = elements.loc[where(elements)]
+        sample_ids = self.sample_index.sample_ids.rename(ELEMENT_COLS.SAMPLE_ID)
+        return aggregate_by_sample(elements, sample_ids, aggregations)
+
     def show(self, **kwargs):
         return self._display_engine.show_dataset(self, **kwargs)
 
@@ -110,17 +493,45 @@ class Dataset(TableAPI, SampleAPI, Displayable):
         return self.iget(item)
 
     def __iter__(self) -> Iterator[Sample]:
-        for sample_id in self.sample_ids:
-            yield self.get(sample_id)
+        return self.iter_samples()
+
+    async def aiter(self, concurrency: int = 64) -> AsyncIterator[Sample]:
+        """
+        Iterate over the samples from asyncio code, in order, with their data already loaded (see `Sample.prefetch`).
+
+        The loads of the next samples overlap: up to `concurrency` samples are being loaded ahead of the consumer, with
+        up to `concurrency` payloads in flight. Categories with a non-blocking `load_async`, like http(s) images, can
+        have that many requests open at once; the others load on the shared thread pool.
+
+        Example:
+            >>> async for sample in ds.aiter(concurrency=64):
+            ...     image = sample.data["image"][0]
+        """
+        assert concurrency > 0, "concurrency must be positive."
+        semaphore = asyncio.Semaphore(concurrency)
+        pending: collections.deque[asyncio.Task] = collections.deque()
+        try:
+            for sample in self:
+                pending.append(asyncio.ensure_future(sample.prefetch(semaphore)))
+                if len(pending) >= concurrency:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            # the consumer stopped early, or a load failed
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
     def __len__(self) -> int:
-        sample_ids = self.sample_ids
-        return len(sample_ids)
+        return len(self.sample_index)
 
     def __repr__(self) -> str:
-        lens_dict = {"n_samples": len(self)}
-        for etype, group in self._elements.groupby(ELEMENT_COLS.ETYPE):
-            lens_dict[f"n_{etype}"] = len(group)
+        stats = self._summary_stats()
+        lens_dict = {"n_samples": stats.n_samples}
+        for etype, count in stats.etype_counts.items():
+            lens_dict[f"n_{etype}"] = count
         return "Dataset: " + str(lens_dict)
 
     @classmethod
@@ -130,9 +541,95 @@ class Dataset(TableAPI, SampleAPI, Displayable):
         display_engine: DisplayEngine = None,
         cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
     ) -> Self:
-        element_records = [e.to_pd_series() for e in elements]
-        elements_df = pd.DataFrame(element_records).set_index(INDICES)
-        return cls(elements=elements_df, display_engine=display_engine, cache_mechanisms=cache_mechanisms)
+        builder = ElementTableBuilder()
+        for element in elements:
+            builder.append_element(element)
+        return cls(elements=builder.build(), display_engine=display_engine, cache_mechanisms=cache_mechanisms)
+
+    def encode_ids(self, levels: Iterable[str] = INDICES) -> Tuple[Self, IdCodes]:
+        """
+        Replace the ids of the given index levels (`sample_id` and `element_id` by default) with dense int64 codes,
+        in order of first appearance. Integer ids take less memory than Python strings and make index lookups faster.
+
+        Returns the encoded dataset and the `IdCodes` reverse dictionary, which maps codes back to the original ids,
+        e.g. `codes.decode("sample_id", [0, 1])`, or the whole dataset with `decode_ids`.
+        """
+        (elements,), codes = encode_ids([self._elements], levels)
+        ds = Dataset(elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+        ds._stats = self._stats  # same rows in the same order
+        if self._sample_index is not None and ELEMENT_COLS.SAMPLE_ID in codes.ids:
+            # codes follow first appearance, as sample index positions do
+            sample_index = self._sample_index
+            ds._sample_index = SampleIndex(
+                pd.Index(np.arange(len(sample_index), dtype=np.int64)), sample_index._order, sample_index.offsets
+            )
+        return ds, codes
+
+    def decode_ids(self, codes: IdCodes) -> Self:
+        """
+        The inverse of `encode_ids`: map integer-coded ids back to the original ids.
+        """
+        elements = self._elements.set_axis(codes.decode_index(self._elements.index))
+        ds = Dataset(elements, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+        ds._stats = self._stats
+        return ds
+
+    def to_sharded(self, path: str | Path, n_shards: int = 8) -> Path:
+        """
+        Save the dataset in the sharded on-disk format, see `write_sharded`. Requires pyarrow.
+        """
+        from bridge.primitives.dataset.sharded import write_sharded
+
+        return write_sharded(self, path, n_shards=n_shards)
+
+    @staticmethod
+    def load_sharded(
+        path: str | Path,
+        display_engine: DisplayEngine = None,
+        cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
+    ) -> ShardedDataset:
+        """
+        Open a dataset saved with `to_sharded`. Shards are read lazily, see `ShardedDataset`.
+        """
+        from bridge.primitives.dataset.sharded import ShardedDataset
+
+        return ShardedDataset(path, display_engine=display_engine, cache_mechanisms=cache_mechanisms)
+
+    def to_parquet(self, path: str | Path):
+        """
+        Save the elements table to a parquet file, see `bridge.primitives.dataset.parquet.write_elements`.
+        Requires pyarrow.
+        """
+        from bridge.primitives.dataset.parquet import write_elements
+
+        write_elements(self._elements, path)
+
+    @classmethod
+    def read_parquet(
+        cls,
+        path: str | Path,
+        columns: Iterable[str] | None = None,
+        filters: List[Any] | None = None,
+        display_engine: DisplayEngine = None,
+        cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
+    ) -> Self:
+        """
+        Open a dataset saved with `to_parquet`. The file is memory-mapped, `columns` selects the metadata columns to
+        read and `filters` is pushed down to the parquet reader, e.g. `filters=[("element_type", "==", "image")]`.
+        """
+        from bridge.primitives.dataset.parquet import read_elements
+
+        elements = read_elements(path, columns=columns, filters=filters)
+        return cls(elements, display_engine=display_engine, cache_mechanisms=cache_mechanisms)
+
+    @staticmethod
+    def concat(datasets: Sequence[Dataset], display_engine: DisplayEngine | None = None) -> ChainDataset:
+        """
+        Chain `datasets` without copying their element tables, see `ChainDataset`.
+        """
+        from bridge.primitives.dataset.chain_dataset import ChainDataset
+
+        return ChainDataset(datasets, display_engine=display_engine)
 
     def _connect_caches(self):
         for cache in self._cache_mechanisms.values():
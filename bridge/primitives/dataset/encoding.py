@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bridge.utils.constants import ELEMENT_COLS, INDICES
+
+CATEGORICAL_COLS = [ELEMENT_COLS.ETYPE, ELEMENT_COLS.LOAD_MECHANISM.CATEGORY]
+
+
+def categorize(elements: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store the `element_type` and `category` columns as pandas categoricals: one small integer code per row instead of
+    a Python string. Columns that are already categorical are left as they are.
+    """
+    dtypes = {
+        col: "category"
+        for col in CATEGORICAL_COLS
+        if col in elements.columns and not isinstance(elements[col].dtype, pd.CategoricalDtype)
+    }
+    if len(dtypes) == 0:
+        return elements
+    return elements.astype(dtypes)
+
+
+def concat_categorized(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    `pd.concat` that keeps the categorical columns categorical. Their categories are unioned first, so the frames are
+    only recoded when they add new values. Categories are kept sorted, so that sorting by these columns stays
+    lexical.
+    """
+    frames = list(frames)
+    for col in CATEGORICAL_COLS:
+        if not all(col in frame.columns for frame in frames):
+            continue
+        categories = pd.Index([])
+        for frame in frames:
+            column = frame[col]
+            values = column.cat.categories if isinstance(column.dtype, pd.CategoricalDtype) else column.unique()
+            categories = categories.append(pd.Index(values).difference(categories))
+        dtype = pd.CategoricalDtype(categories.sort_values())
+        frames = [frame.astype({col: dtype}) for frame in frames]
+    return pd.concat(frames)
+
+
+@dataclass(frozen=True)
+class IdCodes:
+    """
+    Reverse dictionary of integer-coded ids: in index level `level`, code `i` stands for `ids[level][i]`.
+
+    Returned by `Dataset.encode_ids`, together with the encoded dataset.
+    """
+
+    ids: Dict[str, pd.Index]
+
+    def encode(self, level: str, ids: Iterable[Hashable]) -> np.ndarray:
+        codes = self.ids[level].get_indexer(list(ids))
+        assert (codes >= 0).all(), f"Some of the ids are not in the {level} dictionary."
+        return codes.astype(np.int64)
+
+    def decode(self, level: str, codes: Sequence[int] | np.ndarray) -> pd.Index:
+        return self.ids[level].take(np.asarray(codes, dtype=np.int64))
+
+    def decode_index(self, index: pd.MultiIndex) -> pd.MultiIndex:
+        arrays = [
+            self.decode(name, index.get_level_values(name)) if name in self.ids else index.get_level_values(name)
+            for name in index.names
+        ]
+        return pd.MultiIndex.from_arrays(arrays, names=index.names)
+
+
+def encode_ids(frames: Sequence[pd.DataFrame], levels: Iterable[str] = INDICES) -> Tuple[List[pd.DataFrame], IdCodes]:
+    """
+    Replace the ids in the given index `levels` by dense int64 codes, shared by all `frames` (e.g. the samples and
+    annotations tables of a SingularDataset). Codes follow the order of first appearance.
+    """
+    levels = list(levels)
+    lengths = [len(frame) for frame in frames]
+    bounds = np.cumsum([0] + lengths)
+    ids = {}
+    encoded_levels = {}
+    for level in levels:
+        values = [frame.index.get_level_values(level) for frame in frames]
+        codes, uniques = pd.factorize(values[0].append(values[1:]))
+        ids[level] = uniques.rename(level)
+        encoded_levels[level] = codes.astype(np.int64)
+
+    encoded = []
+    for i, frame in enumerate(frames):
+        arrays = [
+            encoded_levels[name][bounds[i] : bounds[i + 1]] if name in ids else frame.index.get_level_values(name)
+            for name in frame.index.names
+        ]
+        encoded.append(frame.set_axis(pd.MultiIndex.from_arrays(arrays, names=frame.index.names)))
+    return encoded, IdCodes(ids)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Sequence, Tuple
+
+import pandas as pd
+from typing_extensions import Self
+
+from bridge.primitives.dataset.table_api import TableAPI
+
+if TYPE_CHECKING:
+    from bridge.primitives.dataset.dataset import Dataset
+    from bridge.primitives.dataset.singular_dataset import SingularDataset
+    from bridge.primitives.sample import Sample
+
+ELEMENTS = "elements"
+SAMPLES = "samples"
+ANNOTATIONS = "annotations"
+
+
+def rowwise(fn: Callable) -> Callable:
+    """
+    Mark an assign or select function as row-wise: every output value depends only on the same row of its input, e.g.
+    `rowwise(lambda df: df.width * df.height)`, but not `lambda df: df.area.rank()` or `lambda df: df.index[:3]`.
+    Filters can only be pushed ahead of assigns whose values are all row-wise (or scalars), and only row-wise filters
+    can be pushed ahead of sorts, since the others may depend on the order of the rows.
+    """
+    fn.__bridge_rowwise__ = True
+    return fn
+
+
+def _is_rowwise(value: Any) -> bool:
+    if callable(value):
+        return getattr(value, "__bridge_rowwise__", False)
+    return pd.api.types.is_scalar(value)
+
+
+@dataclass(frozen=True)
+class Select:
+    selectors: Tuple[Callable, ...]
+    target: str = ELEMENTS
+    columns: FrozenSet[str] | None = None  # columns read by the selectors, None if unknown
+
+    @property
+    def rowwise(self) -> bool:
+        return all(_is_rowwise(selector) for selector in self.selectors)
+
+    def fuse(self, other: Select) -> Select:
+        columns = None if self.columns is None or other.columns is None else self.columns | other.columns
+        return Select(self.selectors + other.selectors, self.target, columns)
+
+    def __str__(self):
+        columns = "?" if self.columns is None else sorted(self.columns)
+        return f"Select[{self.target}](n_selectors={len(self.selectors)}, columns={columns}, rowwise={self.rowwise})"
+
+
+@dataclass(frozen=True)
+class Assign:
+    values: Dict[str, Any] = field(hash=False)
+    target: str = ELEMENTS
+
+    @property
+    def rowwise(self) -> bool:
+        return all(_is_rowwise(v) for v in self.values.values())
+
+    def __str__(self):
+        return f"Assign[{self.target}](columns={list(self.values)}, rowwise={self.rowwise})"
+
+
+@dataclass(frozen=True)
+class Sort:
+    by: str
+    ascending: bool = True
+    target: str = ELEMENTS
+
+    def __str__(self):
+        return f"Sort[{self.target}](by={self.by!r}, ascending={self.ascending})"
+
+
+PlanNode = Select | Assign | Sort
+
+
+def _same_table(a: PlanNode, b: PlanNode) -> bool:
+    # `samples` and `annotations` nodes are two views of the same SingularDataset, `elements` nodes operate on the
+    # combined table and must keep their position relative to them.
+    return (a.target == ELEMENTS) == (b.target == ELEMENTS)
+
+
+def _can_push_select(select: Select, node: PlanNode) -> bool:
+    if not _same_table(select, node):
+        return False
+    if isinstance(node, Sort):
+        return select.rowwise
+    if isinstance(node, Assign):
+        return node.rowwise and select.columns is not None and select.columns.isdisjoint(node.values.keys())
+    return False
+
+
+def optimize(plan: Sequence[PlanNode]) -> List[PlanNode]:
+    """
+    Rewrite a logical plan into an equivalent, cheaper one:
+        1. Row-wise selects are pushed ahead of sorts, and selects are pushed ahead of row-wise assigns they don't read
+           from, so that the more expensive operations run on fewer rows.
+        2. Consecutive selects on the same view are fused into a single select.
+    """
+    plan = list(plan)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(1, len(plan)):
+            prev, node = plan[i - 1], plan[i]
+            if not isinstance(node, Select):
+                continue
+            if isinstance(prev, Select) and prev.target == node.target:
+                plan[i - 1 : i + 1] = [prev.fuse(node)]
+                changed = True
+                break
+            if _can_push_select(node, prev):
+                plan[i - 1], plan[i] = node, prev
+                changed = True
+                break
+    return plan
+
+
+class LazyDataset(TableAPI):
+    """
+    Records `TableAPI` operations as a logical plan instead of running them one by one. The plan is optimized (see
+    `optimize`) and executed only when rows or samples are requested, producing a single Dataset.
+
+    Example:
+        >>> lazy = ds.lazy().select(lambda df: df.element_type == "bbox", columns=["element_type"]).sort("area")
+        >>> print(lazy.explain())
+        >>> ds = lazy.collect()
+    """
+
+    def __init__(self, source: Dataset, plan: Tuple[PlanNode, ...] = ()):
+        self._source = source
+        self._plan = plan
+        self._result = None
+
+    @property
+    def plan(self) -> List[PlanNode]:
+        return list(self._plan)
+
+    @property
+    def optimized_plan(self) -> List[PlanNode]:
+        return optimize(self._plan)
+
+    def explain(self) -> str:
+        lines = [f"Source: {type(self._source).__name__}"]
+        for i, node in enumerate(self.optimized_plan):
+            lines.append(f"{'  ' * i}└─ {node}")
+        return "\n".join(lines)
+
+    def collect(self) -> Dataset:
+        if self._result is None:
+            self._result = self._source._apply_plan(self.optimized_plan)
+        return self._result
+
+    @property
+    def elements(self) -> pd.DataFrame:
+        return self.collect().elements
+
+    def select(self, selector: Callable, columns: Iterable[str] | None = None) -> Self:
+        return self._extend(Select((selector,), ELEMENTS, None if columns is None else frozenset(columns)))
+
+    def assign(self, **kwargs: Dict[str, Callable[[pd.DataFrame], Sequence]]) -> Self:
+        return self._extend(Assign(kwargs, ELEMENTS))
+
+    def sort(self, by: str, ascending: bool = True) -> Self:
+        return self._extend(Sort(by, ascending, ELEMENTS))
+
+    def iget(self, index: int) -> Sample:
+        return self.collect().iget(index)
+
+    def get(self, sample_id: Hashable) -> Sample:
+        return self.collect().get(sample_id)
+
+    def __getitem__(self, item):
+        return self.collect()[item]
+
+    def __iter__(self) -> Iterator[Sample]:
+        return iter(self.collect())
+
+    def __len__(self) -> int:
+        return len(self.collect())
+
+    def __repr__(self) -> str:
+        return f"Lazy{type(self._source).__name__}: {len(self._plan)} pending operations"
+
+    def _extend(self, node: PlanNode) -> Self:
+        return type(self)(self._source, self._plan + (node,))
+
+
+class LazySingularDataset(LazyDataset):
+    def __init__(self, source: SingularDataset, plan: Tuple[PlanNode, ...] = ()):
+        super().__init__(source, plan)
+
+    @property
+    def samples(self) -> pd.DataFrame:
+        return self.collect().samples
+
+    @property
+    def annotations(self) -> pd.DataFrame:
+        return self.collect().annotations
+
+    def select_samples(
+        self, selector: Callable[[pd.DataFrame, pd.DataFrame], Sequence], columns: Iterable[str] | None = None
+    ) -> Self:
+        return self._extend(Select((selector,), SAMPLES, None if columns is None else frozenset(columns)))
+
+    def select_annotations(
+        self, selector: Callable[[pd.DataFrame, pd.DataFrame], Sequence], columns: Iterable[str] | None = None
+    ) -> Self:
+        return self._extend(Select((selector,), ANNOTATIONS, None if columns is None else frozenset(columns)))
+
+    def assign_samples(self, **kwargs: Callable[[pd.DataFrame, pd.DataFrame], Sequence] | Sequence) -> Self:
+        return self._extend(Assign(kwargs, SAMPLES))
+
+    def assign_annotations(self, **kwargs: Callable[[pd.DataFrame, pd.DataFrame], Sequence] | Sequence) -> Self:
+        return self._extend(Assign(kwargs, ANNOTATIONS))
+
+    def sort_samples(self, by: str, ascending: bool = True) -> Self:
+        return self._extend(Sort(by, ascending, SAMPLES))
+
+    def sort_annotations(self, by: str, ascending: bool = True) -> Self:
+        return self._extend(Sort(by, ascending, ANNOTATIONS))
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Set
+
+import numpy as np
+import pandas as pd
+
+from bridge.utils.constants import ELEMENT_COLS
+
+DATA_COL = ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA
+INDEX = "Index"
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    """
+    Bytes held by a dataset's elements table.
+
+    `columns` has an entry per column, plus `"Index"` for the index. With `deep=True` the `data` column counts the
+    payloads it references (ndarray and tensor buffers, `BoundingBox`es, `ClassLabel`s, `URIComponents`, ...).
+    Buffers and containers shared by several rows, like views into one large array, are counted once. `etypes` and
+    `categories` break the `data` column down by element type and load category, attributing a shared buffer to the
+    first row that references it.
+    """
+
+    columns: Dict[str, int]
+    etypes: Dict[str, int]
+    categories: Dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.columns.values())
+
+
+def memory_usage(elements: pd.DataFrame, deep: bool = True) -> MemoryUsage:
+    columns = {INDEX: int(elements.index.memory_usage(deep=deep))}
+    columns.update({col: int(n) for col, n in elements.memory_usage(deep=deep, index=False).items()})
+    data = elements[DATA_COL].to_numpy(dtype=object)
+    if deep:
+        sizer = PayloadSizer()
+        row_bytes = np.fromiter((sizer.sizeof(obj) for obj in data), dtype=np.int64, count=len(data))
+    else:
+        row_bytes = np.full(len(data), data.itemsize, dtype=np.int64)
+    columns[DATA_COL] = int(data.itemsize * len(data) + (row_bytes.sum() if deep else 0))
+    return MemoryUsage(
+        columns=columns,
+        etypes=_sum_by(row_bytes, elements[ELEMENT_COLS.ETYPE]),
+        categories=_sum_by(row_bytes, elements[ELEMENT_COLS.LOAD_MECHANISM.CATEGORY]),
+    )
+
+
+class PayloadSizer:
+    """
+    Deep size of payload objects. Every array/tensor buffer and every mutable or container object is counted only the
+    first time it is seen by this sizer, immutable scalars and strings every time.
+    """
+
+    def __init__(self):
+        self._seen_objects: Set[int] = set()
+        self._seen_buffers: Set[Hashable] = set()
+
+    def sizeof(self, obj: Any) -> int:
+        if obj is None:
+            return 0
+        if isinstance(obj, (str, bytes, int, float, bool, np.generic)):
+            # immutable values are counted per reference, like `DataFrame.memory_usage(deep=True)` does, so that sizes
+            # of disjoint rows add up even when the interpreter shares the objects (small ints, interned strings)
+            return sys.getsizeof(obj)
+        if id(obj) in self._seen_objects:
+            return 0
+        self._seen_objects.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            return self._array_sizeof(obj)
+        if hasattr(obj, "untyped_storage"):  # torch tensors
+            storage = obj.untyped_storage()
+            return sys.getsizeof(obj) + self._buffer(("torch", storage.data_ptr()), storage.nbytes())
+        if hasattr(obj, "getbands") and hasattr(obj, "size"):  # PIL images
+            width, height = obj.size
+            return sys.getsizeof(obj) + width * height * len(obj.getbands())
+        size = sys.getsizeof(obj)
+        if isinstance(obj, bytearray):
+            return size
+        if isinstance(obj, dict):
+            return size + sum(self.sizeof(k) + self.sizeof(v) for k, v in obj.items())
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            return size + sum(self.sizeof(item) for item in obj)
+        if dataclasses.is_dataclass(obj) and not hasattr(obj, "__dict__"):
+            return size + sum(self.sizeof(getattr(obj, field.name)) for field in dataclasses.fields(obj))
+        if hasattr(obj, "__dict__"):
+            return size + self.sizeof(vars(obj))
+        return size
+
+    def _array_sizeof(self, array: np.ndarray) -> int:
+        root = array
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        header = sys.getsizeof(array) - (array.nbytes if array.flags.owndata else 0)
+        if root.base is not None:  # memory owned by another object, e.g. bytes or an mmap
+            return header + self._buffer(id(root.base), root.nbytes)
+        return header + self._buffer(id(root), root.nbytes)
+
+    def _buffer(self, key: Hashable, nbytes: int) -> int:
+        if key in self._seen_buffers:
+            return 0
+        self._seen_buffers.add(key)
+        return int(nbytes)
+
+
+def _sum_by(row_bytes: np.ndarray, keys: pd.Series) -> Dict[str, int]:
+    sums = pd.Series(row_bytes, index=keys.index).groupby(keys.to_numpy(), sort=True).sum()
+    return {key: int(n) for key, n in sums.items()}
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import pickle
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.utils import optional_dependencies
+from bridge.utils.constants import ELEMENT_COLS, INDICES
+from bridge.utils.data_objects import BoundingBox, ClassLabel
+
+with optional_dependencies("raise", ["arrow"]):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+DATA_COL = ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA
+REQUIRED_COLS = ELEMENT_COLS.list()
+METADATA_KEY = b"bridge"
+
+# the `data` column is split into a URI string column and the typed columns below
+KIND_COL = "__data_kind__"
+CLASS_IDX_COL = "__data_class_idx__"
+CLASS_NAME_COL = "__data_class_name__"
+COORDS_COL = "__data_coords__"
+BLOB_COL = "__data_blob__"
+DATA_ENCODING_COLS = [KIND_COL, CLASS_IDX_COL, CLASS_NAME_COL, COORDS_COL, BLOB_COL]
+
+URI = "uri"
+CLASS_LABEL = "class_label"
+BBOX = "bbox"
+BLOB = "blob"
+
+
+def write_elements(elements: pd.DataFrame, path: str | Path):
+    """
+    Write an elements table to a parquet file.
+
+    Payloads in the `data` column are stored by kind: `URIComponents` as URI strings, `ClassLabel`s and
+    `BoundingBox`es as typed columns (class index and name, and a list of 4 coordinates), anything else pickled into
+    a binary column. The coordinates column has the dtype of the boxes' coordinates, so they are read back with it,
+    and boxes whose coordinates have another dtype than most are pickled. Metadata columns Arrow can't represent are
+    pickled as well.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(elements_to_arrow(elements), path)
+
+
+def read_elements(
+    path: str | Path,
+    columns: Iterable[str] | None = None,
+    filters: List[Any] | pa.compute.Expression | None = None,
+) -> pd.DataFrame:
+    """
+    Read an elements table written by `write_elements`, memory-mapping the file.
+
+    `columns` selects metadata columns to read (the element columns are always read). `filters` is pushed down to
+    the parquet reader, in the `pyarrow.parquet.read_table` format, e.g. `[("element_type", "==", "bbox")]`.
+    """
+    schema = pq.read_schema(path)
+    metadata = json.loads(schema.metadata[METADATA_KEY])
+    all_columns = metadata["columns"]
+    if columns is None:
+        wanted = all_columns
+    else:
+        columns = set(columns)
+        unknown = columns - set(all_columns)
+        assert len(unknown) == 0, f"Columns {unknown} are not in {path}."
+        wanted = [col for col in all_columns if col in columns or col in REQUIRED_COLS]
+    physical = wanted + [col for col in DATA_ENCODING_COLS if col in schema.names]
+    table = pq.read_table(path, columns=physical, filters=filters, memory_map=True)
+    return arrow_to_elements(table, wanted, metadata["pickled"])
+
+
+def elements_to_arrow(elements: pd.DataFrame) -> pa.Table:
+    df = elements.reset_index()
+    arrays = {}
+    pickled = []
+    for col in df.columns:
+        if col == DATA_COL:
+            arrays.update(_encode_data(df[col].to_numpy(dtype=object)))
+            continue
+        try:
+            arrays[col] = pa.Array.from_pandas(df[col])
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            arrays[col] = pa.array([pickle.dumps(v) for v in df[col]], type=pa.binary())
+            pickled.append(col)
+    metadata = {"columns": df.columns.to_list(), "pickled": pickled}
+    return pa.table(arrays).replace_schema_metadata({METADATA_KEY: json.dumps(metadata)})
+
+
+def arrow_to_elements(table: pa.Table, columns: List[str], pickled: List[str]) -> pd.DataFrame:
+    encoding_cols = [col for col in DATA_ENCODING_COLS if col in table.column_names]
+    df = table.drop_columns(encoding_cols + [DATA_COL]).to_pandas(split_blocks=True)
+    df[DATA_COL] = pd.Series(_decode_data(table), index=df.index, dtype=object)
+    for col in pickled:
+        if col in df.columns:
+            df[col] = pd.Series([pickle.loads(v) for v in table.column(col).to_pylist()], index=df.index, dtype=object)
+    return df[columns].set_index(INDICES)
+
+
+def _encode_data(values: np.ndarray) -> Dict[str, pa.Array]:
+    n = len(values)
+    kinds = [BLOB] * n
+    urls, class_idx, class_names, coords, blobs = ([None] * n for _ in range(5))
+    for i, value in enumerate(values):
+        if isinstance(value, URIComponents):
+            kinds[i] = URI
+            urls[i] = str(value)
+            continue
+        if isinstance(value, BoundingBox):
+            kinds[i] = BBOX
+            coords[i] = np.asarray(value.coords)
+            label = value.class_label
+        elif isinstance(value, ClassLabel):
+            kinds[i] = CLASS_LABEL
+            label = value
+        else:
+            blobs[i] = pickle.dumps(value)
+            continue
+        if label is not None:
+            class_idx[i] = int(label.class_idx)
+            class_names[i] = label.class_name
+    coords_type = None
+    box_rows = [i for i, kind in enumerate(kinds) if kind == BBOX]
+    if len(box_rows) > 0:
+        coords_dtype = Counter(coords[i].dtype for i in box_rows).most_common(1)[0][0]
+        coords_type = _coords_type(coords_dtype)
+        for i in box_rows:
+            if coords_type is None or coords[i].dtype != coords_dtype:
+                kinds[i], blobs[i] = BLOB, pickle.dumps(values[i])
+                coords[i] = class_idx[i] = class_names[i] = None
+            else:
+                coords[i] = coords[i].tolist()
+    arrays = {
+        DATA_COL: pa.array(urls, type=pa.string()),
+        KIND_COL: pa.array(kinds, type=pa.string()).dictionary_encode(),
+    }
+    if any(kind in (CLASS_LABEL, BBOX) for kind in kinds):
+        arrays[CLASS_IDX_COL] = pa.array(class_idx, type=pa.int64())
+        arrays[CLASS_NAME_COL] = pa.array(class_names, type=pa.string())
+    if BBOX in kinds:
+        arrays[COORDS_COL] = pa.array(coords, type=pa.list_(coords_type, 4))
+    if BLOB in kinds:
+        arrays[BLOB_COL] = pa.array(blobs, type=pa.binary())
+    return arrays
+
+
+def _decode_data(table: pa.Table) -> np.ndarray:
+    data = np.empty(table.num_rows, dtype=object)
+    kinds = np.asarray(table.column(KIND_COL).to_numpy(), dtype=object)
+
+    rows = np.flatnonzero(kinds == URI)
+    if len(rows) > 0:
+        for row, url in zip(rows, table.column(DATA_COL).take(rows).to_pylist()):
+            data[row] = _parse_uri(url)
+
+    rows = np.flatnonzero(kinds == BLOB)
+    if len(rows) > 0:
+        for row, blob in zip(rows, table.column(BLOB_COL).take(rows).to_pylist()):
+            data[row] = pickle.loads(blob)
+
+    label_rows = np.flatnonzero((kinds == CLASS_LABEL) | (kinds == BBOX))
+    if len(label_rows) == 0:
+        return data
+    labels = np.empty(table.num_rows, dtype=object)
+    label_cache = {}  # identical labels share one ClassLabel instance
+    idxs = table.column(CLASS_IDX_COL).take(label_rows).to_pylist()
+    names = table.column(CLASS_NAME_COL).take(label_rows).to_pylist()
+    for row, idx, name in zip(label_rows, idxs, names):
+        if idx is not None:
+            key = (idx, name)
+            if key not in label_cache:
+                label_cache[key] = ClassLabel(idx, name)
+            labels[row] = label_cache[key]
+
+    rows = np.flatnonzero(kinds == CLASS_LABEL)
+    data[rows] = labels[rows]
+
+    rows = np.flatnonzero(kinds == BBOX)
+    if len(rows) > 0:
+        coords = table.column(COORDS_COL).take(rows).combine_chunks().flatten().to_numpy().reshape(-1, 4)
+        for row, row_coords in zip(rows, coords):
+            data[row] = BoundingBox(row_coords, class_label=labels[row])
+    return data
+
+
+def _coords_type(dtype: np.dtype) -> pa.DataType | None:
+    # boxes with non-numeric coordinates are pickled
+    if dtype.kind not in "biuf":
+        return None
+    return pa.from_numpy_dtype(dtype)
+
+
+def _parse_uri(url: str) -> URIComponents:
+    # plain paths (the common case for local datasets) don't need the full urlparse
+    if ":" not in url and not url.startswith("//") and not any(c in url for c in ";?#"):
+        return URIComponents(path=url)
+    return URIComponents.from_str(url)
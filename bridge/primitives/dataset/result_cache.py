@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.fingerprint import local_path
+from bridge.utils.constants import ELEMENT_COLS
+
+Records = List[Dict[str, Any]]
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, records BLOB NOT NULL)"
+_MAX_SQL_VARIABLES = 900
+
+
+class ResultCache:
+    """
+    Persistent cache of transformed samples, stored in a SQLite file.
+
+    `Dataset.transform_samples(..., result_cache=cache)` keys every sample by the fingerprint of the transform, of the
+    cache mechanisms and of the sample's elements (ids, load sources and metadata). Samples whose key is in the cache
+    are rebuilt from the stored element records instead of being transformed again. Results whose payloads were
+    written to local files are dropped if one of those files has since disappeared.
+
+    Pair it with cache mechanisms that have a `root_uri`: the records then hold URIs rather than the payloads
+    themselves, and reading a result back is as cheap as reading its metadata.
+
+    Example:
+        >>> cache = ResultCache("/data/coco/transformed.sqlite")
+        >>> ds = ds.transform_samples(transform, cache_mechanisms=cache_mechanisms, result_cache=cache)
+    """
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Records]:
+        keys = list(keys)
+        results = {}
+        for start in range(0, len(keys), _MAX_SQL_VARIABLES):
+            batch = keys[start : start + _MAX_SQL_VARIABLES]
+            query = f"SELECT key, records FROM results WHERE key IN ({','.join('?' * len(batch))})"
+            for key, blob in self._connection().execute(query, batch):
+                records = pickle.loads(blob)
+                if _payloads_exist(records):
+                    results[key] = records
+        return results
+
+    def put_many(self, results: Dict[str, Records]):
+        if len(results) == 0:
+            return
+        rows = [(key, pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)) for key, records in results.items()]
+        with self._connection() as conn:
+            conn.executemany("INSERT OR REPLACE INTO results (key, records) VALUES (?, ?)", rows)
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM results")
+
+    def __contains__(self, key: str) -> bool:
+        return self._connection().execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __repr__(self) -> str:
+        return f"ResultCache({str(self._path)!r})"
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # shard workers may write to the same file concurrently, wait for their locks rather than failing
+            self._conn = sqlite3.connect(self._path, timeout=60, check_same_thread=False)
+            self._conn.execute(_SCHEMA)
+        return self._conn
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"_path": self._path, "_conn": None}
+
+
+def _payloads_exist(records: Records) -> bool:
+    for record in records:
+        url_or_data = record.get(ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA)
+        if isinstance(url_or_data, URIComponents):
+            path = local_path(url_or_data)
+            if path is not None and not os.path.exists(path):
+                return False
+    return True
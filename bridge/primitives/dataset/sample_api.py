@@ -7,10 +7,11 @@ from typing_extensions import Self
 
 if TYPE_CHECKING:
     from bridge.display.display_engine import DisplayEngine
+    from bridge.primitives.dataset.result_cache import ResultCache
     from bridge.primitives.element.data.cache_mechanism import CacheMechanism
     from bridge.primitives.element.element import Element
     from bridge.primitives.sample import Sample
-    from bridge.primitives.sample.transform import SampleTransform
+    from bridge.primitives.sample.transform import BatchSampleTransform, SampleTransform
 
 
 class SampleAPI(abc.ABC):
@@ -25,10 +26,12 @@ class SampleAPI(abc.ABC):
     @abc.abstractmethod
     def transform_samples(
         self,
-        transform: SampleTransform,
+        transform: SampleTransform | BatchSampleTransform,
         map_fn=map,
         cache_mechanisms: Dict[str, CacheMechanism] | None = None,
         display_engine: DisplayEngine | None = None,
+        chunk_size: int | None = None,
+        result_cache: ResultCache | None = None,
     ) -> Self:
         pass
 
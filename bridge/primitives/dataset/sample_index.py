@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+from typing_extensions import Self
+
+from bridge.utils.constants import ELEMENT_COLS
+
+
+class SampleIndex:
+    """
+    Offsets index over an elements table.
+
+    Sample ids are kept in order of first appearance (the order `Dataset.sample_ids` always had), and the rows of
+    every sample are gathered through a stable permutation of the table, so sample number `i` owns the contiguous
+    range `order[offsets[i]:offsets[i + 1]]`. When the table is already grouped by sample (the common case) the
+    permutation is the identity and row ranges are returned as slices.
+    """
+
+    def __init__(self, sample_ids: pd.Index, order: np.ndarray | None, offsets: np.ndarray):
+        self._sample_ids = sample_ids
+        self._order = order
+        self._offsets = offsets
+
+    @classmethod
+    def from_elements(cls, elements: pd.DataFrame) -> Self:
+        return cls.from_sample_ids(elements.index.get_level_values(ELEMENT_COLS.SAMPLE_ID))
+
+    @classmethod
+    def from_sample_ids(cls, sample_ids: Sequence[Hashable] | np.ndarray | pd.Index) -> Self:
+        """
+        Build the index from the sample id of every row, in row order.
+        """
+        codes, sample_ids = pd.factorize(sample_ids)
+        counts = np.bincount(codes, minlength=len(sample_ids))
+        offsets = np.zeros(len(sample_ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        if len(codes) > 0 and np.all(codes[1:] >= codes[:-1]):
+            order = None
+        else:
+            order = np.argsort(codes, kind="stable")
+        return cls(pd.Index(sample_ids), order, offsets)
+
+    def extend(self, sample_ids: Sequence[Hashable] | np.ndarray | pd.Index) -> Self:
+        """
+        Index of the table with rows of the given sample ids appended at its end. When the rows only belong to new
+        samples (the usual case when ingesting data), the existing offsets and order are kept and only the new rows
+        are indexed, otherwise the whole order is recomputed.
+        """
+        codes, uniques = pd.factorize(sample_ids)
+        known = self._sample_ids.get_indexer(uniques)
+        is_new = known == -1
+        n_old_samples, n_old_rows = len(self._sample_ids), self._offsets[-1]
+        unique_codes = known.copy()
+        unique_codes[is_new] = n_old_samples + np.arange(is_new.sum())
+        new_codes = unique_codes[codes]
+        n_samples = n_old_samples + int(is_new.sum())
+        new_sample_ids = self._sample_ids.append(pd.Index(uniques[is_new]))
+
+        if is_new.all():
+            local_codes = new_codes - n_old_samples
+            offsets = np.concatenate(
+                [self._offsets, n_old_rows + np.cumsum(np.bincount(local_codes, minlength=len(uniques)))]
+            )
+            if self._order is None and np.all(local_codes[1:] >= local_codes[:-1]):
+                return type(self)(new_sample_ids, None, offsets)
+            order = np.concatenate([self.order, n_old_rows + np.argsort(local_codes, kind="stable")])
+            return type(self)(new_sample_ids, order, offsets)
+
+        old_codes = np.empty(n_old_rows, dtype=np.int64)
+        old_codes[self.order] = np.repeat(np.arange(n_old_samples), np.diff(self._offsets))
+        all_codes = np.concatenate([old_codes, new_codes])
+        offsets = np.zeros(n_samples + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_codes, minlength=n_samples), out=offsets[1:])
+        order = None if np.all(all_codes[1:] >= all_codes[:-1]) else np.argsort(all_codes, kind="stable")
+        return type(self)(new_sample_ids, order, offsets)
+
+    def move_rows(self, rows: np.ndarray) -> Self:
+        """
+        Index of the same table with its rows moved, row `r` to row `rows[r]`. The rows of every sample must keep their
+        relative order, so only the permutation changes, the offsets are kept.
+        """
+        order = rows[self.order]
+        if np.all(order[1:] > order[:-1]):
+            return type(self)(self._sample_ids, None, self._offsets)
+        return type(self)(self._sample_ids, order, self._offsets)
+
+    @property
+    def sample_ids(self) -> pd.Index:
+        return self._sample_ids
+
+    @property
+    def order(self) -> np.ndarray:
+        if self._order is None:
+            return np.arange(self._offsets[-1])
+        return self._order
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._offsets
+
+    @property
+    def is_grouped(self) -> bool:
+        return self._order is None
+
+    def position(self, sample_id: Hashable) -> int:
+        return self._sample_ids.get_loc(sample_id)
+
+    def rows(self, position: int) -> slice | np.ndarray:
+        n_samples = len(self)
+        if position < 0:
+            position += n_samples
+        if not 0 <= position < n_samples:
+            raise IndexError(f"Sample index {position} is out of range for a dataset with {n_samples} samples.")
+        start, stop = self._offsets[position], self._offsets[position + 1]
+        if self._order is None:
+            return slice(start, stop)
+        return self._order[start:stop]
+
+    def rows_for_id(self, sample_id: Hashable) -> slice | np.ndarray:
+        return self.rows(self.position(sample_id))
+
+    def gather(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Rows of the samples at `positions`, concatenated in that order. Built from the offsets alone, without looking
+        at the ids.
+        """
+        starts, stops = self._offsets[positions], self._offsets[positions + 1]
+        lengths = stops - starts
+        ends = np.cumsum(lengths)
+        rows = np.arange(ends[-1] if len(ends) > 0 else 0, dtype=np.int64) + np.repeat(starts - ends + lengths, lengths)
+        if self._order is None:
+            return rows
+        return self._order[rows]
+
+    def __len__(self) -> int:
+        return len(self._sample_ids)
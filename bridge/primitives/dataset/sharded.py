@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import json
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.dataset.dataset import Dataset
+from bridge.primitives.dataset.singular_dataset import SingularDataset
+from bridge.primitives.dataset.stats import DatasetStats, measure_payload_bytes
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.sample import Sample
+from bridge.utils import optional_dependencies
+from bridge.utils.constants import ELEMENT_COLS, INDICES
+
+with optional_dependencies("raise", ["arrow"]):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+if TYPE_CHECKING:
+    from bridge.display.display_engine import DisplayEngine
+    from bridge.primitives.dataset.result_cache import ResultCache
+    from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+    from bridge.primitives.sample.transform import BatchSampleTransform, SampleTransform
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_NAME = "bridge-sharded"
+FORMAT_VERSION = 1
+PARTS = {"Dataset": ["elements"], "SingularDataset": ["samples", "annotations"]}
+
+
+def write_sharded(ds: Dataset, path: str | Path, n_shards: int = 8) -> Path:
+    """
+    Write `ds` as `n_shards` shards under `path`, each holding the samples of a contiguous range of sample ids.
+
+    Every shard directory holds one Arrow (feather) file per table (`elements`, or `samples` and `annotations` for a
+    SingularDataset), plus a pickle of the in-memory payloads and other values the columnar table can't hold. Payloads
+    stored at a URI are written as URI strings. `manifest.json` records the row and sample counts of every shard, and
+    the stats of each of its tables, so that an opened dataset's `stats` and repr don't read the shards.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    kind = "SingularDataset" if isinstance(ds, SingularDataset) else "Dataset"
+    if kind == "SingularDataset":
+        frames = {"samples": ds.samples, "annotations": ds.annotations}
+        orphans = ds.annotations.index.get_level_values(ELEMENT_COLS.SAMPLE_ID).difference(
+            ds.samples.index.get_level_values(ELEMENT_COLS.SAMPLE_ID)
+        )
+        assert len(orphans) == 0, f"Annotations of sample ids {orphans.to_list()[:5]} match no sample."
+    else:
+        frames = {"elements": ds._elements}
+
+    sample_index = ds.sample_index
+    n_shards = max(1, min(n_shards, len(sample_index)))
+    sample_bounds = np.linspace(0, len(sample_index), n_shards + 1).astype(np.int64)
+    shard_of_sample = np.repeat(np.arange(n_shards), np.diff(sample_bounds))
+    shards = [
+        {"path": f"shard-{i:05d}", "n_samples": int(np.diff(sample_bounds)[i]), "n_rows": {}, "stats": {}}
+        for i in range(n_shards)
+    ]
+
+    for name, frame in frames.items():
+        codes = sample_index.sample_ids.get_indexer(frame.index.get_level_values(ELEMENT_COLS.SAMPLE_ID))
+        assert (codes >= 0).all(), f"{name} has rows whose sample_id matches no sample."
+        row_shards = shard_of_sample[codes]
+        order = np.argsort(row_shards, kind="stable")
+        row_bounds = np.searchsorted(row_shards[order], np.arange(n_shards + 1))
+        for i, shard in enumerate(shards):
+            shard_dir = path / shard["path"]
+            shard_dir.mkdir(exist_ok=True)
+            rows = order[row_bounds[i] : row_bounds[i + 1]]
+            table = frame.iloc[rows]
+            shard["n_rows"][name] = _write_table(table, shard_dir, name)
+            # tables are pickled separately, so their payloads don't share buffers once read and their sizes add up
+            stats = DatasetStats.from_elements(table, 0, payload_bytes=measure_payload_bytes([table]))
+            shard["stats"][name] = dataclasses.asdict(stats)
+
+    manifest = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "dataset": kind,
+        "columns": {name: frame.reset_index().columns.to_list() for name, frame in frames.items()},
+        "shards": shards,
+    }
+    with open(path / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+class ShardedDataset(Dataset):
+    """
+    A dataset stored in the sharded format written by `Dataset.to_sharded`, opened lazily.
+
+    Only the manifest is read on open, and `stats` and the repr are built from it. Shards are loaded when their samples are accessed, one at a time, so iterating
+    holds a single shard in memory. `transform_samples` and `map_samples` process one shard per `map_fn` call (pass
+    `bridge.utils.pmap` to run shards in parallel), and each worker reads its shard from disk rather than receiving
+    a pickled table. Row-level operations (`elements`, `select`, ...) load and concatenate all shards.
+
+    The dataset is read-only, `append_elements` raises a TypeError. Append to a loaded copy (e.g. `Dataset.concat`
+    of the shards) and write it again with `to_sharded`.
+
+    Example:
+        >>> ds.to_sharded("/data/coco_sharded", n_shards=16)
+        >>> ds = Dataset.load_sharded("/data/coco_sharded")
+        >>> ds = ds.transform_samples(transform, map_fn=functools.partial(pmap, n_jobs=8))
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        display_engine: DisplayEngine = None,
+        cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
+    ):
+        self._path = Path(path)
+        with open(self._path / MANIFEST_NAME) as f:
+            self._manifest = json.load(f)
+        assert self._manifest.get("format") == FORMAT_NAME, f"{self._path} is not a sharded bridge dataset."
+        assert self._manifest["version"] <= FORMAT_VERSION, f"Unsupported format version {self._manifest['version']}."
+        self._dataset_cls = SingularDataset if self._manifest["dataset"] == "SingularDataset" else Dataset
+        self._sample_cls = self._dataset_cls._sample_cls
+        n_samples = [shard["n_samples"] for shard in self._manifest["shards"]]
+        self._offsets = np.concatenate([[0], np.cumsum(n_samples)]).astype(np.int64)
+        self._unified: pd.DataFrame | None = None
+        self._loaded_shard: tuple[int, Dataset] | None = None
+        self._shard_sample_ids: pd.Index | None = None
+        super().__init__(None, display_engine, cache_mechanisms)
+
+    @property
+    def _elements(self) -> pd.DataFrame:
+        if self._unified is None:
+            self._unified = pd.concat([self.shard(i)._elements for i in range(self.n_shards)])
+        return self._unified
+
+    @_elements.setter
+    def _elements(self, elements: pd.DataFrame | None):
+        self._unified = elements
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def n_shards(self) -> int:
+        return len(self._manifest["shards"])
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        return self._manifest
+
+    @property
+    def sample_ids(self) -> List[Hashable]:
+        return self._all_sample_ids().to_list()
+
+    def shard(self, index: int) -> Dataset:
+        if self._loaded_shard is None or self._loaded_shard[0] != index:
+            frames = _read_shard(self._path, self._manifest, index)
+            ds = _dataset_from_frames(self._dataset_cls, frames, self._display_engine, self._cache_mechanisms)
+            self._loaded_shard = (index, ds)
+        return self._loaded_shard[1]
+
+    def iget(self, index: int) -> Sample:
+        n_samples = len(self)
+        if index < 0:
+            index += n_samples
+        if not 0 <= index < n_samples:
+            raise IndexError(f"Sample index {index} is out of range for a dataset with {n_samples} samples.")
+        i = int(np.searchsorted(self._offsets, index, side="right")) - 1
+        return self.shard(i).iget(index - self._offsets[i])
+
+    def get(self, sample_id: Hashable) -> Sample:
+        index = self._all_sample_ids().get_loc(sample_id)
+        return self.iget(index)
+
+    def _iter_sample_chunks(self, step: int, display_engine: DisplayEngine | None = None) -> Iterator[List[Sample]]:
+        for i in range(self.n_shards):
+            yield from self.shard(i)._iter_sample_chunks(step, display_engine=display_engine)
+
+    def transform_samples(
+        self,
+        transform: SampleTransform | BatchSampleTransform,
+        map_fn=map,
+        cache_mechanisms: Dict[str, CacheMechanism] | None = None,
+        display_engine: DisplayEngine | None = None,
+        chunk_size: int | None = None,
+        result_cache: ResultCache | None = None,
+    ) -> Dataset:
+        """
+        Transform the dataset shard by shard, `map_fn` is called over shard numbers. Returns the chained results, or,
+        for a sharded SingularDataset, a SingularDataset of the concatenated samples and annotations.
+        """
+        fn = functools.partial(
+            _transform_shard,
+            path=self._path,
+            transform=transform,
+            cache_mechanisms=cache_mechanisms,
+            chunk_size=chunk_size,
+            result_cache=result_cache,
+        )
+        display_engine = display_engine or self._display_engine
+        shard_frames = list(map_fn(fn, range(self.n_shards)))
+        if self._dataset_cls is SingularDataset:
+            frames = {name: pd.concat([frames[name] for frames in shard_frames]) for name in PARTS["SingularDataset"]}
+            return _dataset_from_frames(SingularDataset, frames, display_engine, None)
+        datasets = [_dataset_from_frames(self._dataset_cls, frames, display_engine, None) for frames in shard_frames]
+        return Dataset.concat(datasets, display_engine=display_engine)
+
+    def map_samples(self, function: Callable[[Sample], Any], map_fn=map) -> List[Any]:
+        fn = functools.partial(_map_shard, path=self._path, function=function)
+        return [output for outputs in map_fn(fn, range(self.n_shards)) for output in outputs]
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def __repr__(self) -> str:
+        return f"Sharded{super().__repr__()}"
+
+    def _summary_stats(self) -> DatasetStats:
+        shards = self._manifest["shards"]
+        if self._stats is None and all("stats" in shard for shard in shards):  # older manifests don't record stats
+            stats = DatasetStats(n_samples=len(self), n_elements=0, etype_counts={}, category_counts={})
+            payload_bytes = 0
+            for table_stats in (DatasetStats(**fields) for shard in shards for fields in shard["stats"].values()):
+                stats = stats.combine(table_stats, n_samples=len(self))
+                payload_bytes += table_stats.payload_bytes
+            self._stats = dataclasses.replace(stats, payload_bytes=payload_bytes)
+        return super()._summary_stats()
+
+    def _all_sample_ids(self) -> pd.Index:
+        if self._shard_sample_ids is None:
+            name = PARTS[self._manifest["dataset"]][0]
+            sample_ids = []
+            for shard in self._manifest["shards"]:
+                table = feather.read_table(
+                    self._path / shard["path"] / f"{name}.arrow", columns=[ELEMENT_COLS.SAMPLE_ID], memory_map=True
+                )
+                sample_ids.append(pd.unique(table.column(ELEMENT_COLS.SAMPLE_ID).to_numpy()))
+            self._shard_sample_ids = pd.Index(np.concatenate(sample_ids) if sample_ids else [])
+        return self._shard_sample_ids
+
+    def append_elements(self, elements):
+        raise TypeError(f"{type(self).__name__} is read-only, it can't append elements to the shards on disk.")
+
+    def _connect_caches(self):
+        pass  # every loaded shard connects the caches to its own table
+
+
+def _transform_shard(
+    index: int,
+    path: Path,
+    transform: SampleTransform | BatchSampleTransform,
+    cache_mechanisms: Dict[str, CacheMechanism] | None,
+    chunk_size: int | None,
+    result_cache: ResultCache | None = None,
+) -> Dict[str, pd.DataFrame]:
+    ds = ShardedDataset(path).shard(index)
+    ds = ds.transform_samples(
+        transform, cache_mechanisms=cache_mechanisms, chunk_size=chunk_size, result_cache=result_cache
+    )
+    if isinstance(ds, SingularDataset):
+        return {"samples": ds.samples, "annotations": ds.annotations}
+    return {"elements": ds._elements}
+
+
+def _map_shard(index: int, path: Path, function: Callable[[Sample], Any]) -> List[Any]:
+    return list(map(function, ShardedDataset(path).shard(index)))
+
+
+def _dataset_from_frames(
+    dataset_cls: type,
+    frames: Dict[str, pd.DataFrame],
+    display_engine: DisplayEngine | None,
+    cache_mechanisms: Dict[str, CacheMechanism | None] | None,
+) -> Dataset:
+    if dataset_cls is SingularDataset:
+        return SingularDataset(
+            frames["samples"], frames["annotations"], display_engine=display_engine, cache_mechanisms=cache_mechanisms
+        )
+    return Dataset(frames["elements"], display_engine=display_engine, cache_mechanisms=cache_mechanisms)
+
+
+def _read_shard(path: Path, manifest: Dict[str, Any], index: int) -> Dict[str, pd.DataFrame]:
+    shard_dir = path / manifest["shards"][index]["path"]
+    return {name: _read_table(shard_dir, name, manifest["columns"][name]) for name in PARTS[manifest["dataset"]]}
+
+
+def _write_table(frame: pd.DataFrame, directory: Path, name: str) -> int:
+    df = frame.reset_index()
+    arrays = {}
+    objects: Dict[str, Dict[int, Any]] = {}  # column -> row -> value, for values Arrow can't hold
+    for col in df.columns:
+        values = df[col].to_numpy(dtype=object) if col == ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA else df[col]
+        if col == ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA:
+            is_uri = np.fromiter((isinstance(v, URIComponents) for v in values), dtype=bool, count=len(values))
+            arrays[col] = pa.array([str(v) if uri else None for v, uri in zip(values, is_uri)], type=pa.string())
+            objects[col] = {int(row): values[row] for row in np.flatnonzero(~is_uri)}
+            continue
+        try:
+            arrays[col] = pa.Array.from_pandas(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            objects[col] = dict(enumerate(values.to_numpy(dtype=object)))
+    feather.write_feather(pa.table(arrays), directory / f"{name}.arrow")
+    with open(directory / f"{name}.payloads.pkl", "wb") as f:
+        pickle.dump(objects, f)
+    return len(df)
+
+
+def _read_table(directory: Path, name: str, columns: List[str]) -> pd.DataFrame:
+    table = feather.read_table(directory / f"{name}.arrow", memory_map=True)
+    df = table.to_pandas()
+    with open(directory / f"{name}.payloads.pkl", "rb") as f:
+        objects = pickle.load(f)
+    data_col = ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA
+    data = np.empty(len(df), dtype=object)
+    for row, url in enumerate(table.column(data_col).to_pylist()):
+        if url is not None:
+            data[row] = URIComponents.from_str(url)
+    for row, value in objects.pop(data_col, {}).items():
+        data[row] = value
+    df[data_col] = pd.Series(data, index=df.index, dtype=object)
+    for col, values in objects.items():
+        column = np.empty(len(df), dtype=object)
+        for row, value in values.items():
+            column[row] = value
+        df[col] = pd.Series(column, index=df.index, dtype=object)
+    return df[columns].set_index(INDICES)
@@ -1,19 +1,210 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Dict, Hashable, List, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from typing_extensions import Self
 
+from bridge.primitives.dataset.aggregate import Aggregation, aggregate_by_sample
 from bridge.primitives.dataset.dataset import Dataset
+from bridge.primitives.dataset.encoding import IdCodes, categorize, concat_categorized, encode_ids
+from bridge.primitives.dataset.lazy import ELEMENTS, SAMPLES, Assign, LazySingularDataset, PlanNode, Select, Sort
+from bridge.primitives.dataset.sample_index import SampleIndex
+from bridge.primitives.dataset.stats import DatasetStats
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
 from bridge.primitives.sample.singular_sample import SingularSample
+from bridge.primitives.utils import add_categories, cow_copy
 from bridge.utils.constants import ELEMENT_COLS, INDICES, IS_SAMPLE_COL_NAME
 
 if TYPE_CHECKING:
     from bridge.display import DisplayEngine
+    from bridge.primitives.dataset.result_cache import ResultCache
     from bridge.primitives.element.data.cache_mechanism import CacheMechanism
     from bridge.primitives.element.element import Element
-    from bridge.primitives.sample.transform import SampleTransform
+    from bridge.primitives.sample.transform import BatchSampleTransform, SampleTransform
+
+
+PARTITIONS = ("samples", "annotations")
+
+
+class SingularElementsTable:
+    """
+    Storage of a SingularDataset: the samples and annotations tables as two frames, each with only its own columns.
+    The combined elements table, with the `is_example` column, is concatenated the first time it is read and cached.
+
+    `annotation_index` maps every sample id to the row range of its annotations, so that selecting samples prunes
+    the annotations by gathering row ranges (`take_samples`). It is built on first use and carried over by tables
+    derived without changing the annotations' rows.
+
+    Derived tables share the partition frames they did not change with the table they come from, and a table made by
+    `SingularDataset(samples, annotations)` shares its frames with the caller. `update_element` copies a shared
+    partition the first time it writes to it and writes to the other partitions in place.
+    """
+
+    def __init__(
+        self,
+        samples: pd.DataFrame,
+        annotations: pd.DataFrame,
+        annotation_index: SampleIndex | None = None,
+        sample_codes: np.ndarray | None = None,
+        shared: Iterable[str] = (),
+    ):
+        self.samples = categorize(_drop_is_sample(samples))
+        self.annotations = categorize(_drop_is_sample(annotations))
+        self._annotation_index = annotation_index
+        self._sample_codes = sample_codes
+        self._pandas = None
+        self._shared_partitions = set(shared)  # partitions held outside this table, copied before a write
+
+    @classmethod
+    def from_pandas(cls, elements: pd.DataFrame) -> Self:
+        """
+        Split a combined elements table by its `is_example` column.
+        """
+        is_sample = elements[IS_SAMPLE_COL_NAME].to_numpy(dtype=bool)
+        # each partition only keeps the columns it has values in
+        samples = elements.loc[is_sample].dropna(axis="columns", how="all")
+        annotations = elements.loc[~is_sample].dropna(axis="columns", how="all")
+        return cls(samples, annotations)
+
+    def __len__(self) -> int:
+        return len(self.samples) + len(self.annotations)
+
+    def to_pandas(self) -> pd.DataFrame:
+        if self._pandas is None:
+            self._pandas = concat_categorized(
+                [
+                    self.samples.assign(**{IS_SAMPLE_COL_NAME: True}),
+                    self.annotations.assign(**{IS_SAMPLE_COL_NAME: False}),
+                ]
+            )
+        return self._pandas
+
+    def sample_index(self) -> SampleIndex:
+        """
+        Index over the rows of the combined table (the samples, then the annotations), built from the partitions' ids
+        without concatenating them.
+        """
+        sample_ids = self.samples.index.get_level_values(ELEMENT_COLS.SAMPLE_ID)
+        return SampleIndex.from_sample_ids(
+            sample_ids.append(self.annotations.index.get_level_values(ELEMENT_COLS.SAMPLE_ID))
+        )
+
+    @property
+    def annotation_index(self) -> SampleIndex:
+        if self._annotation_index is None:
+            self._annotation_index = SampleIndex.from_elements(self.annotations)
+        return self._annotation_index
+
+    @property
+    def sample_codes(self) -> np.ndarray:
+        """
+        Position in `annotation_index` of the sample id of every samples row, -1 for samples without annotations.
+        """
+        if self._sample_codes is None:
+            sample_ids = self.samples.index.get_level_values(ELEMENT_COLS.SAMPLE_ID)
+            self._sample_codes = self.annotation_index.sample_ids.get_indexer(sample_ids)
+        return self._sample_codes
+
+    def take_samples(self, positions: np.ndarray) -> Self:
+        """
+        Table with the samples rows at `positions` and the annotations of their sample ids, which keep their order.
+        """
+        index = self.annotation_index
+        codes = self.sample_codes[positions]
+        is_kept = np.zeros(len(index), dtype=bool)
+        is_kept[codes[codes >= 0]] = True
+        annotation_codes = np.flatnonzero(is_kept)
+        rows = index.gather(annotation_codes)
+        if not index.is_grouped:
+            return type(self)(self.samples.iloc[positions], self.annotations.iloc[np.sort(rows)])
+        # annotations grouped by sample stay grouped, their index is the selected part of this one
+        lengths = np.diff(index.offsets)[annotation_codes]
+        offsets = np.zeros(len(annotation_codes) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        new_codes = np.full(len(index), -1, dtype=np.int64)
+        new_codes[annotation_codes] = np.arange(len(annotation_codes))
+        return type(self)(
+            self.samples.iloc[positions],
+            self.annotations.iloc[rows],
+            annotation_index=SampleIndex(index.sample_ids[annotation_codes], None, offsets),
+            sample_codes=np.where(codes >= 0, new_codes[codes], -1),
+        )
+
+    def with_samples(self, samples: pd.DataFrame, same_rows: bool = False) -> Self:
+        """
+        Table with new samples and the same annotations. `same_rows` tells that `samples` has the rows of
+        `self.samples` in the same order, e.g. with assigned columns.
+        """
+        return self._derive(
+            samples,
+            self.annotations,
+            annotation_index=self._annotation_index,
+            sample_codes=self._sample_codes if same_rows else None,
+        )
+
+    def with_annotations(self, annotations: pd.DataFrame, same_rows: bool = False) -> Self:
+        """
+        Table with the same samples and new annotations. `same_rows` tells that `annotations` has the rows of
+        `self.annotations` in the same order, e.g. with assigned columns.
+        """
+        if same_rows:
+            return self._derive(self.samples, annotations, self._annotation_index, self._sample_codes)
+        return self._derive(self.samples, annotations)
+
+    def append(self, rows: pd.DataFrame) -> Self:
+        """
+        Table with `rows` (which carry the `is_example` column) added at the end of their partitions.
+        """
+        new_rows = SingularElementsTable.from_pandas(rows)
+        annotation_index = self._annotation_index
+        if annotation_index is not None and len(new_rows.annotations) > 0:
+            annotation_index = annotation_index.extend(
+                new_rows.annotations.index.get_level_values(ELEMENT_COLS.SAMPLE_ID)
+            )
+        return self._derive(
+            concat_categorized([self.samples, new_rows.samples]) if len(new_rows.samples) > 0 else self.samples,
+            (
+                concat_categorized([self.annotations, new_rows.annotations])
+                if len(new_rows.annotations) > 0
+                else self.annotations
+            ),
+            annotation_index=annotation_index,
+        )
+
+    def _derive(self, samples: pd.DataFrame, annotations: pd.DataFrame, *args, **kwargs) -> Self:
+        """
+        New table from partition frames, the ones that are this table's own frames are marked shared in both tables.
+        """
+        shared = {name for name, frame in zip(PARTITIONS, (samples, annotations)) if frame is getattr(self, name)}
+        self._shared_partitions.update(shared)
+        return type(self)(samples, annotations, *args, shared=shared, **kwargs)
+
+    def update_element(self, element_id: Hashable, values: Dict[str, Any]):
+        """
+        Overwrite columns of a single element in place, used by `CacheMechanism` to swap in new load mechanisms.
+        """
+        for name in PARTITIONS:
+            if element_id in getattr(self, name).index.get_level_values(ELEMENT_COLS.ID):
+                if name in self._shared_partitions:
+                    setattr(self, name, cow_copy(getattr(self, name)))
+                    self._shared_partitions.discard(name)
+                _update_frame(getattr(self, name), element_id, values)
+        if self._pandas is not None:
+            _update_frame(self._pandas, element_id, values)
+
+
+def _update_frame(frame: pd.DataFrame, element_id: Hashable, values: Dict[str, Any]):
+    add_categories(frame, values)
+    frame.loc[(slice(None), element_id), list(values.keys())] = values.values()
+
+
+def _drop_is_sample(frame: pd.DataFrame) -> pd.DataFrame:
+    if IS_SAMPLE_COL_NAME in frame.columns:
+        return frame.drop(columns=IS_SAMPLE_COL_NAME)
+    return frame
 
 
 class SingularDataset(Dataset):
@@ -22,8 +213,13 @@ class SingularDataset(Dataset):
     and annotations (bboxes, captions, frames, labels)
     This implementation exposes `ds.elements` as two different views: `ds.samples` and `ds.annotations`, and the
     respective `select_<samples/annotations>`, `sort_<examples/annotations>`, `assign_<examples/annotations>` methods.
+
+    The two views are stored separately (see `SingularElementsTable`), so reading them is free and the
+    `select_*`/`assign_*`/`sort_*` methods only process the table they change. `ds.elements` is built on first use.
     """
 
+    _sample_cls = SingularSample
+
     def __init__(
         self,
         samples: pd.DataFrame,
@@ -39,115 +235,305 @@ class SingularDataset(Dataset):
             )
             == 0
         ), "samples and annotations can't share ids"
+        table = SingularElementsTable(samples, annotations, shared=PARTITIONS)
+        super().__init__(table, display_engine, cache_mechanisms)
+
+    @property
+    def _elements(self) -> pd.DataFrame:
+        if self._pending:
+            self.compact()
+        return self._table.to_pandas()
 
-        samples[IS_SAMPLE_COL_NAME] = True
-        annotations[IS_SAMPLE_COL_NAME] = False
-        elements = pd.concat([samples, annotations])
-        super().__init__(elements, display_engine, cache_mechanisms)
+    @_elements.setter
+    def _elements(self, elements: pd.DataFrame | SingularElementsTable):
+        if not isinstance(elements, SingularElementsTable):
+            elements = SingularElementsTable.from_pandas(elements)
+        self._table = elements
+
+    @property
+    def sample_index(self) -> SampleIndex:
+        if self._pending:
+            self.compact()
+        if self._sample_index is None:
+            self._sample_index = self._table.sample_index()
+        return self._sample_index
 
     @property
     def samples(self) -> pd.DataFrame:
-        return (
-            self._elements.loc[self._elements[IS_SAMPLE_COL_NAME]]
-            .dropna(axis="columns", how="all")
-            .drop(columns=IS_SAMPLE_COL_NAME)
-        )
+        if self._pending:
+            self.compact()
+        return cow_copy(self._table.samples)
 
     @property
     def annotations(self) -> pd.DataFrame:
-        return (
-            self._elements.loc[~self._elements[IS_SAMPLE_COL_NAME]]
-            .dropna(axis="columns", how="all")
-            .drop(columns=IS_SAMPLE_COL_NAME)
+        if self._pending:
+            self.compact()
+        return cow_copy(self._table.annotations)
+
+    def compact(self):
+        """
+        Merge appended rows into the samples and annotations tables.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        rows = pending[0] if len(pending) == 1 else pd.concat(pending)
+        index, stats = self._sample_index, self._stats
+        n_sample_rows, n_annotation_rows = len(self._table.samples), len(self._table.annotations)
+        self._table = self._table.append(rows)
+        if index is not None:
+            self._sample_index = self._extend_sample_index(index, n_sample_rows, n_annotation_rows)
+        if stats is not None:
+            self._stats = stats.combine(DatasetStats.from_elements(rows, 0), n_samples=len(self.sample_index))
+        self._connect_caches()
+
+    def _extend_sample_index(
+        self, index: SampleIndex, n_sample_rows: int, n_annotation_rows: int
+    ) -> SampleIndex | None:
+        """
+        `index` extended with the rows appended after the first `n_sample_rows` samples and `n_annotation_rows`
+        annotations. Appended samples land before the annotations in `elements`, so the new rows are indexed as if
+        they came last, and the annotations rows are then shifted past the appended samples. None (rebuilt when
+        needed) if a sample row was appended to a known sample, whose rows would no longer keep their order.
+        """
+        new_sample_ids = self._table.samples.index.get_level_values(ELEMENT_COLS.SAMPLE_ID)[n_sample_rows:]
+        if (index.sample_ids.get_indexer(new_sample_ids) != -1).any():
+            return None
+        new_annotation_ids = self._table.annotations.index.get_level_values(ELEMENT_COLS.SAMPLE_ID)[n_annotation_rows:]
+        index = index.extend(new_sample_ids.append(new_annotation_ids))
+        n_new_samples, n_old_rows = len(new_sample_ids), n_sample_rows + n_annotation_rows
+        if n_new_samples == 0:
+            return index
+        rows = np.arange(n_old_rows + n_new_samples + len(new_annotation_ids))
+        rows[n_sample_rows:n_old_rows] += n_new_samples
+        rows[n_old_rows : n_old_rows + n_new_samples] -= n_annotation_rows
+        return index.move_rows(rows)
+
+    def _connect_caches(self):
+        for cache in self._cache_mechanisms.values():
+            if cache is not None:
+                cache.set_elements_df(self._table)
+
+    def _with_partitions(self, samples: pd.DataFrame, annotations: pd.DataFrame) -> SingularDataset:
+        return self._with_table(SingularElementsTable(samples, annotations))
+
+    def _with_table(self, table: SingularElementsTable) -> SingularDataset:
+        # derived from this dataset's tables, whose ids are already known not to overlap, so the check is skipped
+        ds = SingularDataset.__new__(SingularDataset)
+        Dataset.__init__(ds, table, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms)
+        return ds
+
+    def lazy(self) -> LazySingularDataset:
+        return LazySingularDataset(self)
+
+    def _apply_plan(self, plan: Sequence[PlanNode]) -> Dataset:
+        # the plan runs on copies of the partitions, through the same table operations as the eager methods
+        table = self._table.with_samples(self.samples, same_rows=True).with_annotations(
+            self.annotations, same_rows=True
         )
+        for i, node in enumerate(plan):
+            if node.target == ELEMENTS:
+                return Dataset._apply_plan(self._with_table(table), plan[i:])
+            if isinstance(node, Select):
+                for selector in node.selectors:
+                    selected = selector(table.samples, table.annotations)
+                    if node.target == SAMPLES:
+                        table = table.take_samples(_positions(table.samples, selected))
+                    else:
+                        table = table.with_annotations(table.annotations.loc[selected])
+            elif isinstance(node, Assign):
+                values = self._assign_values(node.values, table.samples, table.annotations)
+                if node.target == SAMPLES:
+                    table = table.with_samples(table.samples.assign(**values), same_rows=True)
+                else:
+                    table = table.with_annotations(table.annotations.assign(**values), same_rows=True)
+            elif isinstance(node, Sort):
+                if node.target == SAMPLES:
+                    samples = table.samples.sort_values(by=node.by, ascending=node.ascending, kind="stable")
+                    table = table.with_samples(samples)
+                else:
+                    annotations = table.annotations.sort_values(by=node.by, ascending=node.ascending, kind="stable")
+                    table = table.with_annotations(annotations)
+        return self._with_table(table)
+
+    def append(
+        self,
+        samples: Iterable[Element] | ElementTableBuilder = (),
+        annotations: Iterable[Element] | ElementTableBuilder = (),
+    ):
+        """
+        Add sample and annotation elements in place, see `Dataset.append_elements`.
+        """
+        frames = []
+        for elements, is_sample in ((samples, True), (annotations, False)):
+            if not isinstance(elements, ElementTableBuilder):
+                builder = ElementTableBuilder()
+                for element in elements:
+                    builder.append_element(element)
+                elements = builder
+            frame = elements.build()
+            frame[IS_SAMPLE_COL_NAME] = is_sample
+            if len(frame) > 0:
+                frames.append(frame)
+        if frames:
+            self._append_rows(pd.concat(frames))
 
-    def iget(self, index: int) -> SingularSample:
-        return SingularSample.from_sample(super().iget(index))
+    def append_elements(self, elements: Iterable[Element] | ElementTableBuilder):
+        """
+        Add elements in place, see `Dataset.append_elements`. Elements whose `is_example` metadata is True are added
+        as samples, the others as annotations. A builder's rows must carry the `is_example` column.
+        """
+        if isinstance(elements, ElementTableBuilder):
+            rows = elements.build()
+            assert IS_SAMPLE_COL_NAME in rows.columns, f"Appended rows must have an '{IS_SAMPLE_COL_NAME}' column."
+            self._append_rows(rows)
+            return
+        samples, annotations = ElementTableBuilder(), ElementTableBuilder()
+        for element in elements:
+            if element.metadata.get(IS_SAMPLE_COL_NAME) is True:
+                samples.append_element(element)
+            else:
+                annotations.append_element(element)
+        self.append(samples, annotations)
 
-    def get(self, sample_id: Hashable) -> SingularSample:
-        return SingularSample.from_sample(super().get(sample_id))
+    @staticmethod
+    def _prune_annotations(samples: pd.DataFrame, annotations: pd.DataFrame) -> pd.DataFrame:
+        # the annotations of `samples`, gathered from the annotations index like `select_samples` does
+        return SingularElementsTable(samples, annotations).take_samples(np.arange(len(samples))).annotations
 
     def select_samples(self, selector: Callable[[pd.DataFrame, pd.DataFrame], Sequence]):
-        selected = selector(self.samples, self.annotations)
-        new_samples = self.samples.loc[selected]
-        new_annotations = self.annotations.pipe(
-            lambda df_: df_.loc[
-                df_.index.get_level_values(ELEMENT_COLS.SAMPLE_ID).isin(
-                    new_samples.index.get_level_values(ELEMENT_COLS.SAMPLE_ID)
-                )
-            ]
-        )
-        return SingularDataset(
-            new_samples,
-            new_annotations,
-            display_engine=self._display_engine,
-            cache_mechanisms=self._cache_mechanisms,
-        )
+        """
+        Keep the selected samples and their annotations. Annotations are pruned by gathering the row ranges of the
+        kept samples from the annotations index, which is built once and carried over by the selected dataset.
+        """
+        samples, annotations = self.samples, self.annotations
+        positions = _positions(samples, selector(samples, annotations))
+        return self._with_table(self._table.take_samples(positions))
 
     def select_annotations(self, selector: Callable[[pd.DataFrame, pd.DataFrame], Sequence]):
-        selected = selector(self.samples, self.annotations)
-        new_annotations = self.annotations.loc[selected]
-
-        return SingularDataset(
-            self.samples,
-            new_annotations,
-            display_engine=self._display_engine,
-            cache_mechanisms=self._cache_mechanisms,
-        )
+        samples, annotations = self.samples, self.annotations
+        new_annotations = annotations.loc[selector(samples, annotations)]
+        return self._with_table(self._table.with_annotations(new_annotations))
 
-    def assign_samples(self, **kwargs: Callable[[pd.DataFrame, pd.DataFrame], Sequence]) -> Self:
-        values_dict = {name: assign_fn(self.samples, self.annotations) for name, assign_fn in kwargs.items()}
-        new_samples = self.samples.assign(**values_dict)
-        return SingularDataset(
-            new_samples,
-            self.annotations,
-            display_engine=self._display_engine,
-            cache_mechanisms=self._cache_mechanisms,
-        )
+    def assign_samples(self, **kwargs: Callable[[pd.DataFrame, pd.DataFrame], Sequence] | Sequence) -> Self:
+        samples, annotations = self.samples, self.annotations
+        new_samples = samples.assign(**self._assign_values(kwargs, samples, annotations))
+        return self._with_table(self._table.with_samples(new_samples, same_rows=True))
 
-    def assign_annotations(self, **kwargs: Callable[[pd.DataFrame, pd.DataFrame], Sequence]) -> Self:
-        values_dict = {name: assign_fn(self.samples, self.annotations) for name, assign_fn in kwargs.items()}
-        new_annotations = self.annotations.assign(**values_dict)
-        return SingularDataset(
-            self.samples,
-            new_annotations,
-            display_engine=self._display_engine,
-            cache_mechanisms=self._cache_mechanisms,
-        )
+    def assign_annotations(self, **kwargs: Callable[[pd.DataFrame, pd.DataFrame], Sequence] | Sequence) -> Self:
+        samples, annotations = self.samples, self.annotations
+        new_annotations = annotations.assign(**self._assign_values(kwargs, samples, annotations))
+        return self._with_table(self._table.with_annotations(new_annotations, same_rows=True))
+
+    @staticmethod
+    def _assign_values(
+        kwargs: Dict[str, Callable[[pd.DataFrame, pd.DataFrame], Sequence] | Sequence],
+        samples: pd.DataFrame,
+        annotations: pd.DataFrame,
+    ) -> Dict[str, Sequence]:
+        # values that aren't callables (e.g. columns of `aggregate_annotations`) are assigned as they are
+        return {name: value(samples, annotations) if callable(value) else value for name, value in kwargs.items()}
+
+    def aggregate_annotations(
+        self, where: Callable[[pd.DataFrame, pd.DataFrame], Sequence] | None = None, **aggregations: Aggregation
+    ) -> pd.DataFrame:
+        """
+        Per-sample reductions over the annotations table, see `Dataset.aggregate_samples`. `where` selects the
+        annotations to reduce, like `select_annotations`.
+
+        The result is indexed like the samples table, so its columns can be passed straight to `assign_samples`.
+
+        Example:
+            >>> stats = ds.aggregate_annotations(n_bboxes=("element_type", "size"), mean_area=("area", "mean"))
+            >>> ds = ds.assign_samples(**stats)
+        """
+        samples, annotations = self.samples, self.annotations
+        if where is not None:
+            annotations = annotations.loc[where(samples, annotations)]
+        sample_ids = pd.Index(samples.index.get_level_values(ELEMENT_COLS.SAMPLE_ID))
+        return aggregate_by_sample(annotations, sample_ids, aggregations).set_axis(samples.index)
 
     def sort_samples(self, by: str, ascending: bool = True):
-        new_samples = self.samples.sort_values(by=by, ascending=ascending)
-        return SingularDataset(
-            new_samples, self.annotations, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms
-        )
+        new_samples = self.samples.sort_values(by=by, ascending=ascending, kind="stable")
+        return self._with_table(self._table.with_samples(new_samples))
 
     def sort_annotations(self, by: str, ascending: bool = True):
-        new_annotations = self.annotations.sort_values(by=by, ascending=ascending)
-        return SingularDataset(
-            self.samples, new_annotations, display_engine=self._display_engine, cache_mechanisms=self._cache_mechanisms
-        )
+        new_annotations = self.annotations.sort_values(by=by, ascending=ascending, kind="stable")
+        return self._with_table(self._table.with_annotations(new_annotations))
 
     def transform_samples(
         self,
-        transform: SampleTransform,
+        transform: SampleTransform | BatchSampleTransform,
         map_fn=map,
         cache_mechanisms: Dict[str, CacheMechanism] | None = None,
         display_engine: DisplayEngine | None = None,
+        chunk_size: int | None = None,
+        result_cache: ResultCache | None = None,
     ) -> Self:
-        ds = super().transform_samples(
-            transform, map_fn=map_fn, cache_mechanisms=cache_mechanisms, display_engine=display_engine
-        )
-        samples = (
-            ds.elements.loc[ds.elements[IS_SAMPLE_COL_NAME]]
-            .dropna(axis="columns", how="all")
-            .drop(columns=IS_SAMPLE_COL_NAME)
+        samples, annotations = ElementTableBuilder(), ElementTableBuilder()
+        for element in self._transformed_elements(
+            transform, map_fn, cache_mechanisms, display_engine, chunk_size, result_cache
+        ):
+            if element.metadata.get(IS_SAMPLE_COL_NAME) is True:
+                samples.append_element(element)
+            else:
+                annotations.append_element(element)
+        # elements built from the combined table carry the other view's columns as NaNs
+        samples_df = samples.build().dropna(axis="columns", how="all").drop(columns=IS_SAMPLE_COL_NAME)
+        annotations_df = annotations.build().dropna(axis="columns", how="all").drop(columns=IS_SAMPLE_COL_NAME)
+        return SingularDataset(samples_df, annotations_df, display_engine=display_engine)
+
+    def encode_ids(self, levels: Iterable[str] = INDICES) -> Tuple[Self, IdCodes]:
+        """
+        See `Dataset.encode_ids`. Samples and annotations share one code dictionary.
+        """
+        (samples, annotations), codes = encode_ids([self.samples, self.annotations], levels)
+        ds = self._with_partitions(samples, annotations)
+        return ds, codes
+
+    def decode_ids(self, codes: IdCodes) -> Self:
+        samples, annotations = self.samples, self.annotations
+        return self._with_partitions(
+            samples.set_axis(codes.decode_index(samples.index)),
+            annotations.set_axis(codes.decode_index(annotations.index)),
         )
-        annotations = (
-            ds.elements.loc[~ds.elements[IS_SAMPLE_COL_NAME]]
-            .dropna(axis="columns", how="all")
-            .drop(columns=IS_SAMPLE_COL_NAME)
+
+    def to_parquet(self, path: str | Path):
+        """
+        Save the dataset to a directory holding `samples.parquet` and `annotations.parquet`. Requires pyarrow.
+        """
+        from bridge.primitives.dataset.parquet import write_elements
+
+        path = Path(path)
+        write_elements(self.samples, path / "samples.parquet")
+        write_elements(self.annotations, path / "annotations.parquet")
+
+    @classmethod
+    def read_parquet(
+        cls,
+        path: str | Path,
+        columns: Iterable[str] | None = None,
+        filters: List[Any] | None = None,
+        annotations_columns: Iterable[str] | None = None,
+        annotations_filters: List[Any] | None = None,
+        display_engine: DisplayEngine = None,
+        cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
+    ) -> Self:
+        """
+        Open a dataset saved with `SingularDataset.to_parquet`. `columns` and `filters` apply to the samples table,
+        and annotations of filtered-out samples are dropped, like `select_samples`. `annotations_columns` and
+        `annotations_filters` apply to the annotations table.
+        """
+        from bridge.primitives.dataset.parquet import read_elements
+
+        path = Path(path)
+        samples = read_elements(path / "samples.parquet", columns=columns, filters=filters)
+        annotations = read_elements(
+            path / "annotations.parquet", columns=annotations_columns, filters=annotations_filters
         )
-        return SingularDataset(samples, annotations, display_engine=display_engine)
+        if filters is not None:
+            annotations = cls._prune_annotations(samples, annotations)
+        return cls(samples, annotations, display_engine=display_engine, cache_mechanisms=cache_mechanisms)
 
     @classmethod
     def from_lists(
@@ -157,10 +543,28 @@ class SingularDataset(Dataset):
         display_engine: DisplayEngine = None,
         cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
     ) -> Self:
-        sample_records = [s.to_dict() for s in samples_list]
-        annotation_records = [a.to_dict() for a in annotations_list]
+        samples_builder, annotations_builder = ElementTableBuilder(), ElementTableBuilder()
+        for sample in samples_list:
+            samples_builder.append_element(sample)
+        for annotation in annotations_list:
+            annotations_builder.append_element(annotation)
+        return cls.from_builders(
+            samples_builder, annotations_builder, display_engine=display_engine, cache_mechanisms=cache_mechanisms
+        )
+
+    @classmethod
+    def from_builders(
+        cls,
+        samples: ElementTableBuilder,
+        annotations: ElementTableBuilder,
+        display_engine: DisplayEngine = None,
+        cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
+    ) -> Self:
+        return cls(
+            samples.build(), annotations.build(), display_engine=display_engine, cache_mechanisms=cache_mechanisms
+        )
 
-        samples_df = pd.DataFrame(sample_records).set_index(INDICES)
-        annotations_df = pd.DataFrame(annotation_records).set_index(INDICES)
 
-        return cls(samples_df, annotations_df, display_engine=display_engine, cache_mechanisms=cache_mechanisms)
+def _positions(frame: pd.DataFrame, selected: Sequence) -> np.ndarray:
+    # row positions of a `.loc` selection (a mask, labels or a slice) of `frame`
+    return pd.Series(np.arange(len(frame)), index=frame.index).loc[selected].to_numpy()
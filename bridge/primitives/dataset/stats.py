@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+import pandas as pd
+from typing_extensions import Self
+
+from bridge.primitives.dataset.memory import PayloadSizer
+from bridge.utils.constants import ELEMENT_COLS
+
+
+@dataclass(frozen=True)
+class DatasetStats:
+    """
+    Summary statistics of a dataset. `payload_bytes` is the deep size of the `data` column's payloads, measured like
+    `Dataset.memory_usage` (see `PayloadSizer`), or None while it hasn't been measured. The counts are cheap to
+    compute, measuring payloads visits every payload.
+    """
+
+    n_samples: int
+    n_elements: int
+    etype_counts: Dict[str, int]
+    category_counts: Dict[str, int]
+    payload_bytes: int | None = None
+
+    @classmethod
+    def from_elements(cls, elements: pd.DataFrame, n_samples: int, payload_bytes: int | None = None) -> Self:
+        return cls(
+            n_samples=n_samples,
+            n_elements=len(elements),
+            etype_counts=_value_counts(elements[ELEMENT_COLS.ETYPE]),
+            category_counts=_value_counts(elements[ELEMENT_COLS.LOAD_MECHANISM.CATEGORY]),
+            payload_bytes=payload_bytes,
+        )
+
+    def combine(self, other: DatasetStats, n_samples: int) -> Self:
+        """
+        Statistics of the union of two datasets with disjoint elements. `n_samples` is passed in, as samples may be
+        shared between the two. `payload_bytes` is left unmeasured: payloads of the two may share buffers, which are
+        counted once.
+        """
+        return type(self)(
+            n_samples=n_samples,
+            n_elements=self.n_elements + other.n_elements,
+            etype_counts=_add_counts(self.etype_counts, other.etype_counts),
+            category_counts=_add_counts(self.category_counts, other.category_counts),
+        )
+
+
+def measure_payload_bytes(tables: Iterable[pd.DataFrame]) -> int:
+    """
+    Deep size of the payloads in the `data` column of `tables`, with buffers shared between rows counted once.
+    """
+    sizer = PayloadSizer()
+    return sum(
+        sizer.sizeof(obj) for elements in tables for obj in elements[ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA].to_numpy()
+    )
+
+
+def _value_counts(column: pd.Series) -> Dict[str, int]:
+    counts = column.value_counts(sort=False)
+    # categorical columns count unused categories as well, and order them by category rather than by value
+    return {key: int(count) for key, count in sorted(counts.items()) if count > 0}
+
+
+def _add_counts(a: Dict[str, int], b: Dict[str, int]) -> Dict[str, int]:
+    counts = dict(a)
+    for key, count in b.items():
+        counts[key] = counts.get(key, 0) + count
+    return dict(sorted(counts.items()))
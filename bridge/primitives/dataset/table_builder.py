@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.element.data import category_registry
+from bridge.primitives.utils import validate_metadata
+from bridge.utils.constants import ELEMENT_COLS, INDICES
+
+if TYPE_CHECKING:
+    from bridge.primitives.element.data.load_mechanism import LoadMechanism
+    from bridge.primitives.element.element import Element
+    from bridge.primitives.element.element_data_type import ELEMENT_DATA_TYPE
+
+ELEMENT_KEYS = ELEMENT_COLS.list()
+
+
+class ElementTableBuilder:
+    """
+    Builds an elements table column by column, without creating an `Element` (or a pandas Series) per row.
+
+    Rows can be added one at a time with `append`, or many at once with `extend_columns`, which takes lists or arrays
+    (scalars are broadcast). `build` concatenates everything into the indexed DataFrame that `Dataset` expects.
+    Column names and categories are validated once per builder rather than once per element.
+
+    Example:
+        >>> builder = ElementTableBuilder()
+        >>> builder.extend_columns(
+        ...     element_id=[f"{i}_img" for i in img_ids], sample_id=img_ids, etype="image",
+        ...     url_or_data=urls, category="image", width=widths,
+        ... )
+        >>> builder.append(element_id="1_bbox", sample_id=1, etype="bbox", url_or_data=box, category="obj", area=10.)
+        >>> ds = Dataset(builder.build())
+    """
+
+    def __init__(self):
+        self._segments: Dict[str, List[pd.Series]] = {}
+        self._rows: Dict[str, List[Any]] = {}  # rows added by `append`, not yet turned into a segment
+        self._n_rows = 0
+        self._n_buffered = 0
+        self._categories = set()
+        self._metadata_names = set()
+
+    def append(
+        self,
+        element_id: Hashable,
+        sample_id: Hashable,
+        etype: str,
+        url_or_data: Any,
+        category: str,
+        **metadata: Any,
+    ):
+        self._validate_metadata_names(metadata.keys())
+        self._append_record(
+            {
+                ELEMENT_COLS.ID: element_id,
+                ELEMENT_COLS.SAMPLE_ID: sample_id,
+                ELEMENT_COLS.ETYPE: etype,
+                ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA: url_or_data,
+                ELEMENT_COLS.LOAD_MECHANISM.CATEGORY: category,
+                **metadata,
+            }
+        )
+
+    def append_element(self, element: Element):
+        self._append_record(element.to_dict())
+
+    def append_load_mechanism(
+        self,
+        element_id: Hashable,
+        sample_id: Hashable,
+        etype: str,
+        load_mechanism: LoadMechanism,
+        **metadata: Any,
+    ):
+        self._validate_metadata_names(metadata.keys())
+        self._append_record(
+            {
+                ELEMENT_COLS.ID: element_id,
+                ELEMENT_COLS.SAMPLE_ID: sample_id,
+                ELEMENT_COLS.ETYPE: etype,
+                **load_mechanism.to_dict(),
+                **metadata,
+            }
+        )
+
+    def extend_columns(
+        self,
+        element_id: Iterable[Hashable] | np.ndarray,
+        sample_id: Iterable[Hashable] | np.ndarray | Hashable,
+        etype: Iterable[str] | str,
+        url_or_data: Iterable[ELEMENT_DATA_TYPE] | np.ndarray,
+        category: Iterable[str] | str,
+        **metadata: Iterable[Any] | Any,
+    ):
+        self._flush_rows()
+        columns = {
+            ELEMENT_COLS.ID: element_id,
+            ELEMENT_COLS.SAMPLE_ID: sample_id,
+            ELEMENT_COLS.ETYPE: etype,
+            ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA: url_or_data,
+            ELEMENT_COLS.LOAD_MECHANISM.CATEGORY: category,
+            **metadata,
+        }
+        self._validate_metadata_names(metadata.keys())
+        length = len(element_id)
+        index = pd.RangeIndex(self._n_rows, self._n_rows + length)
+        for name, values in columns.items():
+            if name == ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA:
+                # payloads are kept as-is (e.g. a list of images must not become one stacked array)
+                series = pd.Series(list(values), index=index, dtype=object)
+            elif pd.api.types.is_scalar(values):
+                series = pd.Series([values] * length, index=index, dtype=object if isinstance(values, str) else None)
+            else:
+                if isinstance(values, (pd.Series, pd.Index)):
+                    values = values.to_numpy()
+                series = pd.Series(values, index=index)
+            assert len(series) == length, f"Column {name} has {len(series)} values, expected {length}."
+            if name == ELEMENT_COLS.LOAD_MECHANISM.CATEGORY:
+                self._categories.update(series.unique())
+            self._segments.setdefault(name, []).append(series)
+        self._n_rows += length
+
+    def __len__(self) -> int:
+        return self._n_rows + self._n_buffered
+
+    def build(self) -> pd.DataFrame:
+        self._flush_rows()
+        unregistered = {c for c in self._categories if not category_registry.is_registered(c)}
+        assert len(unregistered) == 0, f"Categories {unregistered} are not registered."
+        columns = {}
+        for name, segments in self._segments.items():
+            column = segments[0] if len(segments) == 1 else pd.concat(segments)
+            if len(column) != self._n_rows:
+                column = column.reindex(pd.RangeIndex(self._n_rows))  # rows without this (metadata) column
+            columns[name] = column
+        if self._n_rows == 0:
+            return pd.DataFrame(columns=ELEMENT_KEYS).set_index(INDICES)
+        return pd.DataFrame(columns).set_index(INDICES)
+
+    def _append_record(self, record: Dict[str, Any]):
+        for name in record:  # in the record's order, new columns are added like `pd.DataFrame(records)` adds them
+            if name not in self._rows:
+                self._rows[name] = [np.nan] * self._n_buffered
+        for name, column in self._rows.items():
+            column.append(record.get(name, np.nan))
+        self._n_buffered += 1
+
+    def _flush_rows(self):
+        if self._n_buffered == 0:
+            return
+        rows, self._rows = self._rows, {}
+        missing = set(ELEMENT_KEYS) - rows.keys()
+        assert len(missing) == 0, f"Missing keys: {missing}"
+        metadata = {k: v for k, v in rows.items() if k not in ELEMENT_KEYS}
+        self._n_buffered = 0
+        self.extend_columns(
+            element_id=rows[ELEMENT_COLS.ID],
+            sample_id=rows[ELEMENT_COLS.SAMPLE_ID],
+            etype=rows[ELEMENT_COLS.ETYPE],
+            url_or_data=rows[ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA],
+            category=rows[ELEMENT_COLS.LOAD_MECHANISM.CATEGORY],
+            **metadata,
+        )
+
+    def _validate_metadata_names(self, names: Iterable[str]):
+        new_names = set(names) - self._metadata_names
+        if new_names:
+            validate_metadata(ELEMENT_KEYS, dict.fromkeys(new_names))
+            self._metadata_names.update(new_names)
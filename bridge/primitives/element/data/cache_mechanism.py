@@ -6,8 +6,12 @@ import pandas as pd
 
 from bridge.primitives.element.data import category_registry
 from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.fingerprint import fingerprint
+from bridge.primitives.utils import add_categories
 
 if TYPE_CHECKING:
+    from bridge.primitives.dataset.arrow_dataset import ArrowElementsTable
+    from bridge.primitives.dataset.singular_dataset import SingularElementsTable
     from bridge.primitives.element.data.load_mechanism import LoadMechanism
     from bridge.primitives.element.element import Element
     from bridge.primitives.element.element_data_type import ELEMENT_DATA_TYPE
@@ -18,9 +22,13 @@ class CacheMechanism:
         self._elements = None
         self._root_uri = root_uri
 
-    def set_elements_df(self, elements: pd.DataFrame):
+    def set_elements_df(self, elements: pd.DataFrame | ArrowElementsTable | SingularElementsTable):
         self._elements = elements
 
+    def fingerprint(self) -> str:
+        """Depends only on where the mechanism stores payloads, not on the elements it is connected to."""
+        return fingerprint((type(self), None if self._root_uri is None else str(self._root_uri)))
+
     def store(
         self,
         element: Element,
@@ -49,4 +57,8 @@ class CacheMechanism:
 
     def _update_samples_with_new_provider(self, element_id: Hashable, new_provider: LoadMechanism):
         dic = new_provider.to_dict()
-        self._elements.loc[(slice(None), element_id), list(dic.keys())] = dic.values()
+        if isinstance(self._elements, pd.DataFrame):
+            add_categories(self._elements, dic)
+            self._elements.loc[(slice(None), element_id), list(dic.keys())] = dic.values()
+        else:
+            self._elements.update_element(element_id, dic)
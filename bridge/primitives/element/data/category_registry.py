@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, List, Sequence
 
+from bridge.primitives.element.data import concurrent_loading
+from bridge.primitives.element.data.data_cache import DATA_CACHE
 from bridge.primitives.element.data.uri_components import URIComponents
 from bridge.primitives.element.element_data_type import ELEMENT_DATA_TYPE
 
@@ -27,16 +29,55 @@ def register(cls):
 
 
 def store(data: Any, url: URIComponents | None, category: str) -> LoadMechanism:
-    return REGISTRY[category].store(data, url)
+    load_mechanism = REGISTRY[category].store(data, url)
+    DATA_CACHE.invalidate(url, category)  # the url may have held other data
+    return load_mechanism
 
 
 def load(url_or_data: URIComponents | ELEMENT_DATA_TYPE, category: str) -> ELEMENT_DATA_TYPE:
     return REGISTRY[category].load(url_or_data)
 
 
+def load_many(urls_or_data: Sequence[URIComponents | ELEMENT_DATA_TYPE], category: str) -> List[ELEMENT_DATA_TYPE]:
+    """
+    `load` of each source, in order, with the category's `load_many` if it has one.
+    """
+    cls = REGISTRY[category]
+    if hasattr(cls, "load_many"):
+        return cls.load_many(urls_or_data)
+    return [cls.load(url_or_data) for url_or_data in urls_or_data]
+
+
+async def store_async(data: Any, url: URIComponents | None, category: str) -> LoadMechanism:
+    """
+    `store`, awaiting the category's `store_async` if it has one, and running its `store` in a thread otherwise.
+    """
+    cls = REGISTRY[category]
+    if hasattr(cls, "store_async"):
+        load_mechanism = await cls.store_async(data, url)
+    else:
+        load_mechanism = await concurrent_loading.run_in_thread(cls.store, data, url)
+    DATA_CACHE.invalidate(url, category)
+    return load_mechanism
+
+
+async def load_async(url_or_data: URIComponents | ELEMENT_DATA_TYPE, category: str) -> ELEMENT_DATA_TYPE:
+    """
+    `load`, awaiting the category's `load_async` if it has one, and running its `load` in a thread otherwise.
+    """
+    cls = REGISTRY[category]
+    if hasattr(cls, "load_async"):
+        return await cls.load_async(url_or_data)
+    return await concurrent_loading.run_in_thread(cls.load, url_or_data)
+
+
 def extension(category: str) -> str:
     return REGISTRY[category].extension
 
 
+def is_io_bound(category: str) -> bool:
+    return getattr(REGISTRY[category], "io_bound", False)
+
+
 # register default data io classes
 import bridge.primitives.element.data.data_io  # noqa
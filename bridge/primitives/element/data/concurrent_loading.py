@@ -0,0 +1,229 @@
+"""
+Concurrent loading of element payloads.
+
+Loads of I/O-bound categories (`DataIO.io_bound`, e.g. images read from disk or streamed over http) are fanned out
+over a thread pool shared by the whole process, while in-memory payloads and CPU-bound categories are loaded in the
+calling thread. The number of loads of a category in flight at once, across all callers, can be capped with
+`set_concurrency_limit`.
+
+Example:
+    >>> from bridge.primitives.element.data import concurrent_loading
+    >>> concurrent_loading.set_concurrency_limit("image", 16)  # e.g. to be polite to an http server
+    >>> data = sample.load_all()  # same as `sample.data`, with the images loaded concurrently
+    >>> concurrent_loading.set_concurrent_data(True)  # make `sample.data` always load concurrently
+
+From asyncio code, `load_elements_async` awaits the categories' `load_async` instead, and `run_in_thread` offloads
+blocking calls to the same shared pool. `load_elements_batched` loads the payloads of each category with a single
+`DataIO.load_many` call, for categories that read and decode batches on the pool (see `map_in_threads`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence
+
+from bridge.primitives.element.data import category_registry
+from bridge.primitives.element.data.data_cache import DATA_CACHE
+from bridge.primitives.element.data.uri_components import URIComponents
+
+if TYPE_CHECKING:
+    from bridge.primitives.element.element import Element
+    from bridge.primitives.element.element_data_type import ELEMENT_DATA_TYPE
+
+_LOCK = threading.Lock()
+_EXECUTOR: ThreadPoolExecutor | None = None
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_LIMITS: Dict[str, int | None] = {}
+_SEMAPHORES: Dict[str, threading.BoundedSemaphore] = {}
+_CONCURRENT_DATA = False
+_THREAD_NAME_PREFIX = "bridge-load"
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """
+    The process-wide thread pool, created on first use with `max_workers` threads (see `set_max_workers`).
+    """
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix=_THREAD_NAME_PREFIX)
+        return _EXECUTOR
+
+
+def _reset_after_fork():
+    # a pool inherited from the parent process has no threads, and its semaphores may be held by them
+    global _LOCK, _EXECUTOR
+    _LOCK = threading.Lock()
+    _EXECUTOR = None
+    for category, limit in _LIMITS.items():
+        if limit:
+            _SEMAPHORES[category] = threading.BoundedSemaphore(limit)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def set_max_workers(max_workers: int):
+    """
+    Size of the shared thread pool. An existing pool is shut down once its pending loads are done, and replaced.
+    """
+    global _EXECUTOR, _MAX_WORKERS
+    assert max_workers > 0, "max_workers must be positive."
+    with _LOCK:
+        _MAX_WORKERS = max_workers
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def set_concurrency_limit(category: str, limit: int | None):
+    """
+    Cap the number of concurrent loads of `category`. `None` removes the cap (loads are only bounded by the pool
+    size), and 0 loads the category in the calling thread, like CPU-bound categories.
+    """
+    assert category_registry.is_registered(category), f"Category {category} is not registered."
+    assert limit is None or limit >= 0, "limit must be None or non-negative."
+    with _LOCK:
+        _LIMITS[category] = limit
+        if limit:
+            _SEMAPHORES[category] = threading.BoundedSemaphore(limit)
+        else:
+            _SEMAPHORES.pop(category, None)
+
+
+def concurrency_limit(category: str) -> int | None:
+    """
+    The cap set with `set_concurrency_limit`. By default, I/O-bound categories are uncapped (`None`) and the others
+    are loaded in the calling thread (0).
+    """
+    if category in _LIMITS:
+        return _LIMITS[category]
+    return None if category_registry.is_io_bound(category) else 0
+
+
+def set_concurrent_data(enabled: bool):
+    """
+    Make `Sample.data` load concurrently, on the shared pool, like `Sample.load_all`.
+    """
+    global _CONCURRENT_DATA
+    _CONCURRENT_DATA = enabled
+
+
+def concurrent_data_enabled() -> bool:
+    return _CONCURRENT_DATA
+
+
+def load_elements(elements: Sequence[Element], executor: Executor | None = None) -> List[ELEMENT_DATA_TYPE]:
+    """
+    Data of `elements`, in their order. Loads of elements whose payload is behind a URI and whose category has a
+    non-zero concurrency limit run on `executor` (the shared pool by default), the others in the calling thread.
+    Cache mechanisms are updated in the calling thread, in order, once the data is loaded.
+
+    Don't call this from tasks running on the same executor: they would wait on loads queued behind them.
+    """
+    futures: List[Future | None] = []
+    for element in elements:
+        load_mechanism = element._load_mechanism
+        limit = concurrency_limit(load_mechanism.category)
+        if limit == 0 or not isinstance(load_mechanism.url_or_data, URIComponents):
+            futures.append(None)
+            continue
+        if executor is None:
+            executor = shared_executor()
+        semaphore = _SEMAPHORES.get(load_mechanism.category)
+        if semaphore is not None:
+            # acquired before submitting, so that loads waiting for their category don't hold pool threads
+            semaphore.acquire()
+        try:
+            future = executor.submit(load_mechanism.load_data)
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        if semaphore is not None:
+            future.add_done_callback(lambda _, semaphore=semaphore: semaphore.release())
+        futures.append(future)
+
+    # wait for every load before raising, so that no load is left running for a caller that has given up
+    results = []
+    error = None
+    for element, future in zip(elements, futures):
+        try:
+            results.append(element._data_impl() if future is None else element._on_loaded(future.result()))
+        except Exception as e:
+            error = error or e
+            results.append(None)
+    if error is not None:
+        raise error
+    return results
+
+
+async def run_in_thread(function: Callable[..., Any], *args: Any) -> Any:
+    """
+    Await `function(*args)` running on the shared pool, e.g. a blocking load, without blocking the event loop.
+    """
+    return await asyncio.get_running_loop().run_in_executor(shared_executor(), functools.partial(function, *args))
+
+
+async def load_elements_async(
+    elements: Sequence[Element], semaphore: asyncio.Semaphore | None = None
+) -> List[ELEMENT_DATA_TYPE]:
+    """
+    Data of `elements`, in their order, with the loads of payloads behind a URI awaited together through their
+    categories' `load_async` (see `DataIO.load_async`). `semaphore` bounds the number of those loads in flight, and can
+    be shared between calls. In-memory payloads are loaded right away. Like `load_elements`, every load is waited for
+    before raising, and cache mechanisms are updated in order once the data is loaded.
+
+    The per-category limits of `set_concurrency_limit` apply to threads, and aren't used here.
+    """
+
+    async def load(load_mechanism):
+        if not isinstance(load_mechanism.url_or_data, URIComponents):
+            return load_mechanism.load_data()
+        if semaphore is None:
+            return await load_mechanism.load_data_async()
+        async with semaphore:
+            return await load_mechanism.load_data_async()
+
+    data = await asyncio.gather(*(load(element._load_mechanism) for element in elements), return_exceptions=True)
+    for datum in data:
+        if isinstance(datum, BaseException):
+            raise datum
+    return [element._on_loaded(datum) for element, datum in zip(elements, data)]
+
+
+def map_in_threads(function: Callable[[Any], Any], items: Sequence[Any]) -> List[Any]:
+    """
+    `[function(item) for item in items]`, running on the shared pool, e.g. to read or decode a batch of payloads.
+    Called from a task running on the pool, it runs in that task's thread instead of waiting on the pool.
+    """
+    if len(items) < 2 or threading.current_thread().name.startswith(_THREAD_NAME_PREFIX):
+        return [function(item) for item in items]
+    return list(shared_executor().map(function, items))
+
+
+def load_elements_batched(elements: Sequence[Element]) -> List[ELEMENT_DATA_TYPE]:
+    """
+    Data of `elements`, in their order. The payloads behind a URI are loaded with one `category_registry.load_many`
+    call per category, through the decoded-data cache, and in-memory payloads are loaded one by one. Cache mechanisms
+    are updated in order once the data is loaded.
+    """
+    data: List[Any] = [None] * len(elements)
+    positions_by_category: Dict[str, List[int]] = defaultdict(list)
+    for i, element in enumerate(elements):
+        load_mechanism = element._load_mechanism
+        if isinstance(load_mechanism.url_or_data, URIComponents):
+            positions_by_category[load_mechanism.category].append(i)
+        else:
+            data[i] = load_mechanism.load_data()
+    for category, positions in positions_by_category.items():
+        urls = [elements[i]._load_mechanism.url_or_data for i in positions]
+        for i, datum in zip(positions, DATA_CACHE.load_many(urls, category, category_registry.load_many)):
+            data[i] = datum
+    return [element._on_loaded(datum) for element, datum in zip(elements, data)]
@@ -0,0 +1,267 @@
+"""
+Process-wide cache of decoded element data.
+
+`LoadMechanism.load_data` goes through `DATA_CACHE`: payloads loaded from a URI are kept, decoded, under their
+`(category, url)` key, so revisiting a sample (a display slider, a second epoch) doesn't read and decode it again.
+Payloads held in memory aren't cached, there is nothing to decode, and neither are memory-mapped arrays. The cache is
+bounded by a byte budget and evicts the least recently (or, optionally, least frequently) used payloads first. It is
+disabled (a budget of 0 bytes) until configured.
+
+Arrays loaded through the cache are stored as they are, marked read-only, and both the loading call and every hit
+return that same array, so neither costs a copy. Callers that modify the arrays they get copy them first.
+
+Example:
+    >>> from bridge.primitives.element.data.data_cache import DATA_CACHE
+    >>> DATA_CACHE.configure(max_bytes=2 * 2**30, policy="lfu")
+    >>> DATA_CACHE.set_category_enabled("text", False)
+    >>> DATA_CACHE.stats  # CacheStats(hits=..., misses=..., evictions=..., n_items=..., n_bytes=...)
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from bridge.primitives.element.data.uri_components import URIComponents
+
+POLICIES = ("lru", "lfu")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    n_items: int
+    n_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class DecodedDataCache:
+    """
+    A thread-safe mapping of `(category, url)` to decoded data, bounded by `max_bytes` and evicting by `policy`, the
+    least recently ("lru") or least frequently ("lfu") used payloads first. Payloads larger than the whole budget are
+    never cached.
+    """
+
+    def __init__(self, max_bytes: int = 0, policy: str = "lru"):
+        assert policy in POLICIES, f"policy must be one of {POLICIES}."
+        self._max_bytes = max_bytes
+        self._policy = policy
+        self._entries: OrderedDict[Tuple[str, str], Tuple[Any, int]] = OrderedDict()
+        self._counts: Dict[Tuple[str, str], int] = {}  # lookups of each entry, for the "lfu" policy
+        # entries by lookup count, each bucket in recency order, and the smallest count with a bucket
+        self._buckets: Dict[int, OrderedDict[Tuple[str, str], None]] = {}
+        self._min_count = 0
+        self._n_bytes = 0
+        self._disabled_categories: Set[str] = set()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._n_bytes)
+
+    def configure(self, max_bytes: int, policy: str | None = None):
+        """
+        Set the byte budget, evicting payloads if the cache is over it. 0 disables the cache. `policy` sets which
+        payloads are evicted first: the least recently used ("lru"), or the least frequently used ("lfu", ties broken
+        by recency).
+        """
+        assert max_bytes >= 0, "max_bytes must be non-negative."
+        assert policy is None or policy in POLICIES, f"policy must be one of {POLICIES}."
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._policy = policy or self._policy
+            self._evict()
+
+    def set_category_enabled(self, category: str, enabled: bool):
+        """
+        Opt a category out of (or back into) the cache. Its cached payloads are dropped when it is disabled.
+        """
+        with self._lock:
+            if enabled:
+                self._disabled_categories.discard(category)
+                return
+            self._disabled_categories.add(category)
+            for key in [key for key in self._entries if key[0] == category]:
+                self._drop(key)
+
+    def is_cached(self, url_or_data: Any, category: str) -> bool:
+        key = self._key(url_or_data, category)
+        with self._lock:
+            return key is not None and key in self._entries
+
+    def load(self, url_or_data: Any, category: str, loader: Callable[[Any, str], Any]) -> Any:
+        """
+        `loader(url_or_data, category)`, through the cache.
+        """
+        key = self._key(url_or_data, category)
+        if key is None:
+            return loader(url_or_data, category)
+        found, data = self._lookup(key)
+        if found:
+            return data
+        return self._store(key, loader(url_or_data, category))
+
+    async def load_async(self, url_or_data: Any, category: str, loader: Callable[[Any, str], Awaitable[Any]]) -> Any:
+        """
+        `await loader(url_or_data, category)`, through the cache.
+        """
+        key = self._key(url_or_data, category)
+        if key is None:
+            return await loader(url_or_data, category)
+        found, data = self._lookup(key)
+        if found:
+            return data
+        return self._store(key, await loader(url_or_data, category))
+
+    def load_many(
+        self, urls_or_data: Sequence[Any], category: str, loader: Callable[[Sequence[Any], str], List[Any]]
+    ) -> List[Any]:
+        """
+        `loader(urls_or_data, category)`, through the cache: the sources that aren't cached are loaded with a single
+        `loader` call.
+        """
+        data: List[Any] = [None] * len(urls_or_data)
+        missing = []
+        keys = [self._key(url_or_data, category) for url_or_data in urls_or_data]
+        for i, key in enumerate(keys):
+            found, datum = (False, None) if key is None else self._lookup(key)
+            if found:
+                data[i] = datum
+            else:
+                missing.append(i)
+        if len(missing) > 0:
+            loaded = loader([urls_or_data[i] for i in missing], category)
+            for i, datum in zip(missing, loaded):
+                data[i] = datum if keys[i] is None else self._store(keys[i], datum)
+        return data
+
+    def put(self, url_or_data: Any, category: str, data: Any):
+        """
+        Cache `data` for a source. NumPy arrays are cached as read-only copies, so `data` itself is left untouched,
+        and memory-mapped arrays aren't cached, the OS already caches their pages.
+        """
+        key = self._key(url_or_data, category)
+        if key is None or isinstance(data, np.memmap):
+            return
+        if isinstance(data, np.ndarray):
+            data = data.copy()
+        self._store(key, data)
+
+    def _store(self, key: Tuple[str, str], data: Any) -> Any:
+        """
+        Cache `data`, which the cache now owns: arrays are marked read-only in place. Returns `data`.
+        """
+        if isinstance(data, np.memmap):
+            return data
+        n_bytes = _sizeof(data)
+        if n_bytes > self._max_bytes:
+            return data
+        if isinstance(data, np.ndarray):
+            data.flags.writeable = False
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (data, n_bytes)
+            self._counts[key] = 1
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_count = 1
+            self._n_bytes += n_bytes
+            self._evict()
+        return data
+
+    def _lookup(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            count = self._counts[key]
+            self._remove_from_bucket(key, count)
+            if count == self._min_count and count not in self._buckets:
+                self._min_count = count + 1
+            self._counts[key] = count + 1
+            self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+            self._hits += 1
+        # arrays are cached read-only, so the entry is handed out as it is
+        return True, entry[0]
+
+    def invalidate(self, url_or_data: Any, category: str):
+        """
+        Drop the payload cached for a source, e.g. after new data was stored at its url.
+        """
+        key = self._key(url_or_data, category)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+            self._buckets.clear()
+            self._min_count = 0
+            self._n_bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def _key(self, url_or_data: Any, category: str) -> Tuple[str, str] | None:
+        if self._max_bytes == 0 or not isinstance(url_or_data, URIComponents):
+            return None
+        if category in self._disabled_categories:
+            return None
+        return category, str(url_or_data)
+
+    def _drop(self, key: Hashable):
+        _, n_bytes = self._entries.pop(key)
+        self._remove_from_bucket(key, self._counts.pop(key))
+        self._n_bytes -= n_bytes
+
+    def _remove_from_bucket(self, key: Tuple[str, str], count: int):
+        bucket = self._buckets[count]
+        del bucket[key]
+        if len(bucket) == 0:
+            del self._buckets[count]
+
+    def _evict(self):
+        while self._n_bytes > self._max_bytes:
+            if self._policy == "lfu":
+                if self._min_count not in self._buckets:
+                    # only after `invalidate` or `set_category_enabled` dropped the last entry of the smallest count
+                    self._min_count = min(self._buckets)
+                # buckets are in recency order, so the first key is the least recent of the least used
+                self._drop(next(iter(self._buckets[self._min_count])))
+            else:
+                self._drop(next(iter(self._entries)))
+            self._evictions += 1
+
+
+def _sizeof(data: Any) -> int:
+    # imported here: the dataset package imports this module through `LoadMechanism`
+    from bridge.primitives.dataset.memory import PayloadSizer
+
+    return PayloadSizer().sizeof(data)
+
+
+DATA_CACHE = DecodedDataCache()
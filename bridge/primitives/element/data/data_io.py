@@ -1,16 +1,28 @@
 import abc
+import functools
+import io
+import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, List, Sequence, Tuple
+from urllib.parse import parse_qs
 
 import numpy as np
 
+from bridge.primitives.element.data import concurrent_loading
 from bridge.primitives.element.data.category_registry import register
+from bridge.primitives.element.data.data_cache import DATA_CACHE
+from bridge.primitives.element.data.http_fetch import fetch
 from bridge.primitives.element.data.load_mechanism import LoadMechanism
 from bridge.primitives.element.data.uri_components import URIComponents
 from bridge.primitives.element.element_data_type import ELEMENT_DATA_TYPE
 
 
 class DataIO(abc.ABC):
+    # whether loading from a URI waits on I/O (disk, network) rather than the CPU, see `concurrent_loading`
+    io_bound = False
+
     @property
     @abc.abstractmethod
     def category(self):
@@ -31,11 +43,64 @@ class DataIO(abc.ABC):
     def store(cls, data: Any, url: URIComponents | None) -> LoadMechanism:
         pass
 
+    @classmethod
+    def load_many(cls, urls_or_data: Sequence[URIComponents | ELEMENT_DATA_TYPE]) -> List[ELEMENT_DATA_TYPE]:
+        """
+        `load` of each source, in order. Categories override it to load batches faster than one by one, e.g. with
+        `_load_files_batched`.
+        """
+        return [cls.load(url_or_data) for url_or_data in urls_or_data]
+
+    @classmethod
+    async def load_async(cls, url_or_data: URIComponents | ELEMENT_DATA_TYPE) -> ELEMENT_DATA_TYPE:
+        """
+        Awaitable `load`. By default, `load` runs on the shared loading pool (see `concurrent_loading`), which bounds
+        the loads in flight by the pool size; categories that can read their sources without blocking override it.
+        """
+        return await concurrent_loading.run_in_thread(cls.load, url_or_data)
+
+    @classmethod
+    async def store_async(cls, data: Any, url: URIComponents | None) -> LoadMechanism:
+        """
+        Awaitable `store`, running `store` on the shared loading pool unless overridden.
+        """
+        return await concurrent_loading.run_in_thread(cls.store, data, url)
+
+
+def _load_files_batched(
+    data_io: type[DataIO],
+    urls_or_data: Sequence[URIComponents | ELEMENT_DATA_TYPE],
+    load_file: Callable[[Path], ELEMENT_DATA_TYPE],
+) -> List[ELEMENT_DATA_TYPE]:
+    """
+    `load_many` for categories stored as files: local files are loaded with `load_file`, in path order for locality,
+    on the shared loading pool. Other sources go through `data_io.load`.
+    """
+    local = [
+        i
+        for i, url_or_data in enumerate(urls_or_data)
+        if isinstance(url_or_data, URIComponents) and url_or_data.scheme in ["", "file"]
+    ]
+    local.sort(key=lambda i: urls_or_data[i].path)
+
+    def load_local(i: int) -> ELEMENT_DATA_TYPE:
+        return load_file(Path(urls_or_data[i].path).expanduser())
+
+    data = [None] * len(urls_or_data)
+    for i, datum in zip(local, concurrent_loading.map_in_threads(load_local, local)):
+        data[i] = datum
+    local_set = set(local)
+    for i, url_or_data in enumerate(urls_or_data):
+        if i not in local_set:
+            data[i] = data_io.load(url_or_data)
+    return data
+
 
 @register
 class JPEGDataIO(DataIO):
     category = "image"
     extension = ".jpg"
+    io_bound = True
 
     @classmethod
     def load(cls, url_or_data: URIComponents | ELEMENT_DATA_TYPE) -> ELEMENT_DATA_TYPE:
@@ -44,9 +109,19 @@ class JPEGDataIO(DataIO):
 
         if url_or_data.scheme not in ["http", "https", "file", ""]:
             raise NotImplementedError("Only loading from local or http(s) URLs is supported for now.")
-        from skimage.io import imread
+        return _read_image(str(url_or_data))
 
-        return imread(str(url_or_data))
+    @classmethod
+    def load_many(cls, urls_or_data: Sequence[URIComponents | ELEMENT_DATA_TYPE]) -> List[ELEMENT_DATA_TYPE]:
+        return _load_files_batched(cls, urls_or_data, lambda path: _read_image(str(path)))
+
+    @classmethod
+    async def load_async(cls, url_or_data: URIComponents | ELEMENT_DATA_TYPE) -> ELEMENT_DATA_TYPE:
+        # http(s) images are fetched on the event loop, so that fetches aren't bounded by the pool, and decoded on it
+        if not isinstance(url_or_data, URIComponents) or url_or_data.scheme not in ["http", "https"]:
+            return await super().load_async(url_or_data)
+        content = await fetch(url_or_data)
+        return await concurrent_loading.run_in_thread(_read_image_content, content, Path(url_or_data.path).suffix)
 
     @classmethod
     def store(cls, data: Any, url: URIComponents | None) -> LoadMechanism:
@@ -66,10 +141,26 @@ class JPEGDataIO(DataIO):
         return LoadMechanism.from_url_string(str(url), cls.category)
 
 
+def _read_image(path: str) -> np.ndarray:
+    # the category's only decoder, so that `load`, `load_many` and `load_async` return the same arrays
+    from skimage.io import imread
+
+    return imread(path)
+
+
+def _read_image_content(content: bytes, suffix: str) -> np.ndarray:
+    # decoded from a temporary file, like `imread` does with the images it downloads itself
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / f"image{suffix}"
+        path.write_bytes(content)
+        return _read_image(str(path))
+
+
 @register
 class TorchDataIO(DataIO):
     category = "torch"
     extension = ".pt"
+    io_bound = True
 
     @classmethod
     def load(cls, url_or_data: URIComponents | ELEMENT_DATA_TYPE) -> ELEMENT_DATA_TYPE:
@@ -99,22 +190,138 @@ class TorchDataIO(DataIO):
 class NumpyDataIO(DataIO):
     category = "numpy"
     extension = ".npy"
+    io_bound = True
+    # `np.load`'s mmap_mode: by default arrays are memory-mapped read-only, so they are paged in when read and their
+    # pages are shared by processes forked after loading (e.g. dataloader workers). None reads them into memory.
+    mmap_mode = "r"
 
     @classmethod
     def load(cls, url_or_data: URIComponents | ELEMENT_DATA_TYPE) -> ELEMENT_DATA_TYPE:
         if not isinstance(url_or_data, URIComponents):
             return url_or_data
-        return np.load(str(url_or_data))
+        return np.load(str(url_or_data), mmap_mode=cls.mmap_mode)
+
+    @classmethod
+    def load_many(cls, urls_or_data: Sequence[URIComponents | ELEMENT_DATA_TYPE]) -> List[ELEMENT_DATA_TYPE]:
+        if cls.mmap_mode is not None:  # mapping reads nothing, there is nothing to batch
+            return super().load_many(urls_or_data)
+        return _load_files_batched(cls, urls_or_data, lambda path: np.load(io.BytesIO(path.read_bytes())))
 
     @classmethod
     def store(cls, data: Any, url: URIComponents | None) -> LoadMechanism:
-        raise NotImplementedError()
+        if url is None:
+            return LoadMechanism(data, cls.category)
+
+        if url.scheme not in ["", "file"]:
+            raise NotImplementedError("Only saving locally is supported for now.")
+
+        def write(path: Path):
+            with open(path, "wb") as f:  # `np.save` would add an extension to paths without one
+                np.save(f, np.asarray(data))
+
+        _replace_file(Path(url.path).expanduser(), write)
+        return LoadMechanism.from_url_string(str(url), cls.category)
+
+
+@register
+class NumpyStackDataIO(DataIO):
+    """
+    Same-shape arrays stored as the rows of one contiguous `.npy` file, written with `store_many`. The url of each
+    array points to its row with a `row` query, e.g. `/data/features.npy?row=12`, and loads a read-only memory-mapped
+    view of the row. Files are mapped once, and their mappings shared by all of their rows.
+    """
+
+    category = "numpy_stack"
+    extension = ".npy"
+    io_bound = True
+
+    @classmethod
+    def load(cls, url_or_data: URIComponents | ELEMENT_DATA_TYPE) -> ELEMENT_DATA_TYPE:
+        if not isinstance(url_or_data, URIComponents):
+            return url_or_data
+        path, row = _split_row(url_or_data)
+        assert row is not None, f"{url_or_data} doesn't point to a row."
+        return _open_stack(path)[row]
+
+    @classmethod
+    def store(cls, data: Any, url: URIComponents | None) -> LoadMechanism:
+        """
+        Writes `data` into the row of an existing stack if `url` points to one, and as a stack of one row otherwise.
+        """
+        if url is None:
+            return LoadMechanism(data, cls.category)
+
+        if url.scheme not in ["", "file"]:
+            raise NotImplementedError("Only saving locally is supported for now.")
+        path, row = _split_row(url)
+        if row is None:
+            return cls.store_many([data], url)[0]
+
+        stack = np.lib.format.open_memmap(path, mode="r+")
+        assert 0 <= row < len(stack), f"Row {row} is out of range for a stack of {len(stack)} arrays."
+        assert stack.shape[1:] == np.shape(data), f"Expected an array of shape {stack.shape[1:]}, got {np.shape(data)}."
+        stack[row] = data
+        stack.flush()
+        return LoadMechanism(url, cls.category)
+
+    @classmethod
+    def store_many(cls, data: Sequence[Any], url: URIComponents) -> List[LoadMechanism]:
+        """
+        Stack `data` into one `.npy` file at `url`, and return the load mechanisms of its rows, in order.
+        """
+        if url.scheme not in ["", "file"]:
+            raise NotImplementedError("Only saving locally is supported for now.")
+        assert len(data) > 0, "Cannot store an empty stack."
+        first = np.asarray(data[0])
+        assert first.dtype != object, "Arrays of objects can't be stacked."
+
+        def write(path: Path):
+            stack = np.lib.format.open_memmap(path, mode="w+", dtype=first.dtype, shape=(len(data), *first.shape))
+            for row, array in enumerate(data):
+                assert np.shape(array) == first.shape, f"Expected arrays of shape {first.shape}, got {np.shape(array)}."
+                stack[row] = array
+            stack.flush()
+
+        path = Path(url.path).expanduser()
+        _replace_file(path, write)
+        row_urls = [URIComponents(url.scheme, url.netloc, url.path, query=f"row={row}") for row in range(len(data))]
+        for row_url in row_urls:
+            DATA_CACHE.invalidate(row_url, cls.category)
+        return [LoadMechanism(row_url, cls.category) for row_url in row_urls]
+
+
+def _replace_file(path: Path, write: Callable[[Path], None]):
+    # written next to `path` and moved over it, so that arrays still mapped from the old file stay valid
+    Path.mkdir(path.parent, parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _split_row(url: URIComponents) -> Tuple[str, int | None]:
+    rows = parse_qs(url.query).get("row")
+    return str(Path(url.path).expanduser()), None if rows is None else int(rows[0])
+
+
+def _open_stack(path: str) -> np.ndarray:
+    stat = os.stat(path)
+    return _map_stack(path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _map_stack(path: str, mtime_ns: int, size: int) -> np.ndarray:
+    # keyed by modification time and size too, so that rewritten stacks are mapped again
+    return np.load(path, mmap_mode="r")
 
 
 @register
 class TextDataIO(DataIO):
     category = "text"
     extension = ".txt"
+    io_bound = True
 
     @classmethod
     def load(cls, url_or_data: URIComponents | ELEMENT_DATA_TYPE) -> ELEMENT_DATA_TYPE:
@@ -122,6 +329,13 @@ class TextDataIO(DataIO):
             return url_or_data
         return open(str(url_or_data), "r").read()
 
+    @classmethod
+    def load_many(cls, urls_or_data: Sequence[URIComponents | ELEMENT_DATA_TYPE]) -> List[ELEMENT_DATA_TYPE]:
+        # read whole, then decoded like `open(path, "r").read()`, with the locale's encoding and universal newlines
+        return _load_files_batched(
+            cls, urls_or_data, lambda path: io.TextIOWrapper(io.BytesIO(path.read_bytes())).read()
+        )
+
     @classmethod
     def store(cls, data: Any, url: URIComponents | None) -> LoadMechanism:
         raise NotImplementedError()
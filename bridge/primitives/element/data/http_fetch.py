@@ -0,0 +1,114 @@
+"""
+Non-blocking http(s) GET requests, for `DataIO.load_async` implementations.
+
+Requests are made over asyncio streams, one connection per request, so thousands of them can be awaited together from
+a single thread. Only what loading payloads needs is supported: plain GET requests, redirects, and bodies sent with a
+`Content-Length`, chunked, or until the connection is closed.
+
+Proxies configured the standard way (`HTTP_PROXY`, `HTTPS_PROXY` and `NO_PROXY`, see `urllib.request.getproxies`)
+aren't spoken to over the streams: requests that go through a proxy are made with `urllib` on the shared thread pool,
+which honours the same settings as the synchronous loaders.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import urllib.error
+import urllib.request
+from typing import Dict, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from bridge.primitives.element.data.uri_components import URIComponents
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 5
+
+
+async def fetch(url: URIComponents, timeout: float | None = 60.0) -> bytes:
+    """
+    Body of the response to a GET request to `url`, following redirects. Raises an `OSError` if the final response
+    isn't a 200, and an `asyncio.TimeoutError` if a request takes more than `timeout` seconds.
+    """
+    if _uses_proxy(url):
+        # imported here: `concurrent_loading` imports the DataIO classes, which import this module
+        from bridge.primitives.element.data.concurrent_loading import run_in_thread
+
+        return await asyncio.wait_for(run_in_thread(_fetch_with_urllib, url, timeout), timeout)
+    for _ in range(_MAX_REDIRECTS + 1):
+        status, headers, body = await asyncio.wait_for(_get(url), timeout)
+        if status in _REDIRECT_STATUSES and "location" in headers:
+            url = URIComponents.from_str(urljoin(str(url), headers["location"]))
+            continue
+        if status != 200:
+            raise OSError(f"GET {url} failed with status {status}.")
+        return body
+    raise OSError(f"GET {url} was redirected more than {_MAX_REDIRECTS} times.")
+
+
+def _uses_proxy(url: URIComponents) -> bool:
+    if url.scheme not in ["http", "https"] or url.scheme not in urllib.request.getproxies():
+        return False
+    return not urllib.request.proxy_bypass(urlsplit(str(url)).hostname or "")
+
+
+def _fetch_with_urllib(url: URIComponents, timeout: float | None) -> bytes:
+    request = urllib.request.Request(str(url), headers={"User-Agent": "bridge-ds"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            if response.status != 200:
+                raise OSError(f"GET {url} failed with status {response.status}.")
+            return response.read()
+    except urllib.error.HTTPError as e:
+        raise OSError(f"GET {url} failed with status {e.code}.") from e
+
+
+async def _get(url: URIComponents) -> Tuple[int, Dict[str, str], bytes]:
+    if url.scheme not in ["http", "https"]:
+        raise NotImplementedError("Only http(s) URLs can be fetched.")
+    split = urlsplit(str(url))
+    port = split.port or (443 if url.scheme == "https" else 80)
+    reader, writer = await asyncio.open_connection(split.hostname, port, ssl=url.scheme == "https" or None)
+    try:
+        target = (url.path or "/") + (f";{url.params}" if url.params else "") + (f"?{url.query}" if url.query else "")
+        host = url.netloc.rpartition("@")[2]
+        request = (
+            f"GET {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: bridge-ds\r\n"
+            "Accept-Encoding: identity\r\nConnection: close\r\n\r\n"
+        )
+        writer.write(request.encode("latin-1"))
+        await writer.drain()
+
+        status_line = (await reader.readline()).decode("latin-1")
+        parts = status_line.split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise OSError(f"GET {url} got a malformed status line: {status_line!r}.")
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await _read_chunked(reader)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+        return int(parts[1]), headers, body
+    finally:
+        writer.close()
+        with contextlib.suppress(OSError):  # e.g. tls connections closed abruptly by the server
+            await writer.wait_closed()
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b";", 1)[0], 16)
+        if size == 0:
+            break
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()  # the chunk's trailing CRLF
+    while await reader.readline() not in (b"\r\n", b"\n", b""):  # trailers
+        pass
+    return b"".join(chunks)
@@ -5,7 +5,9 @@ from typing import TYPE_CHECKING, Any, Dict
 from typing_extensions import Self
 
 from bridge.primitives.element.data import category_registry
+from bridge.primitives.element.data.data_cache import DATA_CACHE
 from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.fingerprint import fingerprint_load_source
 from bridge.utils import Dictable
 from bridge.utils.constants import ELEMENT_COLS
 
@@ -30,7 +32,13 @@ class LoadMechanism(Dictable):
         return self._category
 
     def load_data(self) -> Any:
-        return category_registry.load(self._url_or_data, self._category)
+        return DATA_CACHE.load(self._url_or_data, self._category, category_registry.load)
+
+    async def load_data_async(self) -> Any:
+        return await DATA_CACHE.load_async(self._url_or_data, self._category, category_registry.load_async)
+
+    def fingerprint(self) -> str:
+        return fingerprint_load_source(self._url_or_data, self._category)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -46,6 +54,16 @@ class LoadMechanism(Dictable):
             category=dic[ELEMENT_COLS.LOAD_MECHANISM.CATEGORY],
         )
 
+    @classmethod
+    def from_validated(cls, url_or_data: URIComponents | ELEMENT_DATA_TYPE, category: str) -> Self:
+        """
+        Skips the registration check, for categories the caller already checked (see `ElementRows`).
+        """
+        load_mechanism = cls.__new__(cls)
+        load_mechanism._url_or_data = url_or_data
+        load_mechanism._category = category
+        return load_mechanism
+
     @classmethod
     def from_url_string(cls, url_string: str, category: str) -> Self:
         components = URIComponents.from_str(url_string)
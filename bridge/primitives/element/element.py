@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Any, Dict, Hashable
 import pandas as pd
 
 from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.fingerprint import fingerprint_element
 from bridge.primitives.utils import validate_metadata
 from bridge.utils.constants import ELEMENT_COLS
 from bridge.utils.helper import Displayable
@@ -17,6 +18,15 @@ if TYPE_CHECKING:
 
 class Element(Displayable):
     keys = ELEMENT_COLS.list()
+    __slots__ = (
+        "_element_id",
+        "_etype",
+        "_sample_id",
+        "_load_mechanism",
+        "_display_engine",
+        "_cache_mechanism",
+        "_metadata",
+    )
 
     def __init__(
         self,
@@ -46,7 +56,10 @@ class Element(Displayable):
         return self._data_impl()
 
     def _data_impl(self):
-        data = self._load_mechanism.load_data()
+        return self._on_loaded(self._load_mechanism.load_data())
+
+    def _on_loaded(self, data: ELEMENT_DATA_TYPE) -> ELEMENT_DATA_TYPE:
+        # called in the loading thread's caller, since caching may write to the dataset's table
         if self._cache_mechanism:
             new_load_mechanism = self._cache_mechanism.store(self, data, should_update_elements=True)
             self._load_mechanism = new_load_mechanism
@@ -65,6 +78,9 @@ class Element(Displayable):
     def metadata(self) -> Dict[str, Any]:
         return self._metadata
 
+    def metadata_value(self, name: str, default: Any = None) -> Any:
+        return self.metadata.get(name, default)
+
     @property
     def sample_id(self) -> Hashable:
         return self._sample_id
@@ -72,6 +88,10 @@ class Element(Displayable):
     def __str__(self) -> str:
         return str(self.to_dict())
 
+    def fingerprint(self) -> str:
+        """Stable digest of the element's ids, load source and metadata. The payload itself is not loaded."""
+        return fingerprint_element(self.to_dict())
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             ELEMENT_COLS.ID: self.id,
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+from typing_extensions import Self
+
+from bridge.primitives.element.data import category_registry
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.element import Element
+from bridge.utils.constants import ELEMENT_COLS
+
+if TYPE_CHECKING:
+    from bridge.display import DisplayEngine
+    from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+
+
+class ElementRows:
+    """
+    A block of rows of an elements table, shared by the `ElementView`s built on it.
+
+    The schema is validated once per block: the id, type and load mechanism columns must be there, and every other
+    column is metadata, so no element can carry reserved metadata keys. Columns are converted to Python lists the
+    first time one of their values is read.
+    """
+
+    def __init__(self, elements: pd.DataFrame):
+        names = list(elements.index.names) + elements.columns.to_list()
+        missing = set(Element.keys) - set(names)
+        assert len(missing) == 0, f"Missing keys: {missing}"
+        self._elements = elements
+        self._columns: Dict[str, List[Any]] = {}
+        self._metadata_columns = None
+        self.metadata_names = [name for name in elements.columns if name not in Element.keys]
+        categories = set(self.column(ELEMENT_COLS.LOAD_MECHANISM.CATEGORY))
+        unregistered = [category for category in categories if not category_registry.is_registered(category)]
+        assert len(unregistered) == 0, f"Categories {unregistered} are not registered."
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def column(self, name: str) -> List[Any]:
+        if name not in self._columns:
+            if name in self._elements.columns:
+                self._columns[name] = self._elements[name].tolist()
+            else:
+                self._columns[name] = self._elements.index.get_level_values(name).tolist()
+        return self._columns[name]
+
+    def metadata_columns(self) -> List[Tuple[str, List[Any]]]:
+        if self._metadata_columns is None:
+            self._metadata_columns = [(name, self.column(name)) for name in self.metadata_names]
+        return self._metadata_columns
+
+    def views(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+        display_engine: DisplayEngine | None = None,
+        cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
+    ) -> List[ElementView]:
+        """
+        Views of the rows `start:stop`, with the cache mechanism of their element type. Element types and sample ids,
+        which samples are grouped and checked by, are set right away.
+        """
+        stop = len(self) if stop is None else stop
+        cache_mechanisms = cache_mechanisms or {}
+        etypes = self.column(ELEMENT_COLS.ETYPE)
+        sample_ids = self.column(ELEMENT_COLS.SAMPLE_ID)
+        views = []
+        for row in range(start, stop):
+            view = ElementView.from_row(self, row, display_engine, cache_mechanisms.get(str(etypes[row])))
+            view._etype = etypes[row]
+            view._sample_id = sample_ids[row]
+            views.append(view)
+        return views
+
+
+def _metadata(rows: ElementRows, row: int) -> Dict[str, Any]:
+    return {name: values[row] for name, values in rows.metadata_columns()}
+
+
+def _load_mechanism(rows: ElementRows, row: int) -> LoadMechanism:
+    return LoadMechanism.from_validated(
+        rows.column(ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA)[row],
+        rows.column(ELEMENT_COLS.LOAD_MECHANISM.CATEGORY)[row],
+    )
+
+
+_DECODERS: Dict[str, Callable[[ElementRows, int], Any]] = {
+    "_element_id": lambda rows, row: rows.column(ELEMENT_COLS.ID)[row],
+    "_sample_id": lambda rows, row: rows.column(ELEMENT_COLS.SAMPLE_ID)[row],
+    "_etype": lambda rows, row: rows.column(ELEMENT_COLS.ETYPE)[row],
+    "_load_mechanism": _load_mechanism,
+    "_metadata": _metadata,
+}
+
+
+class ElementView(Element):
+    """
+    An element that references a row of an `ElementRows` block instead of holding its fields. Each field is decoded
+    from the row the first time it is read, and kept. Otherwise it behaves like an `Element`, which it is.
+    """
+
+    __slots__ = ("_rows", "_row")
+
+    @classmethod
+    def from_row(
+        cls,
+        rows: ElementRows,
+        row: int,
+        display_engine: DisplayEngine | None = None,
+        cache_mechanism: CacheMechanism | None = None,
+    ) -> Self:
+        # `__init__` is Element's, so that `type(element)(...)` still builds a regular element
+        view = cls.__new__(cls)
+        view._rows = rows
+        view._row = row
+        view._display_engine = display_engine
+        view._cache_mechanism = cache_mechanism
+        return view
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for fields that aren't set yet
+        decode = _DECODERS.get(name)
+        if decode is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        value = decode(self._rows, self._row)
+        setattr(self, name, value)
+        return value
+
+    def metadata_value(self, name: str, default: Any = None) -> Any:
+        try:
+            metadata = object.__getattribute__(self, "_metadata")
+        except AttributeError:  # not decoded yet: read the single column
+            if name not in self._rows.metadata_names:
+                return default
+            return self._rows.column(name)[self._row]
+        return metadata.get(name, default)
+
+    def __reduce__(self):
+        # pickled as a plain element, without the block
+        return _element_from_fields, ({name: getattr(self, name) for name in Element.__slots__},)
+
+
+def _element_from_fields(fields: Dict[str, Any]) -> Element:
+    element = Element.__new__(Element)
+    for name, value in fields.items():
+        setattr(element, name, value)
+    return element
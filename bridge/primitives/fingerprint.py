@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import os
+import pickle
+from types import BuiltinFunctionType, CodeType, FunctionType, MethodType
+from typing import Any, Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.utils.constants import ELEMENT_COLS, INDICES
+
+DIGEST_SIZE = 16
+_MAX_DEPTH = 16
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    Stable hex digest of an object, identical across processes and sessions.
+
+    Scalars, containers, NumPy arrays, dataclasses and plain objects are hashed by value (objects through their type
+    and `vars()`), functions by qualified name, bytecode, captured values and defaults, and `functools.partial`s by
+    their function and arguments. Objects that define a `fingerprint()` method are hashed through it. Anything else,
+    including objects without attributes, falls back to its pickle, and raises a `TypeError` if it can't be pickled.
+    Object graphs nested deeper than `_MAX_DEPTH` levels raise a `TypeError` as well.
+    """
+    h = _hasher()
+    _update(h, obj, 0)
+    return h.hexdigest()
+
+
+def fingerprint_load_source(url_or_data: Any, category: str) -> str:
+    """
+    Fingerprint of where an element loads from. Local files are fingerprinted by path, size and modification time, so
+    rewriting a file changes the fingerprint. Other URIs by the URI alone, in-memory payloads by value.
+    """
+    h = _hasher()
+    _update(h, category, 0)
+    _update_load_source(h, url_or_data)
+    return h.hexdigest()
+
+
+def fingerprint_element(record: Dict[str, Any]) -> str:
+    """Fingerprint of an element record (`Element.to_dict()`), covering its ids, load source and metadata."""
+    h = _hasher()
+    _update_record(h, record)
+    return h.hexdigest()
+
+
+def fingerprint_records(records: Iterable[Dict[str, Any]]) -> str:
+    """Fingerprint of a sequence of element records, e.g. all elements of a sample, in order."""
+    h = _hasher()
+    for record in records:
+        _update_record(h, record)
+    return h.hexdigest()
+
+
+def fingerprint_elements(elements: pd.DataFrame) -> str:
+    """
+    Fingerprint of an elements table: its columns, then every row in order. Only the load sources are read, so
+    URI payloads are not loaded. Columns are hashed by name, not position, so the order they were added in doesn't
+    change the fingerprint.
+    """
+    df = elements.reset_index()
+    h = _hasher()
+    _update(h, {col: str(dtype) for col, dtype in df.dtypes.items()}, 0)  # dicts are hashed in sorted key order
+    for record in df.to_dict(orient="records"):
+        _update_record(h, record)
+    return h.hexdigest()
+
+
+def fingerprint_state(obj: Any) -> str:
+    """
+    Fingerprint of an object's type and attributes. This is what `fingerprint` falls back to for plain objects, and
+    what `fingerprint()` methods can build on without recursing into themselves.
+    """
+    h = _hasher()
+    h.update(f"{type(obj).__module__}.{type(obj).__qualname__}:".encode())
+    _update(h, _object_state(obj), 1)
+    return h.hexdigest()
+
+
+def local_path(uri: URIComponents) -> str | None:
+    """Filesystem path of a URI, or None if it is not a local file."""
+    if uri.scheme in ("", "file") and uri.netloc == "":
+        return uri.path
+    return None
+
+
+def _hasher():
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+def _update_record(h, record: Dict[str, Any]):
+    load_source_cols = [ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA, ELEMENT_COLS.LOAD_MECHANISM.CATEGORY]
+    for col in INDICES + [ELEMENT_COLS.ETYPE, ELEMENT_COLS.LOAD_MECHANISM.CATEGORY]:
+        _update(h, record.get(col), 0)
+    _update_load_source(h, record.get(ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA))
+    metadata = {k: v for k, v in record.items() if k not in INDICES + [ELEMENT_COLS.ETYPE] + load_source_cols}
+    _update(h, metadata, 0)
+
+
+def _update_load_source(h, url_or_data: Any):
+    if not isinstance(url_or_data, URIComponents):
+        _update(h, url_or_data, 0)
+        return
+    h.update(b"uri:" + str(url_or_data).encode())
+    path = local_path(url_or_data)
+    if path is not None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        h.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+
+def _update(h, obj: Any, depth: int):
+    if depth >= _MAX_DEPTH:
+        raise TypeError(
+            f"Can't fingerprint {type(obj).__qualname__} objects nested {_MAX_DEPTH} levels deep, define a "
+            "`fingerprint()` method on the object holding them."
+        )
+    tag = f"{type(obj).__module__}.{type(obj).__qualname__}:".encode()
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, np.generic)):
+        h.update(tag + repr(obj.item() if isinstance(obj, np.generic) else obj).encode())
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        h.update(tag + bytes(obj))
+    elif isinstance(obj, np.ndarray):
+        h.update(tag + f"{obj.dtype.str}{obj.shape}".encode())
+        if obj.dtype == object:
+            for item in obj.ravel():
+                _update(h, item, depth + 1)
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif hasattr(obj, "fingerprint") and callable(obj.fingerprint) and not isinstance(obj, type):
+        h.update(tag + obj.fingerprint().encode())
+    elif isinstance(obj, dict):
+        h.update(tag)
+        for key in sorted(obj, key=repr):
+            _update(h, key, depth + 1)
+            _update(h, obj[key], depth + 1)
+    elif isinstance(obj, (list, tuple)):
+        h.update(tag + str(len(obj)).encode())
+        for item in obj:
+            _update(h, item, depth + 1)
+    elif isinstance(obj, (set, frozenset)):
+        h.update(tag)
+        for digest in sorted(fingerprint(item) for item in obj):
+            h.update(digest.encode())
+    elif isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(tag + pd.util.hash_pandas_object(obj, index=not isinstance(obj, pd.Index)).to_numpy().tobytes())
+    elif isinstance(obj, type):
+        h.update(tag + f"{obj.__module__}.{obj.__qualname__}".encode())
+    elif isinstance(obj, (FunctionType, MethodType)):
+        func = obj.__func__ if isinstance(obj, MethodType) else obj
+        h.update(tag + f"{func.__module__}.{func.__qualname__}".encode())
+        _update_code(h, func.__code__, depth + 1)
+        # functions made by the same code differ by the values they captured and their defaults
+        _update(h, [_cell_contents(cell) for cell in func.__closure__ or ()], depth + 1)
+        _update(h, func.__defaults__, depth + 1)
+        _update(h, func.__kwdefaults__, depth + 1)
+        if isinstance(obj, MethodType):
+            _update(h, obj.__self__, depth + 1)
+    elif isinstance(obj, functools.partial):
+        h.update(tag)
+        _update(h, [obj.func, obj.args, obj.keywords, vars(obj)], depth + 1)
+    elif isinstance(obj, BuiltinFunctionType):
+        h.update(tag + f"{obj.__module__}.{obj.__qualname__}".encode())
+    elif dataclasses.is_dataclass(obj):
+        h.update(tag)
+        for field in dataclasses.fields(obj):
+            _update(h, field.name, depth + 1)
+            _update(h, getattr(obj, field.name), depth + 1)
+    elif (hasattr(obj, "__dict__") or hasattr(obj, "__slots__")) and len(state := _object_state(obj)) > 0:
+        h.update(tag)
+        _update(h, state, depth + 1)
+    else:
+        # no attributes to tell instances apart: their state, if any, is only known to their pickle
+        h.update(tag + _pickle(obj))
+
+
+def _update_code(h, code: CodeType, depth: int):
+    h.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):  # nested functions and comprehensions
+            _update_code(h, const, depth + 1)
+        else:
+            _update(h, const, depth + 1)
+
+
+def _cell_contents(cell) -> Any:
+    try:
+        return cell.cell_contents
+    except ValueError:  # not assigned yet
+        return None
+
+
+def _pickle(obj: Any) -> bytes:
+    try:
+        return pickle.dumps(obj)
+    except Exception as e:
+        raise TypeError(
+            f"Can't fingerprint {type(obj).__qualname__} objects: they have no attributes to hash and can't be pickled."
+        ) from e
+
+
+def _object_state(obj: Any) -> Dict[str, Any]:
+    state = dict(vars(obj)) if hasattr(obj, "__dict__") else {}
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(obj, name):
+                state[name] = getattr(obj, name)
+    return state
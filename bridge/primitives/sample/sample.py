@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, Dict, Hashable, List
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Sequence
 
 import pandas as pd
+from typing_extensions import Self
 
+from bridge.primitives.element.data import concurrent_loading
 from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
 from bridge.primitives.element.element import Element
+from bridge.primitives.element.element_view import ElementRows
+from bridge.primitives.fingerprint import fingerprint_records
 from bridge.utils.constants import ELEMENT_COLS, INDICES
 from bridge.utils.helper import Displayable
 
@@ -45,10 +52,55 @@ class Sample(Displayable):
 
     @property
     def data(self) -> Dict[str, List[ELEMENT_DATA_TYPE]]:
-        data_dict = defaultdict(list)
+        if concurrent_loading.concurrent_data_enabled():
+            return self.load_all()
+        return self.load_batch([self])[0]
+
+    @staticmethod
+    def load_batch(samples: Sequence[Sample]) -> List[Dict[str, List[ELEMENT_DATA_TYPE]]]:
+        """
+        `data` of each sample, with the payloads of each category loaded by a single `DataIO.load_many` call across
+        the samples, see `concurrent_loading.load_elements_batched`.
+        """
+        flat = [e for sample in samples for elist in sample._elements.values() for e in elist]
+        data = iter(concurrent_loading.load_elements_batched(flat))
+        return [{etype: [next(data) for _ in elist] for etype, elist in sample._elements.items()} for sample in samples]
+
+    def load_all(self, executor: Executor | None = None) -> Dict[str, List[ELEMENT_DATA_TYPE]]:
+        """
+        Same as `data`, with the loads of I/O-bound categories running concurrently on `executor` (a process-wide
+        thread pool by default). See `bridge.primitives.element.data.concurrent_loading` for per-category limits.
+        """
+        return self._load_grouped(self._elements, executor)
+
+    @staticmethod
+    def _load_grouped(
+        elements: Dict[str, List[Element]], executor: Executor | None
+    ) -> Dict[str, List[ELEMENT_DATA_TYPE]]:
+        flat = [e for elist in elements.values() for e in elist]
+        data = iter(concurrent_loading.load_elements(flat, executor))
+        return {etype: [next(data) for _ in elist] for etype, elist in elements.items()}
+
+    async def prefetch(self, semaphore: asyncio.Semaphore | None = None) -> Self:
+        """
+        Load the data of every element, awaiting the loads together (see `concurrent_loading.load_elements_async`),
+        and keep it in memory: each element's load mechanism is replaced by an in-memory one, so reading `data`
+        afterwards doesn't load it again. Returns the sample.
+        """
+        elements = [e for elist in self._elements.values() for e in elist]
+        data = iter(await concurrent_loading.load_elements_async(elements, semaphore))
+        self._keep_data({etype: [next(data) for _ in elist] for etype, elist in self._elements.items()})
+        return self
+
+    def _keep_data(self, data: Dict[str, List[ELEMENT_DATA_TYPE]]):
+        # replace the elements' load mechanisms by in-memory ones, holding data that was already loaded
         for etype, elist in self._elements.items():
-            data_dict[etype].extend([e.data for e in elist])
-        return dict(data_dict)
+            for element, datum in zip(elist, data[etype]):
+                element._load_mechanism = LoadMechanism.from_validated(datum, element.category)
+
+    def fingerprint(self) -> str:
+        """Stable digest of the sample's elements, see `Element.fingerprint`."""
+        return fingerprint_records(e.to_dict() for e_list in self._elements.values() for e in e_list)
 
     def show(self, **kwargs: Any):
         return self._display_engine.show_sample(self, **kwargs)
@@ -72,29 +124,21 @@ class Sample(Displayable):
         display_engine: DisplayEngine | None,
         cache_mechanisms: Dict[str, CacheMechanism | None],
     ):
-        def fast_to_dict_records(df):
-            data = df.values.tolist()
-            columns = df.columns.tolist()
-            index = df.index.names
-            index_data = df.index.values.tolist()
-            idx_records = [dict(zip(index, data)) for data in index_data]
-            records = [dict(zip(columns, datum)) for datum in data]
-            [rec.update(idx_rec) for rec, idx_rec in zip(records, idx_records)]
-            return records
-
-        elements = []
-        for element_row in fast_to_dict_records(elements_df):
-            etype = element_row[ELEMENT_COLS.ETYPE]
-
-            element_type = str(etype)
-            elements.append(
-                Element.from_dict(
-                    element_row,
-                    display_engine=display_engine,
-                    cache_mechanism=cache_mechanisms.get(element_type),
-                )
-            )
-        return cls(elements=elements, display_engine=display_engine)
+        return cls.from_rows(ElementRows(elements_df), display_engine=display_engine, cache_mechanisms=cache_mechanisms)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: ElementRows,
+        display_engine: DisplayEngine | None,
+        cache_mechanisms: Dict[str, CacheMechanism | None],
+        start: int = 0,
+        stop: int | None = None,
+    ):
+        """
+        Sample of the rows `start:stop` of a block, as `ElementView`s that decode their fields when read.
+        """
+        return cls(elements=rows.views(start, stop, display_engine, cache_mechanisms), display_engine=display_engine)
 
     def to_pd_dataframe(self):
         records = []
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from concurrent.futures import Executor
 from typing import TYPE_CHECKING, Dict, List
 
 from typing_extensions import Self
@@ -27,9 +28,10 @@ class SingularSample(Sample):
         annotations = defaultdict(list)
         for etype, e_list in self.elements.items():
             for e in e_list:
-                if e.metadata.get(IS_SAMPLE_COL_NAME) is True and found_element:
+                is_sample = e.metadata_value(IS_SAMPLE_COL_NAME) is True
+                if is_sample and found_element:
                     raise RuntimeError()
-                if e.metadata.get(IS_SAMPLE_COL_NAME) is True:
+                if is_sample:
                     found_element = True
                     element = e
                 else:
@@ -52,6 +54,12 @@ class SingularSample(Sample):
     def annotations(self) -> Dict[str, List[Element]]:
         return self._annotations
 
+    def load_annotations(self, executor: Executor | None = None) -> Dict[str, List[ELEMENT_DATA_TYPE]]:
+        """
+        Data of the annotations, by element type, loaded concurrently like `Sample.load_all`.
+        """
+        return self._load_grouped(self._annotations, executor)
+
     def transform(
         self,
         transform: SampleTransform,
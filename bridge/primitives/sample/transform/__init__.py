@@ -1,3 +1,9 @@
+from bridge.primitives.sample.transform.batch_transform import (
+    BatchSampleTransform,
+    BoxArrays,
+    SampleBatch,
+    StackedArrays,
+)
 from bridge.primitives.sample.transform.sample_transform import SampleTransform
 
-__all__ = ["SampleTransform"]
+__all__ = ["SampleTransform", "BatchSampleTransform", "SampleBatch", "StackedArrays", "BoxArrays"]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List
+
+import numpy as np
+
+from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+from bridge.primitives.element.element import Element
+from bridge.primitives.fingerprint import fingerprint_state
+from bridge.utils.data_objects import BoundingBox
+
+if TYPE_CHECKING:
+    from bridge.display import DisplayEngine
+    from bridge.primitives.sample import Sample
+
+
+class BatchSampleTransform(ABC):
+    """
+    A transform applied to a list of samples at once, so that vectorized operations (resize, normalize, flip, bbox
+    scaling...) run once per batch rather than once per sample. `Dataset.transform_samples` dispatches batches of
+    `batch_size` samples to it automatically. `SampleBatch` gives a columnar view of a batch to work with.
+    """
+
+    batch_size: int = 64
+
+    @abstractmethod
+    def __call__(
+        self,
+        samples: List[Sample],
+        cache_mechanisms: Dict[str, CacheMechanism] | None,
+        display_engine: DisplayEngine | None,
+    ) -> List[Sample]:
+        pass
+
+    def fingerprint(self) -> str:
+        """See `SampleTransform.fingerprint`."""
+        return fingerprint_state(self)
+
+    @staticmethod
+    def apply(
+        samples: List[Sample],
+        transform: BatchSampleTransform,
+        cache_mechanisms: Dict[str, CacheMechanism] | None = None,
+        display_engine: DisplayEngine | None = None,
+    ) -> List[Sample]:
+        """
+        The batch counterpart of `Sample.transform`: fills in default cache mechanisms for every etype in the batch.
+        """
+        etypes = {etype for sample in samples for etype in sample.elements.keys()}
+        cache_mechanisms = {etype: CacheMechanism() for etype in etypes} | (cache_mechanisms or {})
+        if display_engine is None and len(samples) > 0:
+            display_engine = samples[0]._display_engine
+        return transform(samples, cache_mechanisms, display_engine)
+
+
+@dataclass
+class StackedArrays:
+    """Same-shape ndarray payloads of a batch, stacked along a new first axis."""
+
+    elements: List[Element]
+    data: np.ndarray
+
+
+@dataclass
+class BoxArrays:
+    """
+    Bounding boxes of a batch, concatenated. The boxes of sample `i` are rows `offsets[i]:offsets[i + 1]`.
+    """
+
+    elements: List[Element]
+    coords: np.ndarray
+    class_labels: List[Any]
+    offsets: np.ndarray
+
+
+class SampleBatch:
+    """
+    Columnar view of a list of samples for `BatchSampleTransform`s.
+
+    Payloads are gathered into arrays with `stack` and `boxes`, transformed with whole-batch NumPy operations, and
+    written back with `update_stacked` / `update_boxes`, which store the new payloads through the cache mechanisms.
+    `to_samples` then rebuilds the samples with the updated elements, in their original order.
+
+    Example:
+        >>> batch = SampleBatch(samples, cache_mechanisms, display_engine)
+        >>> for group in batch.stack("image"):
+        ...     batch.update_stacked(group, group.data[:, :, ::-1])
+        >>> boxes = batch.boxes("bbox")
+        >>> batch.update_boxes(boxes, boxes.coords * 0.5)
+        >>> samples = batch.to_samples()
+    """
+
+    def __init__(
+        self,
+        samples: List[Sample],
+        cache_mechanisms: Dict[str, CacheMechanism],
+        display_engine: DisplayEngine | None = None,
+    ):
+        self._samples = samples
+        self._cache_mechanisms = cache_mechanisms
+        self._display_engine = display_engine
+        self._updated: Dict[Hashable, Element] = {}
+
+    @property
+    def samples(self) -> List[Sample]:
+        return self._samples
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def stack(self, etype: str = "image") -> List[StackedArrays]:
+        """
+        Group the payloads of all `etype` elements by shape and dtype, and stack every group into a single ndarray.
+        """
+        groups = defaultdict(lambda: ([], []))
+        for sample in self._samples:
+            for element in sample.elements.get(etype, []):
+                data = np.asarray(element.data)
+                elements, arrays = groups[(data.shape, data.dtype)]
+                elements.append(element)
+                arrays.append(data)
+        return [StackedArrays(elements, np.stack(arrays)) for elements, arrays in groups.values()]
+
+    def boxes(self, etype: str = "bbox") -> BoxArrays:
+        elements, coords, class_labels = [], [], []
+        counts = np.zeros(len(self._samples), dtype=np.int64)
+        for i, sample in enumerate(self._samples):
+            for element in sample.elements.get(etype, []):
+                box: BoundingBox = element.data
+                elements.append(element)
+                coords.append(box.coords)
+                class_labels.append(box.class_label)
+                counts[i] += 1
+        offsets = np.zeros(len(self._samples) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        coords = np.stack(coords) if len(coords) > 0 else np.empty((0, 4))
+        return BoxArrays(elements, coords, class_labels, offsets)
+
+    def update_stacked(self, stacked: StackedArrays, data: np.ndarray, as_category: str | None = None):
+        assert len(data) == len(stacked.elements), f"Got {len(data)} arrays for {len(stacked.elements)} elements."
+        for element, element_data in zip(stacked.elements, data):
+            self.update(element, element_data, as_category)
+
+    def update_boxes(self, boxes: BoxArrays, coords: np.ndarray, as_category: str = "obj"):
+        assert len(coords) == len(boxes.elements), f"Got {len(coords)} boxes for {len(boxes.elements)} elements."
+        for element, element_coords, class_label in zip(boxes.elements, coords, boxes.class_labels):
+            self.update(element, BoundingBox(element_coords, class_label=class_label), as_category)
+
+    def update(self, element: Element, data: Any, as_category: str | None = None):
+        provider = self._cache_mechanisms[element.etype].store(
+            element, data, as_category=as_category, should_update_elements=False
+        )
+        self._updated[element.id] = Element(
+            element_id=element.id,
+            etype=element.etype,
+            load_mechanism=provider,
+            sample_id=element.sample_id,
+            metadata=element.metadata,
+        )
+
+    def to_samples(self) -> List[Sample]:
+        new_samples = []
+        for sample in self._samples:
+            elements = {
+                etype: [self._updated.get(e.id, e) for e in e_list] for etype, e_list in sample.elements.items()
+            }
+            new_samples.append(type(sample)(elements=elements, display_engine=self._display_engine))
+        return new_samples
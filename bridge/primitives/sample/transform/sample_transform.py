@@ -3,6 +3,8 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Dict
 
+from bridge.primitives.fingerprint import fingerprint_state
+
 if TYPE_CHECKING:
     from bridge.display import DisplayEngine
     from bridge.primitives.element.data.cache_mechanism import CacheMechanism
@@ -18,3 +20,10 @@ class SampleTransform(ABC):
         display_engine: DisplayEngine | None,
     ) -> Sample:
         pass
+
+    def fingerprint(self) -> str:
+        """
+        Stable digest of the transform's class and parameters (including any seed attribute), used to key cached
+        results. Override it if the transform holds state that does not define its output.
+        """
+        return fingerprint_state(self)
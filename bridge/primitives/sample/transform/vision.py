@@ -8,6 +8,7 @@ import numpy as np
 from PIL.Image import Image
 
 from bridge.primitives.element.element import Element
+from bridge.primitives.fingerprint import fingerprint
 from bridge.primitives.sample import Sample
 from bridge.primitives.sample.transform.sample_transform import SampleTransform
 from bridge.utils import optional_dependencies
@@ -29,6 +30,16 @@ class AlbumentationsCompose(SampleTransform):
         self._kp_format = kp_format
         self._transforms = albm_transforms
 
+    def fingerprint(self) -> str:
+        """
+        Digest of the serialized albumentations pipeline (`A.to_dict`) and the bbox and keypoint formats.
+        """
+        try:
+            pipeline = A.to_dict(A.Compose(self._transforms))
+        except (ValueError, NotImplementedError) as e:  # e.g. `A.Lambda`, which has no serialized form
+            raise TypeError(f"Can't fingerprint the albumentations pipeline: {e}") from e
+        return fingerprint([type(self), pipeline, self._bbox_format, self._kp_format])
+
     def __call__(
         self,
         sample: Sample,
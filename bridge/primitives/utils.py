@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Hashable, List
+
+import pandas as pd
 
 
 def validate_metadata(keys: List[str], metadata: Dict[str, Any] | None):
@@ -8,3 +10,34 @@ def validate_metadata(keys: List[str], metadata: Dict[str, Any] | None):
         return
     dup_keys = set(metadata.keys()) & set(keys)
     assert dup_keys == set(), f"Metadata cannot contain reserved keys={dup_keys}"
+
+
+def copy_on_write_enabled() -> bool:
+    """
+    Copy-on-Write is always on from pandas 3.0. On pandas 2.x it is opt-in:
+    `pd.set_option("mode.copy_on_write", True)`.
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def cow_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy of `df` that is safe to hand out to users. Under Copy-on-Write the copy shares buffers with `df` until either
+    of them is modified, otherwise it falls back to a deep copy.
+    """
+    return df.copy(deep=not copy_on_write_enabled())
+
+
+def add_categories(elements: pd.DataFrame, values: Dict[str, Hashable]):
+    """
+    Add the values about to be written into categorical columns of `elements` to their categories, in place. The
+    categories stay sorted, see `concat_categorized`.
+    """
+    for col, value in values.items():
+        if col not in elements.columns:
+            continue
+        column = elements[col]
+        if isinstance(column.dtype, pd.CategoricalDtype) and value not in column.cat.categories:
+            elements[col] = column.cat.set_categories(column.cat.categories.append(pd.Index([value])).sort_values())
@@ -6,8 +6,8 @@ from typing import TYPE_CHECKING, Dict
 
 from bridge.display.text import Panel
 from bridge.primitives.dataset.singular_dataset import SingularDataset
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
 from bridge.primitives.element.data.load_mechanism import LoadMechanism
-from bridge.primitives.element.element import Element
 from bridge.primitives.sample.singular_sample import SingularSample
 from bridge.providers.dataset_provider import DatasetProvider
 from bridge.utils import download_and_extract_archive
@@ -36,29 +36,26 @@ class LargeMovieReviewDataset(DatasetProvider[SingularDataset, SingularSample]):
         display_engine: DisplayEngine[SingularDataset, SingularSample] = Panel(),
         cache_mechanisms: Dict[str, CacheMechanism] = None,
     ) -> SingularDataset:
-        samples = []
-        annotations = []
+        samples = ElementTableBuilder()
+        annotations = ElementTableBuilder()
 
         class_dir_list = [d for d in list(self._split_root.iterdir()) if d.is_dir()]
         for class_idx, class_dir in enumerate(sorted(class_dir_list)):
             for textfile in class_dir.iterdir():
-                load_mechanism = LoadMechanism.from_url_string(str(textfile), "text")
-                text_element = Element(
+                samples.append_load_mechanism(
                     element_id=f"text_{textfile.stem}",
                     sample_id=textfile.stem,
                     etype="text",
-                    load_mechanism=load_mechanism,
+                    load_mechanism=LoadMechanism.from_url_string(str(textfile), "text"),
                 )
-                load_mechanism = LoadMechanism(ClassLabel(class_idx, class_dir.name), category="obj")
-                label_element = Element(
+                annotations.append(
                     element_id=f"label_{textfile.stem}",
                     sample_id=textfile.stem,
                     etype="class_label",
-                    load_mechanism=load_mechanism,
+                    url_or_data=ClassLabel(class_idx, class_dir.name),
+                    category="obj",
                 )
-                samples.append(text_element)
-                annotations.append(label_element)
 
-        return SingularDataset.from_lists(
+        return SingularDataset.from_builders(
             samples, annotations, display_engine=display_engine, cache_mechanisms=cache_mechanisms
         )
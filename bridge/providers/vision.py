@@ -8,6 +8,7 @@ import numpy as np
 
 from bridge.display.vision import Panel
 from bridge.primitives.dataset import SingularDataset
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
 from bridge.primitives.element.data.load_mechanism import LoadMechanism
 from bridge.primitives.element.element import Element
 from bridge.primitives.sample.singular_sample import SingularSample
@@ -27,28 +28,27 @@ class ImageFolder(DatasetProvider[SingularDataset, SingularSample]):
     def build_dataset(
         self, display_engine: DisplayEngine = Panel(), cache_mechanisms: Dict[str, CacheMechanism] = None
     ):
-        images = []
-        classes = []
+        images = ElementTableBuilder()
+        classes = ElementTableBuilder()
         for i, class_dir in enumerate(sorted(Path(self._root).iterdir())):
             for img_file in class_dir.iterdir():
                 sample_id = len(images)
-                img_element = Element(
+                images.append_load_mechanism(
                     element_id=f"image_{sample_id}",
                     sample_id=sample_id,
                     etype="image",
                     load_mechanism=LoadMechanism.from_url_string(str(img_file), category="image"),
-                    metadata={"filename": img_file.name},
+                    filename=img_file.name,
                 )
-                class_element = Element(
+                classes.append(
                     element_id=f"class_{i}",
                     sample_id=sample_id,
                     etype="class_label",
-                    load_mechanism=LoadMechanism(ClassLabel(i, class_dir.name), category="obj"),
-                    metadata={"filename": img_file.name},
+                    url_or_data=ClassLabel(i, class_dir.name),
+                    category="obj",
+                    filename=img_file.name,
                 )
-                images.append(img_element)
-                classes.append(class_element)
-        return SingularDataset.from_lists(
+        return SingularDataset.from_builders(
             images, classes, display_engine=display_engine, cache_mechanisms=cache_mechanisms
         )
 
@@ -96,8 +96,8 @@ class Coco2017Detection(DatasetProvider[SingularDataset, SingularSample]):
         cache_mechanisms: Dict[str, CacheMechanism] = None,
     ):
         img_id_list = list(sorted(self._coco.imgs.keys()))
-        images = []
-        bboxes = []
+        images = ElementTableBuilder()
+        bboxes = ElementTableBuilder()
         for img_id in img_id_list:
             coco_img = self._coco.loadImgs(img_id)[0]
             img_file = self._images_dir / coco_img["file_name"]
@@ -106,33 +106,29 @@ class Coco2017Detection(DatasetProvider[SingularDataset, SingularSample]):
                 url = coco_img["coco_url"]  # noqa
             else:
                 url = str(img_file)
-            load_mechanism = LoadMechanism.from_url_string(url, category="image")  # noqa
-            img_element = Element(
+            images.append_load_mechanism(
                 element_id=f"{img_id}_img",
                 sample_id=img_id,
                 etype="image",
-                load_mechanism=load_mechanism,
-                metadata={k: v for k, v in coco_img.items() if k not in Element.keys and k != "id"},
+                load_mechanism=LoadMechanism.from_url_string(url, category="image"),
+                **{k: v for k, v in coco_img.items() if k not in Element.keys and k != "id"},
             )
-            images.append(img_element)
             coco_annotations = self._coco.loadAnns(self._coco.getAnnIds(img_id))
             for coco_ann_dict in coco_annotations:
                 category_id = coco_ann_dict["category_id"]
-                bbox_data = BoundingBox(coords=(np.array(coco_ann_dict["bbox"])), class_label=(ClassLabel(category_id)))
-                load_mechanism = LoadMechanism(bbox_data, category="obj")
-                bbox_element = Element(
+                bboxes.append(
                     element_id=f"{img_id}_{coco_ann_dict['id']}",
                     sample_id=img_id,
                     etype="bbox",
-                    load_mechanism=load_mechanism,
-                    metadata={
-                        "category_id": category_id,
-                        "area": coco_ann_dict["area"],
-                        "iscrowd": coco_ann_dict["iscrowd"],
-                    },
+                    url_or_data=BoundingBox(
+                        coords=(np.array(coco_ann_dict["bbox"])), class_label=ClassLabel(category_id)
+                    ),
+                    category="obj",
+                    category_id=category_id,
+                    area=coco_ann_dict["area"],
+                    iscrowd=coco_ann_dict["iscrowd"],
                 )
-                bboxes.append(bbox_element)
-        return SingularDataset.from_lists(
+        return SingularDataset.from_builders(
             images, bboxes, display_engine=display_engine, cache_mechanisms=cache_mechanisms
         )
 
@@ -149,27 +145,26 @@ class TorchvisionCIFAR10(DatasetProvider[SingularDataset, SingularSample]):
         display_engine: DisplayEngine = Panel(),
         cache_mechanisms: Dict[str, CacheMechanism | None] | None = None,
     ):
-        sample_list = []
-        annotation_list = []
-        for i, (img, target) in enumerate(zip(self._ds.data, self._ds.targets)):
-            img_element = Element(
-                element_id=i,
-                etype="image",
-                sample_id=i,
-                load_mechanism=LoadMechanism(url_or_data=img, category="image"),
-            )
-            label_element = Element(
-                element_id=f"label_{i}",
-                etype="class_label",
-                sample_id=i,
-                load_mechanism=LoadMechanism(
-                    url_or_data=ClassLabel(class_idx=target, class_name=self._ds.classes[target]),
-                    category="obj",
-                ),
-            )
-            sample_list.append(img_element)
-            annotation_list.append(label_element)
-
-        return SingularDataset.from_lists(
-            sample_list, annotation_list, display_engine=display_engine, cache_mechanisms=cache_mechanisms
+        n_samples = len(self._ds.data)
+        sample_ids = np.arange(n_samples)
+        images = ElementTableBuilder()
+        images.extend_columns(
+            element_id=sample_ids,
+            sample_id=sample_ids,
+            etype="image",
+            url_or_data=self._ds.data,
+            category="image",
+        )
+        labels = ElementTableBuilder()
+        labels.extend_columns(
+            element_id=[f"label_{i}" for i in range(n_samples)],
+            sample_id=sample_ids,
+            etype="class_label",
+            url_or_data=[
+                ClassLabel(class_idx=target, class_name=self._ds.classes[target]) for target in self._ds.targets
+            ],
+            category="obj",
+        )
+        return SingularDataset.from_builders(
+            images, labels, display_engine=display_engine, cache_mechanisms=cache_mechanisms
         )
@@ -26,6 +26,8 @@ class Dictable(ABC):
 
 
 class Displayable(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def show(self, **kwargs):
         pass
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from bridge.primitives.dataset import Dataset, SingularDataset
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.element import Element
+from bridge.utils.data_objects import BoundingBox, ClassLabel
+
+
+@pytest.fixture
+def dummy_singular_dataset():
+    """
+    sample ids: 0-20, sample i has i % 4 bboxes
+    """
+    images = []
+    bboxes = []
+    for i in range(20):
+        images.append(
+            Element(
+                element_id=f"img_{i}",
+                sample_id=i,
+                etype="image",
+                load_mechanism=LoadMechanism(np.zeros((8, 8, 3), dtype="uint8"), category="obj"),
+                metadata={"width": 8 + i},
+            )
+        )
+        for j in range(i % 4):
+            bboxes.append(
+                Element(
+                    element_id=f"bbox_{i}_{j}",
+                    sample_id=i,
+                    etype="bbox",
+                    load_mechanism=LoadMechanism(
+                        BoundingBox(np.array([0, 0, j + 1, j + 1]), class_label=ClassLabel(j)), category="obj"
+                    ),
+                    metadata={"area": (j + 1) ** 2, "category_id": j},
+                )
+            )
+    return SingularDataset.from_lists(images, bboxes)
+
+
+@pytest.fixture
+def dummy_elements():
+    """
+    sample ids: 0-100
+    element ids: 0-100
+    """
+    elements = []
+    for i in range(100):
+        img_element = Element(
+            element_id=i,
+            sample_id=i,
+            etype="image",
+            load_mechanism=LoadMechanism(
+                url_or_data=np.random.randint(0, 255, size=(100, 100, 3)).astype("uint8"),
+                category="obj",
+            ),
+        )
+        lbl_element = Element(
+            element_id=f"label_{i}",
+            sample_id=i,
+            etype="class_label",
+            load_mechanism=LoadMechanism(url_or_data=ClassLabel(class_idx=np.random.randint(0, 10)), category="obj"),
+        )
+        elements.extend([img_element, lbl_element])
+    return elements
+
+
+@pytest.fixture
+def dummy_elements_2():
+    """
+    sample ids: 50-150 (50 sample id overlap)
+    element ids: 100-200 (0 element id overlap)
+    """
+    elements = []
+    for i in range(100):
+        img_element = Element(
+            element_id=100 + i,
+            sample_id=50 + i,
+            etype="image",
+            load_mechanism=LoadMechanism(
+                url_or_data=np.random.randint(0, 255, size=(100, 100, 3)).astype("uint8"),
+                category="obj",
+            ),
+        )
+        lbl_element = Element(
+            element_id=f"label_{100 + i}",
+            sample_id=50 + i,  # Adjusting sample_id to create overlap
+            etype="class_label",
+            load_mechanism=LoadMechanism(url_or_data=ClassLabel(class_idx=np.random.randint(0, 10)), category="obj"),
+        )
+        elements.extend([img_element, lbl_element])
+    return elements
+
+
+@pytest.fixture
+def dummy_dataset(dummy_elements):
+    return Dataset.from_elements(dummy_elements)
+
+
+@pytest.fixture
+def dummy_dataset_2(dummy_elements_2):
+    return Dataset.from_elements(dummy_elements_2)
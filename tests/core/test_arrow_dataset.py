@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.utils.constants import ELEMENT_COLS
+from bridge.utils.data_objects import ClassLabel
+
+pytest.importorskip("pyarrow")
+
+import pyarrow as pa  # noqa: E402
+import pyarrow.compute as pc  # noqa: E402
+
+from bridge.primitives.dataset.arrow_dataset import ArrowDataset, ArrowElementsTable  # noqa: E402
+
+
+@pytest.fixture
+def arrow_dataset(dummy_singular_dataset):
+    return ArrowDataset(dummy_singular_dataset.elements)
+
+
+def test_elements_roundtrip(dummy_singular_dataset, arrow_dataset):
+    expected = dummy_singular_dataset.elements
+    elements = arrow_dataset.elements
+    assert elements.index.equals(expected.index)
+    assert elements.columns.to_list() == expected.columns.to_list()
+    assert (elements[ELEMENT_COLS.ETYPE].astype(str) == expected[ELEMENT_COLS.ETYPE]).all()
+    assert all(a is b for a, b in zip(elements["data"], expected["data"]))
+
+
+def test_columnar_storage(arrow_dataset):
+    table = arrow_dataset.table.table
+    assert "data" not in table.column_names
+    assert str(table.schema.field(ELEMENT_COLS.ETYPE).type).startswith("dictionary")
+    assert str(table.schema.field(ELEMENT_COLS.LOAD_MECHANISM.CATEGORY).type).startswith("dictionary")
+
+
+def test_sample_access(dummy_singular_dataset, arrow_dataset):
+    assert len(arrow_dataset) == len(dummy_singular_dataset)
+    assert arrow_dataset.sample_ids == dummy_singular_dataset.sample_ids
+    sample = arrow_dataset.get(7)
+    assert {e.id for e_list in sample.elements.values() for e in e_list} == {
+        e.id for e_list in dummy_singular_dataset.get(7).elements.values() for e in e_list
+    }
+    assert [s.id for s in arrow_dataset] == dummy_singular_dataset.sample_ids
+
+
+def test_select_sort_assign(dummy_singular_dataset, arrow_dataset):
+    def query(ds):
+        return (
+            ds.select(lambda df: df[ELEMENT_COLS.ETYPE] == "bbox")
+            .sort("area", ascending=False)
+            .assign(double=lambda df: df.area * 2)
+        )
+
+    result = query(arrow_dataset)
+    expected = query(dummy_singular_dataset)
+    assert isinstance(result, ArrowDataset)
+    pd.testing.assert_index_equal(result.elements.index, expected.elements.index)
+    np.testing.assert_array_equal(result.elements["double"], expected.elements["double"])
+    assert result.sample_ids == expected.sample_ids
+
+
+def test_select_by_sample_ids(dummy_singular_dataset, arrow_dataset):
+    ds = arrow_dataset.select(lambda df: [3, 1])
+    assert ds.sample_ids == [3, 1]
+    pd.testing.assert_index_equal(ds.elements.index, dummy_singular_dataset.select(lambda df: [3, 1]).elements.index)
+    assert arrow_dataset.select_arrow(lambda table: [3, 1]).elements.index.equals(ds.elements.index)
+    with pytest.raises(KeyError):
+        arrow_dataset.select_arrow(lambda table: [3, 100])
+
+
+def test_select_arrow_stays_columnar(arrow_dataset, mocker):
+    to_pandas = mocker.spy(ArrowElementsTable, "to_pandas")
+    ds = arrow_dataset.select_arrow(lambda table: pc.greater(table["area"], 4))
+    assert to_pandas.call_count == 0
+    assert (ds.elements["area"] > 4).all()  # rows with a null area are dropped
+    expected = arrow_dataset.select(lambda df: df["area"] > 4)
+    pd.testing.assert_index_equal(ds.elements.index, expected.elements.index)
+
+
+def test_sample_access_converts_only_its_rows(arrow_dataset, mocker):
+    to_pandas = mocker.spy(ArrowElementsTable, "to_pandas")
+    sample = arrow_dataset.get(3)
+    assert to_pandas.call_count == 0
+    assert len(sample) == len(arrow_dataset.table.table.filter(pc.equal(arrow_dataset.table.table["sample_id"], 3)))
+
+
+def test_merge(dummy_singular_dataset, arrow_dataset):
+    bboxes = dummy_singular_dataset.select(lambda df: df[ELEMENT_COLS.ETYPE] == "bbox")
+    images = dummy_singular_dataset.select(lambda df: df[ELEMENT_COLS.ETYPE] == "image")
+    expected = images.merge(bboxes)
+    for other in [bboxes, ArrowDataset(bboxes.elements)]:
+        merged = ArrowDataset(images.elements).merge(other)
+        assert isinstance(merged, ArrowDataset)
+        pd.testing.assert_index_equal(merged.elements.index, expected.elements.index)
+        assert merged.elements.columns.to_list() == expected.elements.columns.to_list()
+        assert all(a is b for a, b in zip(merged.elements["data"], expected.elements["data"]))
+        np.testing.assert_array_equal(merged.elements["area"], expected.elements["area"])
+        assert merged.sample_ids == expected.sample_ids
+    with pytest.raises(AssertionError):
+        arrow_dataset.merge(bboxes)
+
+
+def test_cache_updates_table(tmp_path, dummy_singular_dataset):
+    cache = CacheMechanism(URIComponents.from_str(str(tmp_path)))
+    ds = ArrowDataset(dummy_singular_dataset.elements, cache_mechanisms={"bbox": cache})
+    parent_payloads = ds.elements["data"].to_list()
+    child = ds.select_arrow(lambda table: pc.equal(table[ELEMENT_COLS.ETYPE], "bbox"))
+    child = ArrowDataset(child.table, cache_mechanisms={"bbox": cache})
+    for sample in child:
+        _ = sample.data
+    assert len(list(Path(tmp_path).iterdir())) == len(child.elements)
+    assert child.elements["data"].apply(lambda d: isinstance(d, URIComponents)).all()
+    # the parent shares the payload store with the child, but must not see its writes
+    assert all(a is b for a, b in zip(ds.elements["data"], parent_payloads))
+    assert isinstance(ds.get(1).elements["bbox"][0].data.class_label, ClassLabel)
+
+
+def test_update_element_rebuilds_one_chunk(dummy_singular_dataset):
+    table = ArrowElementsTable.from_pandas(dummy_singular_dataset.elements)
+    arrow_table = pa.concat_tables([table.table.slice(0, 10), table.table.slice(10)])  # two chunks per column
+    table = ArrowElementsTable(arrow_table, table._objects, table.column_names)
+    position = table.to_pandas().index.get_loc((3, "bbox_3_1"))
+    assert position >= 10
+    first_chunks = {name: arrow_table.column(name).chunk(0) for name in [ELEMENT_COLS.LOAD_MECHANISM.CATEGORY, "width"]}
+    table.update_element("bbox_3_1", {ELEMENT_COLS.LOAD_MECHANISM.CATEGORY: "new", "width": 1.5, "area": "big"})
+    for name, chunk in first_chunks.items():
+        assert table.table.column(name).chunk(0).buffers()[1].address == chunk.buffers()[1].address
+    assert pa.types.is_dictionary(table.table.schema.field(ELEMENT_COLS.LOAD_MECHANISM.CATEGORY).type)
+    # "area" no longer fits a numeric column and moves to the side store
+    assert "area" not in table.table.column_names
+    elements = table.to_pandas()
+    row = elements.loc[(3, "bbox_3_1")]
+    assert (row[ELEMENT_COLS.LOAD_MECHANISM.CATEGORY], row["width"], row["area"]) == ("new", 1.5, "big")
+    expected = dummy_singular_dataset.elements.drop(index=[(3, "bbox_3_1")])
+    pd.testing.assert_series_equal(
+        elements.drop(index=[(3, "bbox_3_1")])["area"].astype(float), expected["area"].astype(float)
+    )
+
+
+def test_sort_dictionary_column(dummy_singular_dataset, arrow_dataset):
+    result = arrow_dataset.sort(ELEMENT_COLS.ETYPE, ascending=False)
+    expected = dummy_singular_dataset.sort(ELEMENT_COLS.ETYPE, ascending=False)
+    pd.testing.assert_index_equal(result.elements.index, expected.elements.index)
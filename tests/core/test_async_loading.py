@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import PIL.Image
+import pytest
+
+from bridge.primitives.dataset import Dataset
+from bridge.primitives.element.data import category_registry
+from bridge.primitives.element.data.category_registry import register
+from bridge.primitives.element.data.data_io import DataIO, JPEGDataIO
+from bridge.primitives.element.data.http_fetch import fetch
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.element.element import Element
+from bridge.utils.constants import ELEMENT_COLS
+
+N_IMAGES = 12
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            SlowHandler.in_flight += 1
+            SlowHandler.max_in_flight = max(SlowHandler.max_in_flight, SlowHandler.in_flight)
+        time.sleep(0.05)
+        # counted until the response is sent, a client may start its next request as soon as it has read the body
+        with self.lock:
+            SlowHandler.in_flight -= 1
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def image_server(tmp_path):
+    rng = np.random.default_rng(0)
+    for i in range(N_IMAGES):
+        PIL.Image.fromarray(rng.integers(0, 255, size=(16, 16, 3), dtype=np.uint8)).save(tmp_path / f"{i}.jpg")
+    SlowHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SlowHandler, directory=str(tmp_path)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield tmp_path, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@register
+class NoAsyncDataIO:
+    # registered without subclassing `DataIO`, so it has no `load_async`/`store_async`
+    category = "no_async_test"
+    extension = ".txt"
+
+    @classmethod
+    def load(cls, url_or_data):
+        return (url_or_data.path, threading.get_ident())
+
+    @classmethod
+    def store(cls, data, url):
+        return LoadMechanism(data, cls.category)
+
+
+@register
+class FetchDataIO(DataIO):
+    # the raw bytes of http(s) files, so that `aiter` can be tested without an image decoder
+    category = "fetch_test"
+    extension = ".jpg"
+    io_bound = True
+
+    @classmethod
+    def load(cls, url_or_data):
+        if not isinstance(url_or_data, URIComponents):
+            return url_or_data
+        raise NotImplementedError()
+
+    @classmethod
+    async def load_async(cls, url_or_data):
+        return await fetch(url_or_data)
+
+    @classmethod
+    def store(cls, data, url):
+        raise NotImplementedError()
+
+
+def http_image_dataset(url: str, n_images: int = N_IMAGES, category: str = "fetch_test") -> Dataset:
+    elements = [
+        Element(f"img_{i}", "image", LoadMechanism.from_url_string(f"{url}/{i}.jpg", category), i)
+        for i in range(n_images)
+    ]
+    return Dataset.from_elements(elements)
+
+
+async def collect(ds: Dataset, concurrency: int):
+    return [sample async for sample in ds.aiter(concurrency=concurrency)]
+
+
+def test_aiter_fetches_concurrently(image_server):
+    root, url = image_server
+    samples = asyncio.run(collect(http_image_dataset(url), concurrency=6))
+    assert [sample.id for sample in samples] == list(range(N_IMAGES))
+    for i, sample in enumerate(samples):
+        content = sample.elements["image"][0].to_dict()[ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA]
+        assert content == (root / f"{i}.jpg").read_bytes()  # prefetched
+        assert sample.data["image"][0] == content
+    assert 1 < SlowHandler.max_in_flight <= 6
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    # answers every request itself, recording the (absolute) urls clients ask it for
+    requested = []
+
+    def do_GET(self):
+        ProxyHandler.requested.append(self.path)
+        body = b"proxied"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def proxy_server(monkeypatch):
+    for name in ["http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "no_proxy", "NO_PROXY"]:
+        monkeypatch.delenv(name, raising=False)
+    ProxyHandler.requested = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ProxyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("http_proxy", f"http://127.0.0.1:{server.server_address[1]}")
+    yield ProxyHandler.requested
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_honours_proxy_settings(image_server, proxy_server, monkeypatch):
+    root, url = image_server
+    assert asyncio.run(fetch(URIComponents.from_str("http://images.invalid/0.jpg"))) == b"proxied"
+    assert proxy_server == ["http://images.invalid/0.jpg"]
+
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+    assert asyncio.run(fetch(URIComponents.from_str(f"{url}/0.jpg"))) == (root / "0.jpg").read_bytes()
+    assert len(proxy_server) == 1
+
+
+def test_jpeg_load_async_matches_load(image_server):
+    pytest.importorskip("skimage")
+    root, url = image_server
+    samples = asyncio.run(collect(http_image_dataset(url, category="image"), concurrency=6))
+    for i, sample in enumerate(samples):
+        local = JPEGDataIO.load(URIComponents(path=str(root / f"{i}.jpg")))
+        np.testing.assert_array_equal(sample.data["image"][0], local)
+
+
+def test_aiter_missing_image_raises(image_server):
+    _, url = image_server
+    with pytest.raises(OSError, match="404"):
+        asyncio.run(collect(http_image_dataset(url, N_IMAGES + 1), concurrency=4))
+
+
+def test_load_async_falls_back_to_threads():
+    url = URIComponents(path="a")
+    path, thread = asyncio.run(category_registry.load_async(url, "no_async_test"))
+    assert path == "a" and thread != threading.get_ident()
+    load_mechanism = asyncio.run(category_registry.store_async("data", None, "no_async_test"))
+    assert load_mechanism.url_or_data == "data"
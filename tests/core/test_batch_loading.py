@@ -0,0 +1,95 @@
+import numpy as np
+import PIL.Image
+import pytest
+
+from bridge.primitives.dataset import Dataset
+from bridge.primitives.element.data import category_registry
+from bridge.primitives.element.data.data_cache import DecodedDataCache
+from bridge.primitives.element.data.data_io import JPEGDataIO, NumpyDataIO, TextDataIO
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.element.element import Element
+from bridge.primitives.sample import Sample
+from bridge.utils.constants import ELEMENT_COLS
+
+
+@pytest.fixture
+def files(tmp_path):
+    rng = np.random.default_rng(0)
+    for i in range(6):
+        np.save(tmp_path / f"{i}.npy", rng.normal(size=(4, 3)))
+        (tmp_path / f"{i}.txt").write_text(f"review {i}\nline two")
+        PIL.Image.fromarray(rng.integers(0, 255, size=(8, 8, 3), dtype=np.uint8)).save(tmp_path / f"{i}.jpg")
+    return tmp_path
+
+
+def file_elements(root, sample_id: int):
+    return [
+        Element(
+            f"feat_{sample_id}",
+            "features",
+            LoadMechanism(URIComponents(path=f"{root}/{sample_id}.npy"), "numpy"),
+            sample_id,
+        ),
+        Element(
+            f"review_{sample_id}",
+            "review",
+            LoadMechanism(URIComponents(path=f"{root}/{sample_id}.txt"), "text"),
+            sample_id,
+        ),
+        Element(f"label_{sample_id}", "label", LoadMechanism(sample_id, "obj"), sample_id),
+    ]
+
+
+@pytest.mark.parametrize("data_io, extension", [(NumpyDataIO, "npy"), (TextDataIO, "txt")])
+def test_load_many_matches_load(files, data_io, extension):
+    urls = [URIComponents(path=f"{files}/{i}.{extension}") for i in [3, 0, 5, 1]] + ["in-memory"]
+    loaded = data_io.load_many(urls)
+    for url, datum in zip(urls[:-1], loaded):
+        np.testing.assert_array_equal(datum, data_io.load(url))
+    assert loaded[-1] == "in-memory"
+
+
+def test_load_many_decodes_images_like_load(files):
+    pytest.importorskip("skimage")
+    urls = [URIComponents(path=f"{files}/{i}.jpg") for i in range(6)]
+    for url, image in zip(urls, category_registry.load_many(urls, "image")):
+        np.testing.assert_array_equal(image, JPEGDataIO.load(url))
+
+
+def test_sample_data_loads_each_category_once(files, mocker):
+    load_many = mocker.spy(category_registry, "load_many")
+    samples = [Sample(file_elements(files, i)) for i in range(3)]
+    data = Sample.load_batch(samples)
+    assert sorted(call.args[1] for call in load_many.call_args_list) == ["numpy", "text"]
+    assert [d["label"] for d in data] == [[0], [1], [2]]
+    assert data[2]["review"] == ["review 2\nline two"]
+    np.testing.assert_array_equal(data[1]["features"][0], np.load(files / "1.npy"))
+
+    load_many.reset_mock()
+    assert samples[0].data["review"] == ["review 0\nline two"]
+    assert load_many.call_count == 2
+
+
+def test_cache_load_many_only_loads_misses():
+    calls = []
+
+    def loader(urls, category):
+        calls.append([getattr(url, "path", url) for url in urls])
+        return [np.zeros(10) for _ in urls]
+
+    cache = DecodedDataCache(max_bytes=2**20)
+    cache.load_many([URIComponents(path="a"), URIComponents(path="b")], "numpy", loader)
+    cache.load_many([URIComponents(path="b"), URIComponents(path="c"), "in-memory"], "numpy", loader)
+    assert calls == [["a", "b"], ["c", "in-memory"]]
+    assert cache.stats.hits == 1 and cache.stats.misses == 3
+
+
+def test_iter_samples_load_data(files, mocker):
+    ds = Dataset.from_elements([e for i in range(6) for e in file_elements(files, i)])
+    load_many = mocker.spy(category_registry, "load_many")
+    chunks = list(ds.iter_samples(chunk_size=3, load_data=True))
+    assert load_many.call_count == 2 * 2  # per chunk, per category behind a URI
+    for sample in chunks[1]:
+        review = sample.elements["review"][0].to_dict()[ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA]
+        assert review == f"review {sample.id}\nline two"  # kept in memory
@@ -0,0 +1,56 @@
+import numpy as np
+
+from bridge.primitives.sample.transform import BatchSampleTransform, SampleBatch
+
+
+class FlipAndScale(BatchSampleTransform):
+    batch_size = 8
+
+    def __init__(self):
+        self.batch_lengths = []
+
+    def __call__(self, samples, cache_mechanisms, display_engine):
+        self.batch_lengths.append(len(samples))
+        batch = SampleBatch(samples, cache_mechanisms, display_engine)
+        for group in batch.stack("image"):
+            batch.update_stacked(group, group.data[:, :, ::-1] + 1)
+        boxes = batch.boxes("bbox")
+        batch.update_boxes(boxes, boxes.coords * 2)
+        return batch.to_samples()
+
+
+def test_sample_batch_columns(dummy_singular_dataset):
+    samples = [dummy_singular_dataset.iget(i) for i in range(4)]
+    batch = SampleBatch(samples, cache_mechanisms={})
+    (group,) = batch.stack("image")
+    assert group.data.shape == (4, 8, 8, 3)
+    boxes = batch.boxes("bbox")
+    assert boxes.coords.shape == (6, 4)
+    assert boxes.offsets.tolist() == [0, 0, 1, 3, 6]
+    assert [e.sample_id for e in boxes.elements[boxes.offsets[3] : boxes.offsets[4]]] == [3, 3, 3]
+
+
+def test_transform_samples_dispatches_batches(dummy_singular_dataset):
+    transform = FlipAndScale()
+    ds = dummy_singular_dataset.transform_samples(transform)
+    assert transform.batch_lengths == [8, 8, 4]
+    assert ds.sample_ids == dummy_singular_dataset.sample_ids
+    sample = ds.get(3)
+    assert np.array_equal(sample.data, np.ones((8, 8, 3)))
+    assert [box.data.coords.tolist() for box in sample.annotations["bbox"]] == [
+        [0, 0, 2, 2],
+        [0, 0, 4, 4],
+        [0, 0, 6, 6],
+    ]
+    assert sample.annotations["bbox"][2].metadata["area"] == 9
+
+
+def test_batch_transform_chunks(dummy_singular_dataset):
+    calls = []
+
+    def recording_map(fn, batches):
+        calls.append([len(b) for b in batches])
+        return map(fn, batches)
+
+    dummy_singular_dataset.transform_samples(FlipAndScale(), map_fn=recording_map, chunk_size=16)
+    assert calls == [[8, 8], [4]]
@@ -0,0 +1,124 @@
+import pytest
+
+from bridge.primitives.dataset import ChainDataset, Dataset, SingularDataset
+from bridge.primitives.dataset.sample_index import SampleIndex
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.element import Element
+from bridge.utils.constants import IS_SAMPLE_COL_NAME
+
+
+@pytest.fixture
+def shards(dummy_dataset):
+    ids = dummy_dataset.sample_ids
+    return [
+        dummy_dataset.select(lambda df, part=part: df.index.get_level_values("sample_id").isin(part))
+        for part in (ids[:30], ids[30:45], ids[45:])
+    ]
+
+
+def test_concat_matches_source(dummy_dataset, shards):
+    ds = Dataset.concat(shards)
+    assert isinstance(ds, ChainDataset)
+    assert len(ds) == len(dummy_dataset)
+    assert ds.sample_ids == dummy_dataset.sample_ids
+    assert ds.segment_offsets.tolist() == [0, 30, 45, 100]
+    for index in [0, 29, 30, 44, 45, -1]:
+        assert ds.iget(index).id == dummy_dataset.sample_ids[index]
+    assert [sample.id for sample in ds] == dummy_dataset.sample_ids
+
+
+def test_concat_does_not_copy_until_needed(shards):
+    ds = Dataset.concat(shards)
+    ds.iget(50)
+    list(ds.iter_samples(chunk_size=16))
+    assert ds._unified is None
+    assert len(ds.elements) == 200
+    assert ds._unified is not None
+
+
+def test_concat_shared_sample_ids(dummy_dataset, dummy_dataset_2):
+    merged = dummy_dataset.merge(dummy_dataset_2)
+    ds = Dataset.concat([dummy_dataset, dummy_dataset_2])
+    assert len(ds) == len(merged) == 150
+    assert ds.sample_ids == merged.sample_ids
+    for sample_id in [0, 60, 120]:
+        assert sorted(map(str, ds.get(sample_id).elements["image"])) == sorted(
+            map(str, merged.get(sample_id).elements["image"])
+        )
+    assert [len(sample) for sample in ds] == [len(sample) for sample in merged]
+
+
+def test_concat_get_looks_up_segment(dummy_dataset, shards, mocker):
+    ds = Dataset.concat(shards)
+    sample_ids = [0, 29, 30, 44, 45, 99]
+    expected = [sorted(map(str, dummy_dataset.get(sample_id).elements["image"])) for sample_id in sample_ids]
+    position = mocker.spy(SampleIndex, "position")
+    samples = [ds.get(sample_id) for sample_id in sample_ids]
+    assert position.call_count == 0  # segments aren't probed one by one
+    assert [sample.id for sample in samples] == sample_ids
+    assert [sorted(map(str, sample.elements["image"])) for sample in samples] == expected
+    with pytest.raises(KeyError):
+        ds.get(100)
+
+
+def test_concat_duplicate_elements(dummy_dataset):
+    with pytest.raises(AssertionError):
+        Dataset.concat([dummy_dataset, dummy_dataset])
+
+
+def test_concat_flattens_chains(shards):
+    ds = Dataset.concat([Dataset.concat(shards[:2]), shards[2]])
+    assert len(ds.segments) == 3
+
+
+def test_concat_keeps_sample_class(dummy_singular_dataset):
+    ds = Dataset.concat(
+        [
+            dummy_singular_dataset.select_samples(lambda s, a: s.index.get_level_values("sample_id") < 10),
+            dummy_singular_dataset.select_samples(lambda s, a: s.index.get_level_values("sample_id") >= 10),
+        ]
+    )
+    assert len(ds) == 20
+    assert ds.get(13).element.id == "img_13"
+
+
+def test_append_elements_adds_segment(dummy_dataset, shards):
+    ds = Dataset.concat(shards)
+    _ = ds.sample_ids, ds.stats
+    image = dummy_dataset.get(0).elements["image"][0]
+    new = [
+        Element("new_100", "image", LoadMechanism(image.data, "obj"), sample_id=100),
+        Element("new_3", "image", LoadMechanism(image.data, "obj"), sample_id=3),  # joins sample 3 of the first shard
+    ]
+    ds.append_elements(new)
+    assert len(ds.segments) == 4 and [len(shard) for shard in shards] == [30, 15, 55]
+    assert len(ds) == 101
+    assert ds.sample_ids == dummy_dataset.sample_ids + [100]
+    assert sorted(map(str, ds.get(3).elements["image"])) == sorted(
+        map(str, dummy_dataset.get(3).elements["image"] + [ds.segments[-1].get(3).elements["image"][0]])
+    )
+    assert ds.iget(-1).id == 100
+    assert ds.stats == Dataset(ds.elements).stats
+    with pytest.raises(AssertionError, match="already exist"):
+        ds.append_elements([Element("new_3", "image", LoadMechanism(image.data, "obj"), sample_id=4)])
+    assert len(ds.segments) == 4
+
+
+def test_append_elements_singular_segment(dummy_singular_dataset):
+    ds = Dataset.concat(
+        [
+            dummy_singular_dataset.select_samples(lambda s, a: s.index.get_level_values("sample_id") < 10),
+            dummy_singular_dataset.select_samples(lambda s, a: s.index.get_level_values("sample_id") >= 10),
+        ]
+    )
+    image = dummy_singular_dataset.get(0).element
+    box = dummy_singular_dataset.get(1).annotations["bbox"][0]
+    new_image = Element(
+        "img_20", image.etype, LoadMechanism(image.data, "obj"), sample_id=20, metadata={IS_SAMPLE_COL_NAME: True}
+    )
+    new_box = Element("bbox_20_0", box.etype, LoadMechanism(box.data, "obj"), sample_id=20, metadata={"area": 1})
+    ds.append_elements([new_box, new_image])
+    assert isinstance(ds.segments[-1], SingularDataset)
+    sample = ds.get(20)
+    assert sample.element.id == "img_20"
+    assert [annotation.id for annotation in sample.annotations["bbox"]] == ["bbox_20_0"]
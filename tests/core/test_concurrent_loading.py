@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from bridge.primitives.element.data import concurrent_loading
+from bridge.primitives.element.data.category_registry import register
+from bridge.primitives.element.data.data_io import DataIO
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.element.element import Element
+from bridge.primitives.sample import Sample
+from bridge.primitives.sample.singular_sample import SingularSample
+
+
+@register
+class SlowDataIO(DataIO):
+    category = "slow_test"
+    extension = ".txt"
+    io_bound = True
+    in_flight = 0
+    max_in_flight = 0
+    threads = set()
+    lock = threading.Lock()
+
+    @classmethod
+    def load(cls, url_or_data):
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.threads.add(threading.get_ident())
+        time.sleep(0.05)
+        with cls.lock:
+            cls.in_flight -= 1
+        if url_or_data.path == "fail":
+            raise OSError("failed")
+        return url_or_data.path
+
+    @classmethod
+    def store(cls, data, url):
+        raise NotImplementedError()
+
+
+@pytest.fixture(autouse=True)
+def reset_slow_io():
+    SlowDataIO.max_in_flight = 0
+    SlowDataIO.threads = set()
+    yield
+    concurrent_loading.set_concurrency_limit("slow_test", None)
+    concurrent_loading.set_concurrent_data(False)
+
+
+def slow_element(i, etype="image", **metadata):
+    return Element(
+        f"e_{etype}_{i}", etype, LoadMechanism(URIComponents(path=str(i)), "slow_test"), 0, metadata=metadata
+    )
+
+
+def test_load_all_keeps_order():
+    elements = [slow_element(i) for i in range(8)] + [slow_element(i, "mask") for i in range(8, 12)]
+    elements.append(Element("in_memory", "mask", LoadMechanism("in-memory", "obj"), 0))
+    sample = Sample(elements)
+    start = time.perf_counter()
+    data = sample.load_all()
+    assert time.perf_counter() - start < 0.05 * 12 / 2
+    assert data == {"image": [str(i) for i in range(8)], "mask": [str(i) for i in range(8, 12)] + ["in-memory"]}
+    assert SlowDataIO.max_in_flight > 1
+    assert threading.get_ident() not in SlowDataIO.threads
+
+
+def test_concurrency_limit():
+    concurrent_loading.set_concurrency_limit("slow_test", 2)
+    Sample([slow_element(i) for i in range(8)]).load_all()
+    assert SlowDataIO.max_in_flight == 2
+
+    concurrent_loading.set_concurrency_limit("slow_test", 0)
+    SlowDataIO.threads = set()
+    Sample([slow_element(i) for i in range(3)]).load_all()
+    assert SlowDataIO.threads == {threading.get_ident()}
+
+
+def test_concurrent_data_option(mocker):
+    load_elements = mocker.spy(concurrent_loading, "load_elements")
+    sample = Sample([slow_element(i) for i in range(4)])
+    assert sample.data == {"image": ["0", "1", "2", "3"]}
+    assert load_elements.call_count == 0
+    concurrent_loading.set_concurrent_data(True)
+    assert sample.data == {"image": ["0", "1", "2", "3"]}
+    assert load_elements.call_count == 1
+
+
+def test_load_annotations():
+    sample = SingularSample([slow_element(0, is_example=True)] + [slow_element(i, "bbox") for i in range(1, 5)])
+    assert sample.load_annotations() == {"bbox": ["1", "2", "3", "4"]}
+
+
+def test_load_error_is_raised_after_all_loads():
+    elements = [slow_element(i) for i in range(4)]
+    elements.insert(1, slow_element("fail"))
+    with pytest.raises(OSError):
+        Sample(elements).load_all()
+    assert SlowDataIO.in_flight == 0
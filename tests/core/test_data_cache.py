@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from bridge.primitives.element.data.data_cache import DATA_CACHE, DecodedDataCache
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+
+
+@pytest.fixture
+def loads():
+    return []
+
+
+@pytest.fixture
+def loader(loads):
+    def load(url_or_data, category):
+        loads.append(str(url_or_data))
+        return np.zeros(100, dtype=np.uint8)
+
+    return load
+
+
+def uri(name: str) -> URIComponents:
+    return URIComponents(path=f"/data/{name}")
+
+
+@pytest.fixture
+def data_cache():
+    DATA_CACHE.configure(max_bytes=2**20)
+    yield DATA_CACHE
+    DATA_CACHE.configure(max_bytes=0)
+    DATA_CACHE.set_category_enabled("text", True)
+    DATA_CACHE.clear()
+
+
+def test_hits_and_misses(loader, loads):
+    cache = DecodedDataCache(max_bytes=2**20)
+    first = cache.load(uri("a"), "image", loader)
+    second = cache.load(uri("a"), "image", loader)
+    assert second is first  # the loaded array is cached and handed out as it is, without copying it
+    assert cache.load(uri("a"), "image", loader) is second
+    cache.load(uri("a"), "numpy", loader)  # keyed by category too
+    assert loads == ["/data/a", "/data/a"]
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.n_items) == (2, 2, 2)
+    assert stats.hit_rate == 2 / 4
+
+
+@pytest.mark.parametrize("n_loads", [1, 2])
+def test_miss_and_hit_return_read_only_arrays(loader, loads, n_loads):
+    cache = DecodedDataCache(max_bytes=2**20)
+    for _ in range(n_loads):
+        single = cache.load(uri("a"), "image", loader)
+        many = cache.load_many(
+            [uri("b"), uri("c")], "image", lambda urls, category: [loader(u, category) for u in urls]
+        )
+    assert len(loads) == 3
+    assert not single.flags.writeable and not any(data.flags.writeable for data in many)
+    with pytest.raises(ValueError):
+        single[0] = 1
+
+
+def test_put_leaves_callers_array_writable():
+    cache = DecodedDataCache(max_bytes=2**20)
+    data = np.zeros(10)
+    cache.put(uri("a"), "numpy", data)
+    assert data.flags.writeable
+    data += 1
+    np.testing.assert_array_equal(cache.load(uri("a"), "numpy", None), np.zeros(10))
+
+    cache.put(uri("b"), "numpy", np.zeros(10).view(np.memmap))  # memory-mapped arrays are paged by the OS
+    assert not cache.is_cached(uri("b"), "numpy")
+
+
+def test_evicts_least_recently_used(loader, loads):
+    cache = DecodedDataCache(max_bytes=2**20)
+    cache.load(uri("a"), "image", loader)
+    n_bytes = cache.stats.n_bytes
+    cache.configure(max_bytes=2 * n_bytes)
+    cache.load(uri("b"), "image", loader)
+    cache.load(uri("a"), "image", loader)  # `b` is now the least recently used
+    cache.load(uri("c"), "image", loader)
+    assert cache.is_cached(uri("a"), "image")
+    assert not cache.is_cached(uri("b"), "image")
+    assert cache.stats.evictions == 1
+    assert cache.stats.n_bytes <= cache.max_bytes
+
+
+def test_evicts_least_frequently_used(loader, loads):
+    cache = DecodedDataCache(max_bytes=2**20, policy="lfu")
+    cache.load(uri("a"), "image", loader)
+    cache.configure(max_bytes=2 * cache.stats.n_bytes)
+    cache.load(uri("a"), "image", loader)
+    cache.load(uri("b"), "image", loader)  # `b` is the most recently used, but `a` the most frequently
+    cache.load(uri("c"), "image", loader)
+    assert cache.is_cached(uri("a"), "image")
+    assert not cache.is_cached(uri("b"), "image")
+
+
+def test_lfu_evicts_in_count_then_recency_order(loader, loads):
+    cache = DecodedDataCache(max_bytes=2**20, policy="lfu")
+    for name, n_loads in [("a", 3), ("b", 2), ("c", 2), ("d", 1), ("e", 3)]:
+        for _ in range(n_loads):
+            cache.load(uri(name), "image", loader)
+    cache.invalidate(uri("d"), "image")  # the only entry with the smallest count
+    n_bytes = cache.stats.n_bytes // 4
+    evicted = []
+    for max_items in [3, 2, 1, 0]:
+        cache.configure(max_bytes=max_items * n_bytes)
+        evicted += [name for name in "abce" if name not in evicted and not cache.is_cached(uri(name), "image")]
+    assert evicted == ["b", "c", "a", "e"]
+
+
+def test_disabled_and_in_memory_sources_are_not_cached(loader, loads):
+    cache = DecodedDataCache()
+    cache.load(uri("a"), "image", loader)
+    cache.load(uri("a"), "image", loader)
+    assert len(loads) == 2
+
+    cache.configure(max_bytes=2**20)
+    cache.load("in-memory", "image", loader)
+    cache.set_category_enabled("image", False)
+    cache.load(uri("a"), "image", loader)
+    assert cache.stats.n_items == 0
+
+
+def test_load_mechanism_uses_cache(data_cache, tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("first")
+    load_mechanism = LoadMechanism(URIComponents(path=str(path)), "text")
+    assert load_mechanism.load_data() == "first"
+    path.write_text("second")
+    assert LoadMechanism(URIComponents(path=str(path)), "text").load_data() == "first"
+    assert data_cache.stats.hits == 1
+
+    data_cache.invalidate(URIComponents(path=str(path)), "text")
+    assert load_mechanism.load_data() == "second"
+    data_cache.set_category_enabled("text", False)
+    path.write_text("third")
+    assert load_mechanism.load_data() == "third"
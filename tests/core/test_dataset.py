@@ -1,9 +1,12 @@
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 import pytest
 
 from bridge.primitives.dataset import Dataset
+from bridge.primitives.dataset.memory import PayloadSizer
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
 from bridge.primitives.element.data.cache_mechanism import CacheMechanism
 from bridge.primitives.element.data.load_mechanism import LoadMechanism
 from bridge.primitives.element.data.uri_components import URIComponents
@@ -12,70 +15,6 @@ from bridge.utils.constants import ELEMENT_COLS
 from bridge.utils.data_objects import ClassLabel
 
 
-@pytest.fixture
-def dummy_elements():
-    """
-    sample ids: 0-100
-    element ids: 0-100
-    """
-    elements = []
-    for i in range(100):
-        img_element = Element(
-            element_id=i,
-            sample_id=i,
-            etype="image",
-            load_mechanism=LoadMechanism(
-                url_or_data=np.random.randint(0, 255, size=(100, 100, 3)).astype("uint8"),
-                category="obj",
-            ),
-        )
-        lbl_element = Element(
-            element_id=f"label_{i}",
-            sample_id=i,
-            etype="class_label",
-            load_mechanism=LoadMechanism(url_or_data=ClassLabel(class_idx=np.random.randint(0, 10)), category="obj"),
-        )
-        elements.extend([img_element, lbl_element])
-    return elements
-
-
-@pytest.fixture
-def dummy_elements_2():
-    """
-    sample ids: 50-150 (50 sample id overlap)
-    element ids: 100-200 (0 element id overlap)
-    """
-    elements = []
-    for i in range(100):
-        img_element = Element(
-            element_id=100 + i,
-            sample_id=50 + i,
-            etype="image",
-            load_mechanism=LoadMechanism(
-                url_or_data=np.random.randint(0, 255, size=(100, 100, 3)).astype("uint8"),
-                category="obj",
-            ),
-        )
-        lbl_element = Element(
-            element_id=f"label_{100+i}",
-            sample_id=50 + i,  # Adjusting sample_id to create overlap
-            etype="class_label",
-            load_mechanism=LoadMechanism(url_or_data=ClassLabel(class_idx=np.random.randint(0, 10)), category="obj"),
-        )
-        elements.extend([img_element, lbl_element])
-    return elements
-
-
-@pytest.fixture
-def dummy_dataset(dummy_elements):
-    return Dataset.from_elements(dummy_elements)
-
-
-@pytest.fixture
-def dummy_dataset_2(dummy_elements_2):
-    return Dataset.from_elements(dummy_elements_2)
-
-
 @pytest.fixture
 def dummy_classification_dataset_local_cache(tmp_path, dummy_elements):
     cache = CacheMechanism(URIComponents.from_str(str(tmp_path)))
@@ -149,3 +88,257 @@ def test_merge_datasets(dummy_dataset, dummy_dataset_2):
     merged_ds = dummy_dataset.merge(dummy_dataset_2)
     assert len(merged_ds) == 150
     assert len(merged_ds.elements) == 400
+
+
+def test_iget_matches_get(dummy_dataset):
+    sample_ids = dummy_dataset.sample_ids
+    for index in [0, 1, 50, -1]:
+        sample = dummy_dataset.iget(index)
+        assert sample.id == sample_ids[index]
+        assert sample.id == dummy_dataset.get(sample_ids[index]).id
+        assert len(sample) == 2
+
+
+def test_iget_out_of_range(dummy_dataset):
+    with pytest.raises(IndexError):
+        dummy_dataset.iget(len(dummy_dataset))
+
+
+def test_get_missing_sample(dummy_dataset):
+    with pytest.raises(KeyError):
+        dummy_dataset.get("missing")
+
+
+def test_sample_index_interleaved_rows(dummy_dataset):
+    ds = dummy_dataset.sort(ELEMENT_COLS.ETYPE)
+    assert not ds.sample_index.is_grouped
+    sample_ids = ds.elements.index.get_level_values(ELEMENT_COLS.SAMPLE_ID).drop_duplicates().to_list()
+    assert ds.sample_ids == sample_ids
+    for sample_id in [0, 42, 99]:
+        sample = ds.get(sample_id)
+        assert {e.sample_id for e_list in sample.elements.values() for e in e_list} == {sample_id}
+        assert set(sample.elements.keys()) == {"image", "class_label"}
+
+
+def test_assign_keeps_sample_index(dummy_dataset):
+    index = dummy_dataset.sample_index
+    ds = dummy_dataset.assign(foo=lambda df: 1)
+    assert ds.sample_index is index
+
+
+def test_iter_follows_sample_ids(dummy_dataset):
+    ds = dummy_dataset.sort(ELEMENT_COLS.ETYPE, ascending=False)
+    assert [sample.id for sample in ds] == ds.sample_ids
+
+
+def test_iter_samples_chunks(dummy_dataset):
+    chunks = list(dummy_dataset.iter_samples(chunk_size=30))
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+    assert [sample.id for chunk in chunks for sample in chunk] == dummy_dataset.sample_ids
+
+
+def test_elements_mutation_does_not_leak(dummy_dataset):
+    elements = dummy_dataset.elements
+    elements["foo"] = 1
+    category = ELEMENT_COLS.LOAD_MECHANISM.CATEGORY
+    elements[category] = elements[category].cat.add_categories(["image"])
+    elements.loc[:, category] = "image"
+    assert "foo" not in dummy_dataset.elements.columns
+    assert (dummy_dataset.elements[ELEMENT_COLS.LOAD_MECHANISM.CATEGORY] == "obj").all()
+
+
+def test_select_does_not_affect_parent(dummy_dataset):
+    ds = dummy_dataset.select(lambda e: e[ELEMENT_COLS.ETYPE] == "image")
+    ds._elements.loc[:, ELEMENT_COLS.ETYPE] = "class_label"
+    assert len(dummy_dataset.elements) == 200
+    assert (dummy_dataset.elements[ELEMENT_COLS.ETYPE] == "image").sum() == 100
+
+
+def test_stats(dummy_dataset):
+    stats = dummy_dataset.stats
+    assert stats.n_samples == 100
+    assert stats.n_elements == 200
+    assert stats.etype_counts == {"class_label": 100, "image": 100}
+    assert stats.category_counts == {"obj": 200}
+    assert stats.payload_bytes >= 100 * 100 * 100 * 3
+    assert stats.payload_bytes == sum(dummy_dataset.memory_usage().etypes.values())
+    assert dummy_dataset.stats is stats
+
+
+def test_stats_derived(dummy_dataset, dummy_dataset_2):
+    dummy_dataset.stats, dummy_dataset_2.stats
+    derived = [
+        dummy_dataset.select(lambda df: df.element_type == "image"),
+        dummy_dataset.sort("element_type"),
+        dummy_dataset.assign(foo=1),
+        dummy_dataset.merge(dummy_dataset_2),
+        Dataset.concat([dummy_dataset, dummy_dataset_2]),
+    ]
+    for ds in derived:
+        assert ds.stats == Dataset(ds.elements).stats
+    assert derived[0].stats.etype_counts == {"image": 100}
+    assert derived[3].stats.n_samples == 150
+
+
+def test_repr_reads_stats(dummy_dataset, mocker):
+    sizeof = mocker.spy(PayloadSizer, "sizeof")
+    repr(dummy_dataset)
+    sizeof.assert_not_called()  # payloads are only measured when `stats` is read
+    assert dummy_dataset._stats.payload_bytes is None
+    groupby = mocker.spy(pd.DataFrame, "groupby")
+    repr(dummy_dataset)
+    groupby.assert_not_called()
+    assert dummy_dataset.stats.n_elements == 200 and dummy_dataset.stats.payload_bytes is not None
+
+
+def test_stats_derived_with_shared_buffers():
+    images = np.zeros((100, 32, 32, 3), dtype="uint8")
+    builder = ElementTableBuilder()
+    builder.extend_columns(
+        element_id=range(100), sample_id=range(100), etype="image", url_or_data=images, category="obj"
+    )
+    ds = Dataset(builder.build())
+    assert ds.stats.payload_bytes >= images.nbytes
+    derived = [
+        ds.select(lambda df: df.index.get_level_values("sample_id") > 0),
+        ds.sort("sample_id", ascending=False),
+        ds.select(lambda df: df.index.get_level_values("sample_id") < 50).merge(
+            ds.select(lambda df: df.index.get_level_values("sample_id") >= 50)
+        ),
+    ]
+    for derived_ds in derived:
+        assert derived_ds.stats == Dataset(derived_ds.elements).stats
+        assert derived_ds.stats.payload_bytes >= images.nbytes
+
+
+def _image_element(element_id, sample_id):
+    return Element(
+        element_id=element_id,
+        sample_id=sample_id,
+        etype="image",
+        load_mechanism=LoadMechanism(np.zeros((2, 2, 3), dtype="uint8"), category="obj"),
+    )
+
+
+def test_append_elements(dummy_dataset):
+    dummy_dataset.stats
+    dummy_dataset.append_elements([_image_element(f"new_{i}", 100 + i) for i in range(5)])
+    dummy_dataset.append_elements([_image_element("extra_0", 0)])
+    assert len(dummy_dataset._pending) == 2
+    assert len(dummy_dataset) == 105
+    assert dummy_dataset._pending == []
+    rebuilt = Dataset(dummy_dataset.elements)
+    assert dummy_dataset.sample_ids == rebuilt.sample_ids
+    assert dummy_dataset.stats == rebuilt.stats
+    assert len(dummy_dataset.get(0)) == 3
+    assert dummy_dataset.iget(-1).id == 104
+
+
+def test_append_to_derived_dataset_with_stats(dummy_dataset, dummy_dataset_2):
+    repr(dummy_dataset), repr(dummy_dataset_2)
+    for ds in [dummy_dataset.sort("element_type"), dummy_dataset.merge(dummy_dataset_2)]:
+        assert ds._stats is not None and ds._sample_index is None
+        ds.append_elements([_image_element("new_0", 1000)])
+        assert ds.stats == Dataset(ds.elements).stats
+
+
+def test_append_duplicate_elements(dummy_dataset):
+    with pytest.raises(AssertionError):
+        dummy_dataset.append_elements([_image_element(0, 0)])
+    with pytest.raises(AssertionError):
+        dummy_dataset.append_elements([_image_element("new", 200), _image_element("new", 201)])
+    dummy_dataset.append_elements([_image_element("new", 200)])
+    with pytest.raises(AssertionError):
+        dummy_dataset.append_elements([_image_element("new", 201)])
+
+
+def test_append_compaction_threshold(dummy_dataset, mocker):
+    mocker.patch.object(Dataset, "_append_compaction_threshold", 3)
+    dummy_dataset.append_elements([_image_element(f"new_{i}", 100 + i) for i in range(2)])
+    assert len(dummy_dataset._pending) == 1
+    dummy_dataset.append_elements([_image_element("new_2", 102)])
+    assert dummy_dataset._pending == []
+    assert len(dummy_dataset._elements) == 203
+
+
+def test_aggregate_samples(dummy_dataset, mocker):
+    spy = mocker.spy(Dataset, "_sample_from_rows")
+    dummy_dataset = dummy_dataset.assign(weight=np.arange(200) % 3)
+    stats = dummy_dataset.aggregate_samples(
+        n_elements=("element_type", "size"),
+        weight=("weight", "sum"),
+        max_weight=("weight", np.maximum),
+        n_images=("element_type", lambda etypes: (etypes == "image").sum()),
+    )
+    assert spy.call_count == 0
+    assert stats.index.to_list() == dummy_dataset.sample_ids
+    assert stats.index.name == ELEMENT_COLS.SAMPLE_ID
+    assert (stats["n_elements"] == 2).all()
+    assert (stats["n_images"] == 1).all()
+    weights = (np.arange(200) % 3).reshape(100, 2)
+    assert stats["weight"].to_list() == weights.sum(axis=1).tolist()
+    assert stats["max_weight"].to_list() == weights.max(axis=1).tolist()
+
+    labels = dummy_dataset.aggregate_samples(where=lambda df: df.element_type == "class_label", n=("weight", np.add))
+    assert labels["n"].to_list() == weights[:, 1].tolist()
+
+
+def test_categorical_type_columns(dummy_dataset):
+    for col in [ELEMENT_COLS.ETYPE, ELEMENT_COLS.LOAD_MECHANISM.CATEGORY]:
+        assert isinstance(dummy_dataset.elements[col].dtype, pd.CategoricalDtype)
+    assert dummy_dataset.get(0).elements["image"][0].etype == "image"
+
+    dummy_dataset.append_elements([_image_element("new_0", 100)])
+    etypes = dummy_dataset.elements[ELEMENT_COLS.ETYPE]
+    assert isinstance(etypes.dtype, pd.CategoricalDtype)
+    assert etypes.cat.categories.to_list() == ["class_label", "image"]
+
+
+def test_encode_ids(dummy_dataset):
+    dummy_dataset.sample_ids
+    dummy_dataset = dummy_dataset.sort(ELEMENT_COLS.ETYPE)
+    encoded, codes = dummy_dataset.encode_ids()
+    for level in [ELEMENT_COLS.SAMPLE_ID, ELEMENT_COLS.ID]:
+        assert encoded.elements.index.get_level_values(level).dtype == np.int64
+    assert encoded.sample_ids == list(range(100))
+    assert codes.decode(ELEMENT_COLS.SAMPLE_ID, encoded.sample_ids).to_list() == dummy_dataset.sample_ids
+
+    (code,) = codes.encode(ELEMENT_COLS.ID, ["label_7"])
+    sample = encoded.get(codes.encode(ELEMENT_COLS.SAMPLE_ID, [7])[0])
+    assert code in [e.id for e in sample.elements["class_label"]]
+
+    decoded = encoded.decode_ids(codes)
+    pd.testing.assert_frame_equal(decoded.elements, dummy_dataset.elements)
+    assert decoded.sample_ids == dummy_dataset.sample_ids
+
+
+def test_memory_usage_shared_buffers():
+    images = np.zeros((10, 32, 32, 3), dtype="uint8")
+    label = ClassLabel(class_idx=1, class_name="cat")
+    builder = ElementTableBuilder()
+    builder.extend_columns(element_id=range(10), sample_id=range(10), etype="image", url_or_data=images, category="obj")
+    builder.extend_columns(
+        element_id=[f"label_{i}" for i in range(10)],
+        sample_id=range(10),
+        etype="class_label",
+        url_or_data=[label] * 10,
+        category="obj",
+    )
+    ds = Dataset(builder.build())
+    usage = ds.memory_usage()
+    # ten views into one array: the buffer is counted once, not once per view
+    assert images.nbytes <= usage.etypes["image"] < 2 * images.nbytes
+    assert usage.etypes["class_label"] < 1000
+    assert usage.categories == {"obj": usage.etypes["image"] + usage.etypes["class_label"]}
+    assert usage.columns[ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA] == sum(usage.etypes.values()) + 20 * 8
+    assert usage.total == sum(usage.columns.values())
+
+    shallow = ds.memory_usage(deep=False)
+    assert shallow.columns[ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA] == 20 * 8
+    assert shallow.total < images.nbytes
+
+
+def test_memory_usage_copies(dummy_dataset):
+    usage = dummy_dataset.memory_usage()
+    assert usage.etypes["image"] >= 100 * 100 * 100 * 3
+    assert set(usage.columns) == {"Index", *dummy_dataset.elements.columns}
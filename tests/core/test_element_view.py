@@ -0,0 +1,68 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.element.element import Element
+from bridge.primitives.element.element_view import ElementRows
+
+
+@pytest.fixture
+def rows(dummy_singular_dataset):
+    return ElementRows(dummy_singular_dataset.elements)
+
+
+def test_view_decodes_fields_when_read(rows):
+    view = rows.views(0, 1)[0]
+    assert isinstance(view, Element)
+    assert not hasattr(view, "__dict__")
+    assert object.__getattribute__(view, "_etype") == "image"
+    with pytest.raises(AttributeError):
+        object.__getattribute__(view, "_metadata")
+    assert view.metadata_value("width") == 8
+    with pytest.raises(AttributeError):
+        object.__getattribute__(view, "_metadata")
+    assert view.to_dict() == Element.from_dict(view.to_dict()).to_dict()
+    assert view.id == "img_0"
+    assert view.metadata["width"] == 8
+    assert isinstance(view.data, np.ndarray)
+
+
+def test_view_metadata_value_after_decoding(rows):
+    view = rows.views(0, 1)[0]
+    view.metadata["width"] = 100
+    assert view.metadata_value("width") == 100
+    assert view.metadata_value("missing", 1) == 1
+
+
+def test_view_schema_is_validated_per_block(dummy_singular_dataset):
+    with pytest.raises(AssertionError):
+        ElementRows(dummy_singular_dataset.elements.drop(columns="category"))
+
+
+def test_pickled_view_is_an_element(rows):
+    view = rows.views(20, 21)[0]
+    element = pickle.loads(pickle.dumps(view))
+    assert type(element) is Element
+    assert element.to_dict().keys() == view.to_dict().keys()
+    assert element.id == view.id
+
+
+def test_view_type_builds_regular_elements(rows):
+    view = rows.views(0, 1)[0]
+    element = type(view)(
+        element_id="new", etype="image", load_mechanism=LoadMechanism(None, "obj"), sample_id=0, metadata={"width": 1}
+    )
+    assert element.id == "new"
+    assert element.metadata_value("width") == 1
+
+
+def test_view_data_updates_cache(dummy_singular_dataset, tmp_path):
+    cache = CacheMechanism(root_uri=URIComponents(path=str(tmp_path)))
+    rows = ElementRows(dummy_singular_dataset.elements)
+    view = rows.views(0, 1, cache_mechanisms={"image": cache})[0]
+    assert np.array_equal(view.data, np.zeros((8, 8, 3)))
+    assert isinstance(view.to_dict()["data"], URIComponents)
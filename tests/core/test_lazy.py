@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bridge.primitives.dataset import Dataset
+from bridge.primitives.dataset.lazy import Assign, Select, Sort, optimize, rowwise
+from bridge.primitives.dataset.singular_dataset import SingularElementsTable
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.element import Element
+from bridge.utils.constants import ELEMENT_COLS
+
+
+@pytest.fixture
+def dummy_dataset():
+    elements = []
+    for i in range(50):
+        for etype in ["image", "class_label"]:
+            elements.append(
+                Element(
+                    element_id=f"{etype}_{i}",
+                    sample_id=i,
+                    etype=etype,
+                    load_mechanism=LoadMechanism(url_or_data=i, category="obj"),
+                    metadata={"score": (i * 7) % 50},
+                )
+            )
+    return Dataset.from_elements(elements)
+
+
+@rowwise
+def is_image(df):
+    return df[ELEMENT_COLS.ETYPE] == "image"
+
+
+def test_optimize_fuses_selects():
+    plan = optimize([Select((is_image,)), Select((is_image,))])
+    assert len(plan) == 1 and len(plan[0].selectors) == 2
+
+
+def test_optimize_pushes_select_before_sort():
+    plan = optimize([Sort("score"), Select((is_image,)), Sort("score"), Select((is_image,))])
+    assert [type(node) for node in plan] == [Select, Sort, Sort]
+
+
+def test_optimize_keeps_order_dependent_select_after_sort():
+    head = Select((lambda df: df.index[:3],))
+    assert optimize([Sort("score"), head]) == [Sort("score"), head]
+
+
+def test_lazy_sort_then_head_matches_eager(dummy_dataset):
+    def head(df):
+        return df.index[:3]
+
+    eager = dummy_dataset.sort("score", ascending=False).select(head)
+    lazy = dummy_dataset.lazy().sort("score", ascending=False).select(head)
+    assert lazy.elements["score"].tolist() == [49, 49, 48]
+    pd.testing.assert_frame_equal(lazy.elements, eager.elements)
+
+
+def test_optimize_keeps_select_after_non_rowwise_assign():
+    plan = [Assign({"rank": lambda df: df.score.rank()}), Select((is_image,), columns=frozenset({"element_type"}))]
+    assert optimize(plan) == plan
+
+
+def test_optimize_keeps_select_reading_assigned_column():
+    plan = [Assign({"double": rowwise(lambda df: df.score * 2)}), Select((is_image,), columns=frozenset({"double"}))]
+    assert optimize(plan) == plan
+
+
+def test_optimize_pushes_select_before_rowwise_assign():
+    assign = Assign({"double": rowwise(lambda df: df.score * 2)})
+    select = Select((is_image,), columns=frozenset({"element_type"}))
+    assert optimize([assign, select]) == [select, assign]
+
+
+def test_lazy_matches_eager(dummy_dataset):
+    eager = (
+        dummy_dataset.sort("score")
+        .select(lambda df: df.score > 10)
+        .assign(double=lambda df: df.score * 2)
+        .select(lambda df: df[ELEMENT_COLS.ETYPE] == "image")
+    )
+    lazy = (
+        dummy_dataset.lazy()
+        .sort("score")
+        .select(rowwise(lambda df: df.score > 10), columns=["score"])
+        .assign(double=rowwise(lambda df: df.score * 2))
+        .select(is_image, columns=[ELEMENT_COLS.ETYPE])
+    )
+    assert [type(node) for node in lazy.optimized_plan] == [Select, Sort, Assign]
+    pd.testing.assert_frame_equal(lazy.elements, eager.elements)
+    assert len(lazy) == len(eager)
+    assert lazy.iget(0).id == eager.iget(0).id
+
+
+def test_lazy_does_not_run_until_requested(dummy_dataset, mocker):
+    spy = mocker.spy(Dataset, "_apply_plan")
+    lazy = dummy_dataset.lazy().select(is_image).sort("score")
+    assert "Select[elements]" in lazy.explain() and "Sort[elements]" in lazy.explain()
+    spy.assert_not_called()
+    _ = [sample.id for sample in lazy]
+    _ = len(lazy)
+    spy.assert_called_once()
+
+
+def test_lazy_singular_matches_eager(dummy_singular_dataset):
+    ds = dummy_singular_dataset
+    eager = (
+        ds.sort_annotations("area", ascending=False)
+        .select_samples(lambda s, a: s.width > 12)
+        .select_samples(lambda s, a: s.width < 25)
+        .assign_annotations(double=lambda s, a: a.area * 2)
+    )
+    lazy = (
+        ds.lazy()
+        .sort_annotations("area", ascending=False)
+        .select_samples(rowwise(lambda s, a: s.width > 12), columns=["width"])
+        .select_samples(rowwise(lambda s, a: s.width < 25), columns=["width"])
+        .assign_annotations(double=lambda s, a: a.area * 2)
+    )
+    assert [type(node) for node in lazy.optimized_plan] == [Select, Sort, Assign]
+    pd.testing.assert_frame_equal(lazy.samples, eager.samples)
+    pd.testing.assert_frame_equal(lazy.annotations, eager.annotations)
+    assert np.array_equal(lazy.collect().sample_ids, eager.sample_ids)
+
+
+def test_lazy_singular_prunes_with_annotation_index(dummy_singular_dataset, mocker):
+    ds = dummy_singular_dataset.sort_annotations("category_id")
+    lazy = ds.lazy().select_samples(lambda s, a: s.width % 2 == 1).assign_samples(flag=1)
+    take = mocker.spy(SingularElementsTable, "take_samples")
+    isin = mocker.spy(pd.Index, "isin")
+    collected = lazy.collect()
+    take.assert_called_once()
+    isin.assert_not_called()
+    eager = ds.select_samples(lambda s, a: s.width % 2 == 1)
+    pd.testing.assert_frame_equal(collected.annotations, eager.annotations)
+    assert collected.sample_ids == eager.sample_ids
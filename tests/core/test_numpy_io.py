@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from bridge.primitives.element.data import category_registry
+from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+from bridge.primitives.element.data.data_io import NumpyDataIO, NumpyStackDataIO
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.element.element import Element
+
+
+@pytest.fixture
+def arrays():
+    return [np.random.default_rng(i).normal(size=(4, 3)).astype(np.float32) for i in range(5)]
+
+
+def test_store_and_load_memory_mapped(tmp_path, arrays):
+    load_mechanism = category_registry.store(arrays[0], URIComponents(path=f"{tmp_path}/a/features"), "numpy")
+    loaded = load_mechanism.load_data()
+    assert isinstance(loaded, np.memmap) and not loaded.flags.writeable
+    np.testing.assert_array_equal(loaded, arrays[0])
+
+
+def test_load_into_memory(tmp_path, arrays, mocker):
+    load_mechanism = NumpyDataIO.store(arrays[0], URIComponents(path=f"{tmp_path}/features.npy"))
+    mocker.patch.object(NumpyDataIO, "mmap_mode", None)
+    loaded = NumpyDataIO.load_many([load_mechanism.url_or_data])[0]
+    assert not isinstance(loaded, np.memmap) and loaded.flags.writeable
+    np.testing.assert_array_equal(loaded, arrays[0])
+
+
+def test_cache_mechanism_stores_numpy(tmp_path, arrays):
+    element = Element("mask_0", "mask", LoadMechanism(arrays[0], "numpy"), 0)
+    load_mechanism = CacheMechanism(URIComponents(path=str(tmp_path))).store(element, arrays[0])
+    assert load_mechanism.url_or_data.path == f"{tmp_path}/mask_0.npy"
+    np.testing.assert_array_equal(load_mechanism.load_data(), arrays[0])
+
+
+def test_stack_rows(tmp_path, arrays):
+    url = URIComponents(path=f"{tmp_path}/stack.npy")
+    load_mechanisms = NumpyStackDataIO.store_many(arrays, url)
+    assert np.load(url.path).shape == (5, 4, 3)
+    assert str(load_mechanisms[3].url_or_data) == f"{tmp_path}/stack.npy?row=3"
+    rows = category_registry.load_many([lm.url_or_data for lm in load_mechanisms], "numpy_stack")
+    for row, array in zip(rows, arrays):
+        np.testing.assert_array_equal(row, array)
+    assert rows[0].base is rows[4].base  # one mapping per file
+
+    category_registry.store(np.zeros((4, 3), dtype=np.float32), load_mechanisms[1].url_or_data, "numpy_stack")
+    np.testing.assert_array_equal(load_mechanisms[1].load_data(), np.zeros((4, 3)))
+    np.testing.assert_array_equal(load_mechanisms[2].load_data(), arrays[2])
+
+
+def test_restack_keeps_mapped_rows_valid(tmp_path, arrays):
+    url = URIComponents(path=f"{tmp_path}/stack.npy")
+    old_row = NumpyStackDataIO.store_many(arrays, url)[4].load_data()
+    new_rows = NumpyStackDataIO.store_many(arrays[:2], url)
+    np.testing.assert_array_equal(old_row, arrays[4])
+    np.testing.assert_array_equal(new_rows[1].load_data(), arrays[1])
+
+
+def test_stack_shape_mismatch(tmp_path, arrays):
+    with pytest.raises(AssertionError):
+        NumpyStackDataIO.store_many([arrays[0], np.zeros(3)], URIComponents(path=f"{tmp_path}/stack.npy"))
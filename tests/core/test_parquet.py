@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from bridge.primitives.dataset import Dataset, SingularDataset
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.element import Element
+from bridge.utils.data_objects import BoundingBox, ClassLabel
+
+pytest.importorskip("pyarrow")
+
+
+def test_parquet_roundtrip(tmp_path, dummy_dataset):
+    dummy_dataset.to_parquet(tmp_path / "ds.parquet")
+    ds = Dataset.read_parquet(tmp_path / "ds.parquet")
+    assert ds.sample_ids == dummy_dataset.sample_ids
+    sample, expected = ds.iget(3), dummy_dataset.iget(3)
+    assert np.array_equal(sample.elements["image"][0].data, expected.elements["image"][0].data)
+    label = sample.elements["class_label"][0].data
+    assert isinstance(label, ClassLabel)
+    assert label == expected.elements["class_label"][0].data
+
+
+def test_parquet_uris_and_metadata(tmp_path):
+    elements = [
+        Element(
+            f"img_{i}",
+            "image",
+            LoadMechanism.from_url_string(f"/images/{i}.jpg", "image"),
+            sample_id=i,
+            metadata={"width": 10 * i, "tags": ["a", 1] if i % 2 else None},
+        )
+        for i in range(6)
+    ]
+    ds = Dataset.from_elements(elements)
+    ds.to_parquet(tmp_path / "ds.parquet")
+    loaded = Dataset.read_parquet(tmp_path / "ds.parquet")
+    assert [str(url) for url in loaded.elements["data"]] == [f"/images/{i}.jpg" for i in range(6)]
+    assert loaded.elements["tags"].tolist() == ds.elements["tags"].tolist()
+
+    projected = Dataset.read_parquet(tmp_path / "ds.parquet", columns=["width"], filters=[("width", ">=", 30)])
+    assert "tags" not in projected.elements.columns
+    assert projected.sample_ids == [3, 4, 5]
+
+
+def test_singular_parquet(tmp_path, dummy_singular_dataset):
+    dummy_singular_dataset.to_parquet(tmp_path / "ds")
+    ds = SingularDataset.read_parquet(tmp_path / "ds")
+    assert ds.sample_ids == dummy_singular_dataset.sample_ids
+    assert ds.samples.columns.tolist() == dummy_singular_dataset.samples.columns.tolist()
+    box = ds.get(3).annotations["bbox"][2].data
+    assert isinstance(box, BoundingBox)
+    assert box.coords.tolist() == [0, 0, 3, 3]
+    assert box.class_label == ClassLabel(2)
+
+    filtered = SingularDataset.read_parquet(
+        tmp_path / "ds", filters=[("width", "<", 12)], annotations_filters=[("area", ">", 1)]
+    )
+    assert filtered.sample_ids == [0, 1, 2, 3]
+    assert sorted(filtered.annotations.index.get_level_values("element_id")) == ["bbox_2_1", "bbox_3_1", "bbox_3_2"]
+
+
+def test_parquet_bbox_coords_dtype(tmp_path):
+    coords = [np.array([1, 2, 3, 4], dtype=np.int32)] * 3 + [np.array([0.5, 1, 2, 3], dtype=np.float32)]
+    elements = [
+        Element(f"bbox_{i}", "bbox", LoadMechanism(BoundingBox(c, class_label=ClassLabel(i)), "obj"), sample_id=i)
+        for i, c in enumerate(coords)
+    ]
+    ds = Dataset.from_elements(elements)
+    ds.to_parquet(tmp_path / "ds.parquet")
+    loaded = Dataset.read_parquet(tmp_path / "ds.parquet").elements["data"].tolist()
+    assert [box.coords.dtype for box in loaded] == [np.int32] * 3 + [np.float32]
+    for box, expected in zip(loaded, ds.elements["data"]):
+        np.testing.assert_array_equal(box.coords, expected.coords)
+        assert box.class_label == expected.class_label
@@ -0,0 +1,230 @@
+import functools
+import os
+import subprocess
+import sys
+from types import FunctionType
+
+import numpy as np
+import pytest
+
+from bridge.primitives.dataset import ResultCache
+from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.fingerprint import fingerprint
+from bridge.primitives.sample import Sample
+from bridge.primitives.sample.transform import BatchSampleTransform, SampleBatch, SampleTransform
+from bridge.utils.data_objects import BoundingBox
+
+CALLS = []
+
+
+class ScaleBoxes(SampleTransform):
+    def __init__(self, scale: float, seed: int = 0):
+        self.scale = scale
+        self.seed = seed
+
+    def __call__(self, sample, cache_mechanisms, display_engine):
+        CALLS.append(sample.id)
+        elements = []
+        for e_list in sample.elements.values():
+            for element in e_list:
+                if element.etype == "bbox":
+                    box = BoundingBox(element.data.coords * self.scale, class_label=element.data.class_label)
+                    provider = cache_mechanisms["bbox"].store(element, box, should_update_elements=False)
+                    element = type(element)(
+                        element_id=element.id,
+                        etype=element.etype,
+                        load_mechanism=provider,
+                        sample_id=element.sample_id,
+                        metadata=element.metadata,
+                    )
+                elements.append(element)
+        return Sample(elements, display_engine=display_engine)
+
+
+class AddOne(BatchSampleTransform):
+    batch_size = 8
+
+    def __init__(self):
+        self.batch_lengths = []
+
+    def __call__(self, samples, cache_mechanisms, display_engine):
+        self.batch_lengths.append(len(samples))
+        batch = SampleBatch(samples, cache_mechanisms, display_engine)
+        for group in batch.stack("image"):
+            batch.update_stacked(group, group.data + 1)
+        return batch.to_samples()
+
+    def fingerprint(self) -> str:
+        return "add-one"
+
+
+def test_transform_fingerprint():
+    assert ScaleBoxes(2).fingerprint() == ScaleBoxes(2).fingerprint()
+    assert ScaleBoxes(2).fingerprint() != ScaleBoxes(3).fingerprint()
+    assert ScaleBoxes(2, seed=0).fingerprint() != ScaleBoxes(2, seed=1).fingerprint()
+
+
+def _scale(x, s):
+    return x * s
+
+
+def _shift(x, s):
+    return x + s
+
+
+def _make_scale(s):
+    return lambda x: x * s
+
+
+def _scale_with_default(x, s=2):
+    return x * s
+
+
+def test_callable_fingerprints_dont_collide():
+    assert fingerprint(functools.partial(_scale, s=2)) == fingerprint(functools.partial(_scale, s=2))
+    assert fingerprint(functools.partial(_scale, s=2)) != fingerprint(functools.partial(_shift, s=3))
+    assert fingerprint(functools.partial(_scale, s=2)) != fingerprint(functools.partial(_scale, s=3))
+    assert fingerprint(functools.partial(_scale, 2)) != fingerprint(functools.partial(_scale, 3))
+    assert fingerprint(_make_scale(2)) == fingerprint(_make_scale(2))
+    assert fingerprint(_make_scale(2)) != fingerprint(_make_scale(3))
+    other_default = FunctionType(_scale_with_default.__code__, globals(), "_scale_with_default", (3,))
+    assert fingerprint(_scale_with_default) != fingerprint(other_default)
+
+
+def test_unidentifiable_object_fingerprint_raises():
+    class Opaque:
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        fingerprint(Opaque())
+
+
+def test_dataset_fingerprint(dummy_dataset):
+    fingerprint = dummy_dataset.fingerprint()
+    assert len(fingerprint) == 32
+    assert dummy_dataset.select(lambda df: df.index).fingerprint() == fingerprint
+    assert dummy_dataset.assign(extra=1).fingerprint() != fingerprint
+
+
+FINGERPRINT_SCRIPT = """
+from bridge.primitives.dataset import Dataset
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
+
+builder = ElementTableBuilder()
+for i in range(3):
+    # a set's iteration order, and so the order columns are added in, depends on PYTHONHASHSEED
+    metadata = {name: i for name in {"zeta", "alpha", "mid", "omega", "beta"}}
+    builder.append(element_id=i, sample_id=i, etype="box", url_or_data=i, category="obj", **metadata)
+print(Dataset(builder.build()).fingerprint())
+"""
+
+
+def test_dataset_fingerprint_is_stable_across_processes():
+    digests = set()
+    for seed in ["1", "2", "3"]:
+        env = {**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": os.pathsep.join(sys.path)}
+        process = subprocess.run(
+            [sys.executable, "-c", FINGERPRINT_SCRIPT], env=env, capture_output=True, text=True, check=True
+        )
+        digests.add(process.stdout.strip())
+    assert len(digests) == 1
+
+
+def test_load_source_fingerprint_tracks_file(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("a")
+    load_mechanism = LoadMechanism(URIComponents(path=str(path)), category="text")
+    before = load_mechanism.fingerprint()
+    assert LoadMechanism(URIComponents(path=str(path)), category="text").fingerprint() == before
+    path.write_text("ab")
+    assert load_mechanism.fingerprint() != before
+
+
+def test_transform_samples_skips_cached(dummy_singular_dataset, tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite")
+    CALLS.clear()
+    first = dummy_singular_dataset.transform_samples(ScaleBoxes(2), result_cache=cache)
+    assert len(CALLS) == 20
+    assert len(cache) == 20
+
+    CALLS.clear()
+    second = dummy_singular_dataset.transform_samples(ScaleBoxes(2), result_cache=cache)
+    assert CALLS == []
+    assert second.sample_ids == first.sample_ids
+    assert [box.data.coords.tolist() for box in second.get(3).annotations["bbox"]] == [
+        [0, 0, 2, 2],
+        [0, 0, 4, 4],
+        [0, 0, 6, 6],
+    ]
+    assert second.annotations["area"].to_list() == first.annotations["area"].to_list()
+
+    dummy_singular_dataset.transform_samples(ScaleBoxes(3), result_cache=cache)
+    assert len(CALLS) == 20
+
+
+def test_transform_samples_recomputes_changed_samples(dummy_singular_dataset, tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite")
+    dummy_singular_dataset.transform_samples(ScaleBoxes(2), result_cache=cache)
+    changed = dummy_singular_dataset.assign(area=lambda df: df["area"].where(df.index.get_level_values(0) != 5, 0))
+    CALLS.clear()
+    changed.transform_samples(ScaleBoxes(2), result_cache=cache)
+    assert CALLS == [5]
+
+
+def test_result_cache_drops_missing_payloads(dummy_singular_dataset, tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite")
+    cache_mechanisms = {"bbox": CacheMechanism(root_uri=URIComponents(path=str(tmp_path / "boxes")))}
+    dummy_singular_dataset.transform_samples(ScaleBoxes(2), cache_mechanisms=cache_mechanisms, result_cache=cache)
+    os.remove(tmp_path / "boxes" / "bbox_3_0.pkl")
+    CALLS.clear()
+    ds = dummy_singular_dataset.transform_samples(ScaleBoxes(2), cache_mechanisms=cache_mechanisms, result_cache=cache)
+    assert CALLS == [3]
+    assert os.path.exists(tmp_path / "boxes" / "bbox_3_0.pkl")
+    assert all(isinstance(url, URIComponents) for url in ds.annotations["data"])
+
+
+def test_batch_transform_result_cache(dummy_singular_dataset, tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite")
+    dummy_singular_dataset.select(lambda df: df.index.get_level_values(0) < 10).transform_samples(
+        AddOne(), result_cache=cache
+    )
+    transform = AddOne()
+    ds = dummy_singular_dataset.transform_samples(transform, result_cache=cache)
+    assert transform.batch_lengths == [8, 2]
+    assert np.array_equal(ds.get(3).data, np.ones((8, 8, 3)))
+    assert np.array_equal(ds.get(13).data, np.ones((8, 8, 3)))
+
+
+def test_albumentations_transform_result_cache(dummy_dataset, tmp_path):
+    A = pytest.importorskip("albumentations")
+    from bridge.primitives.sample.transform.vision import AlbumentationsCompose
+
+    transform = AlbumentationsCompose([A.Resize(16, 16), A.HorizontalFlip(p=1.0)])
+    assert transform.fingerprint() == AlbumentationsCompose([A.Resize(16, 16), A.HorizontalFlip(p=1.0)]).fingerprint()
+    assert transform.fingerprint() != AlbumentationsCompose([A.Resize(16, 16)]).fingerprint()
+
+    images = dummy_dataset.select(lambda df: df["element_type"] == "image")
+    cache = ResultCache(tmp_path / "results.sqlite")
+    cache_mechanisms = {"image": CacheMechanism(root_uri=URIComponents(path=str(tmp_path / "images")))}
+    first = images.transform_samples(transform, cache_mechanisms=cache_mechanisms, result_cache=cache)
+    assert len(cache) == 100
+    second = images.transform_samples(transform, cache_mechanisms=cache_mechanisms, result_cache=cache)
+    assert second.elements["data"].to_list() == first.elements["data"].to_list()
+    assert second.get(3).data["image"][0].shape == (16, 16, 3)
+
+
+def test_unfingerprintable_transform_skips_result_cache(dummy_singular_dataset, tmp_path):
+    class Nested(ScaleBoxes):
+        def __init__(self):
+            super().__init__(2)
+            self.nested = functools.reduce(lambda inner, _: [inner], range(20), [])
+
+    cache = ResultCache(tmp_path / "results.sqlite")
+    CALLS.clear()
+    with pytest.warns(UserWarning, match="result cache"):
+        ds = dummy_singular_dataset.transform_samples(Nested(), result_cache=cache)
+    assert len(CALLS) == 20
+    assert len(cache) == 0
+    assert ds.sample_ids == dummy_singular_dataset.sample_ids
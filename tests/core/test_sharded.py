@@ -0,0 +1,103 @@
+import functools
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bridge.primitives.dataset import Dataset, SingularDataset
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.element.element import Element
+from bridge.primitives.sample.transform import SampleTransform
+from bridge.utils import pmap
+
+pytest.importorskip("pyarrow")
+
+
+class IdentityTransform(SampleTransform):
+    def __call__(self, sample, cache_mechanisms, display_engine):
+        return sample
+
+
+def sample_id_and_size(sample):
+    return sample.id, len(sample)
+
+
+def test_sharded_roundtrip(tmp_path, dummy_dataset):
+    dummy_dataset.to_sharded(tmp_path / "ds", n_shards=3)
+    manifest = json.loads((tmp_path / "ds" / "manifest.json").read_text())
+    assert [shard["n_samples"] for shard in manifest["shards"]] == [33, 33, 34]
+    assert sum(shard["n_rows"]["elements"] for shard in manifest["shards"]) == 200
+
+    ds = Dataset.load_sharded(tmp_path / "ds")
+    assert ds._loaded_shard is None
+    assert len(ds) == 100
+    assert ds.sample_ids == dummy_dataset.sample_ids
+    sample = ds.iget(50)
+    assert ds._loaded_shard[0] == 1
+    expected = dummy_dataset.iget(50)
+    assert np.array_equal(sample.elements["image"][0].data, expected.elements["image"][0].data)
+    assert sample.elements["class_label"][0].data == expected.elements["class_label"][0].data
+    assert ds.get(99).id == 99
+    assert [s.id for s in ds] == dummy_dataset.sample_ids
+    assert ds.stats.etype_counts == dummy_dataset.stats.etype_counts
+    with pytest.raises(TypeError, match="read-only"):
+        ds.append_elements([])
+
+
+@pytest.mark.parametrize("fixture", ["dummy_dataset", "dummy_singular_dataset"])
+def test_sharded_stats_from_manifest(tmp_path, fixture, request):
+    request.getfixturevalue(fixture).to_sharded(tmp_path / "ds", n_shards=3)
+    ds = Dataset.load_sharded(tmp_path / "ds")
+    assert repr(ds).startswith("ShardedDataset: ")
+    stats = ds.stats
+    assert ds._loaded_shard is None and ds._unified is None  # read from the manifest alone
+    assert stats == Dataset(ds.elements).stats
+
+
+def test_sharded_uris(tmp_path):
+    elements = [
+        Element(i, "image", LoadMechanism(URIComponents.from_str(f"/images/{i}.jpg"), "image"), sample_id=i)
+        for i in range(10)
+    ]
+    Dataset.from_elements(elements).to_sharded(tmp_path / "ds", n_shards=2)
+    ds = Dataset.load_sharded(tmp_path / "ds")
+    assert ds.elements["data"].tolist() == [URIComponents.from_str(f"/images/{i}.jpg") for i in range(10)]
+
+
+def test_sharded_singular(tmp_path, dummy_singular_dataset):
+    dummy_singular_dataset.to_sharded(tmp_path / "ds", n_shards=4)
+    ds = Dataset.load_sharded(tmp_path / "ds")
+    assert isinstance(ds.shard(0), SingularDataset)
+    sample = ds.get(7)
+    assert sample.element.id == "img_7"
+    assert [box.metadata["area"] for box in sample.annotations["bbox"]] == [1, 4, 9]
+
+
+def test_sharded_parallel(tmp_path, dummy_singular_dataset):
+    dummy_singular_dataset.to_sharded(tmp_path / "ds", n_shards=4)
+    ds = Dataset.load_sharded(tmp_path / "ds")
+    parallel = functools.partial(pmap, n_jobs=2, progress_bar=False)
+    transformed = ds.transform_samples(IdentityTransform(), map_fn=parallel)
+    assert isinstance(transformed, SingularDataset)
+    assert transformed.sample_ids == dummy_singular_dataset.sample_ids
+    assert transformed.samples.index.equals(dummy_singular_dataset.samples.index)
+    assert len(transformed.annotations) == len(dummy_singular_dataset.annotations)
+    outputs = ds.map_samples(sample_id_and_size, map_fn=parallel)
+    assert outputs == [(i, 1 + i % 4) for i in range(20)]
+
+
+def test_sharded_plain_transform_chains_shards(tmp_path, dummy_dataset):
+    dummy_dataset.to_sharded(tmp_path / "ds", n_shards=3)
+    transformed = Dataset.load_sharded(tmp_path / "ds").transform_samples(IdentityTransform())
+    assert len(transformed.segments) == 3
+    assert transformed.sample_ids == dummy_dataset.sample_ids
+
+
+def test_write_sharded_orphan_annotations(tmp_path, dummy_singular_dataset):
+    annotations = dummy_singular_dataset.annotations
+    orphan = annotations.iloc[:1].rename(index=lambda i: f"{i}_orphan", level=1).rename(index=lambda i: -1, level=0)
+    ds = SingularDataset(dummy_singular_dataset.samples, pd.concat([annotations, orphan]))
+    with pytest.raises(AssertionError, match="match no sample"):
+        ds.to_sharded(tmp_path / "ds", n_shards=2)
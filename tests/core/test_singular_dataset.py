@@ -0,0 +1,234 @@
+import numpy as np
+import pandas as pd
+
+from bridge.primitives.dataset import SingularDataset
+from bridge.primitives.dataset.singular_dataset import SingularElementsTable
+from bridge.primitives.dataset.sample_index import SampleIndex
+from bridge.primitives.element.data.cache_mechanism import CacheMechanism
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.data.uri_components import URIComponents
+from bridge.primitives.element.element import Element
+from bridge.primitives.sample.singular_sample import SingularSample
+from bridge.primitives.sample.transform import SampleTransform
+from bridge.utils.constants import IS_SAMPLE_COL_NAME
+
+
+def test_iter_singular_samples(dummy_singular_dataset):
+    samples = list(dummy_singular_dataset)
+    assert len(samples) == 20
+    assert all(isinstance(sample, SingularSample) for sample in samples)
+    assert [len(sample.annotations.get("bbox", [])) for sample in samples] == [i % 4 for i in range(20)]
+
+
+def test_get_singular_sample(dummy_singular_dataset):
+    sample = dummy_singular_dataset.get(7)
+    assert isinstance(sample, SingularSample)
+    assert sample.element.id == "img_7"
+    assert len(sample.annotations["bbox"]) == 3
+
+
+class IdentityTransform(SampleTransform):
+    def __call__(self, sample, cache_mechanisms, display_engine):
+        return sample
+
+
+def test_transform_samples_in_chunks(dummy_singular_dataset):
+    chunk_sizes = []
+
+    def recording_map(fn, samples):
+        samples = list(samples)
+        chunk_sizes.append(len(samples))
+        return map(fn, samples)
+
+    ds = dummy_singular_dataset.transform_samples(IdentityTransform(), map_fn=recording_map, chunk_size=8)
+    assert chunk_sizes == [8, 8, 4]
+    assert ds.sample_ids == dummy_singular_dataset.sample_ids
+    assert len(ds.samples) == 20
+    assert len(ds.annotations) == sum(i % 4 for i in range(20))
+    assert "area" not in ds.samples.columns
+    assert "width" not in ds.annotations.columns
+
+
+def test_append(dummy_singular_dataset):
+    image = dummy_singular_dataset.get(0).element
+    box = dummy_singular_dataset.get(1).annotations["bbox"][0]
+    new_image = Element("img_20", image.etype, LoadMechanism(image.data, "obj"), sample_id=20, metadata={"width": 28})
+    new_box = Element("bbox_20_0", box.etype, LoadMechanism(box.data, "obj"), sample_id=20, metadata={"area": 1})
+    dummy_singular_dataset.append([new_image], [new_box])
+    assert len(dummy_singular_dataset) == 21
+    assert dummy_singular_dataset.get(20).element.id == "img_20"
+    assert len(dummy_singular_dataset.get(20).annotations["bbox"]) == 1
+    assert len(dummy_singular_dataset.samples) == 21
+    assert (
+        dummy_singular_dataset.sample_ids
+        == SingularDataset(dummy_singular_dataset.samples, dummy_singular_dataset.annotations).sample_ids
+    )
+
+
+def test_append_elements(dummy_singular_dataset):
+    image = dummy_singular_dataset.get(0).element
+    box = dummy_singular_dataset.get(1).annotations["bbox"][0]
+    new_image = Element(
+        "img_20", image.etype, LoadMechanism(image.data, "obj"), sample_id=20, metadata={IS_SAMPLE_COL_NAME: True}
+    )
+    new_box = Element("bbox_20_0", box.etype, LoadMechanism(box.data, "obj"), sample_id=20, metadata={"area": 1})
+    dummy_singular_dataset.append_elements([new_box, new_image])
+    assert len(dummy_singular_dataset) == 21
+    assert len(dummy_singular_dataset.samples) == 21
+    sample = dummy_singular_dataset.get(20)
+    assert sample.element.id == "img_20"
+    assert [annotation.id for annotation in sample.annotations["bbox"]] == ["bbox_20_0"]
+    assert IS_SAMPLE_COL_NAME not in dummy_singular_dataset.samples.columns
+
+
+def test_append_keeps_sample_index_and_stats(dummy_singular_dataset, mocker):
+    ds = dummy_singular_dataset
+    image = ds.get(0).element
+    box = ds.get(1).annotations["bbox"][0]
+    image_data, box_data = LoadMechanism(image.data, "obj"), LoadMechanism(box.data, "obj")
+    _ = ds.sample_index, ds.stats
+    rebuild = mocker.spy(SingularElementsTable, "sample_index")
+    new_images = [Element(f"img_{i}", image.etype, image_data, sample_id=i) for i in (20, 21)]
+    new_boxes = [Element(f"bbox_{i}_9", box.etype, box_data, sample_id=i, metadata={"area": 1}) for i in (21, 3, 20)]
+    ds.append(new_images, new_boxes)
+    _ = ds.sample_index
+    ds.append([], [Element("bbox_5_9", box.etype, box_data, sample_id=5)])
+    assert len(ds) == 22
+    rebuild.assert_not_called()  # extended rather than rebuilt from the partitions
+    expected = SampleIndex.from_elements(ds.elements)
+    assert ds.sample_ids == expected.sample_ids.to_list()
+    for sample_id in ds.sample_ids:
+        assert ds.sample_index.rows_for_id(sample_id).tolist() == expected.rows_for_id(sample_id).tolist()
+    assert ds.stats == SingularDataset(ds.samples, ds.annotations).stats
+
+
+def test_aggregate_annotations(dummy_singular_dataset, mocker):
+    spy = mocker.spy(SingularSample, "from_rows")
+    stats = dummy_singular_dataset.aggregate_annotations(
+        n_bboxes=("element_type", "size"),
+        total_area=("area", np.add),
+        mean_area=("area", "mean"),
+        max_category=("category_id", np.maximum),
+    )
+    assert spy.call_count == 0
+    assert stats.index.equals(dummy_singular_dataset.samples.index)
+    assert stats["n_bboxes"].to_list() == [i % 4 for i in range(20)]
+    assert stats["total_area"].to_list() == [[0, 1, 5, 14][i % 4] for i in range(20)]
+    assert stats["mean_area"].isna().to_list() == [i % 4 == 0 for i in range(20)]
+    assert stats.loc[3, "mean_area"].item() == 14 / 3
+    assert stats.loc[3, "max_category"].item() == 2
+    assert np.isnan(stats.loc[0, "max_category"].item())
+    dummy_singular_dataset.iget(0)
+    assert spy.call_count == 1  # samples are built through the spied path
+
+    ds = dummy_singular_dataset.sort_samples("width", ascending=False).assign_samples(**stats)
+    assert ds.samples["n_bboxes"].to_list() == [i % 4 for i in reversed(range(20))]
+    assert ds.get(3).element.metadata["n_bboxes"] == 3
+
+
+def test_aggregate_annotations_where(dummy_singular_dataset):
+    stats = dummy_singular_dataset.aggregate_annotations(
+        where=lambda samples, annotations: annotations["category_id"] > 0,
+        n_bboxes=("element_type", "count"),
+    )
+    assert stats["n_bboxes"].to_list() == [max(i % 4 - 1, 0) for i in range(20)]
+
+
+def test_encode_ids(dummy_singular_dataset):
+    encoded, codes = dummy_singular_dataset.encode_ids(levels=["element_id"])
+    assert encoded.sample_ids == dummy_singular_dataset.sample_ids
+    assert encoded.annotations.index.get_level_values("element_id").dtype == np.int64
+    assert codes.decode("element_id", [e.id for e in encoded.get(3).annotations["bbox"]]).to_list() == [
+        "bbox_3_0",
+        "bbox_3_1",
+        "bbox_3_2",
+    ]
+    decoded = encoded.decode_ids(codes)
+    assert decoded.annotations.index.equals(dummy_singular_dataset.annotations.index)
+    assert decoded.samples.index.equals(dummy_singular_dataset.samples.index)
+
+
+def test_views_are_stored_separately(dummy_singular_dataset, mocker):
+    concat = mocker.spy(pd, "concat")
+    ds = dummy_singular_dataset.select_annotations(lambda samples, annotations: annotations["area"] > 1)
+    ds = ds.assign_samples(double_width=lambda samples, annotations: samples["width"] * 2).sort_samples("width")
+    assert concat.call_count == 0
+    assert "area" not in ds.samples.columns
+    assert "width" not in ds.annotations.columns
+    assert "is_example" not in ds.samples.columns
+    assert ds.elements["is_example"].sum() == 20
+    assert len(ds.elements) == 20 + len(ds.annotations)
+
+
+def test_cache_mechanism_updates_partition(dummy_singular_dataset, tmp_path):
+    cache_mechanisms = {"bbox": CacheMechanism(root_uri=URIComponents(path=str(tmp_path)))}
+    ds = SingularDataset(
+        dummy_singular_dataset.samples, dummy_singular_dataset.annotations, cache_mechanisms=cache_mechanisms
+    )
+    box = ds.get(3).annotations["bbox"][0]
+    assert box.data.coords.tolist() == [0, 0, 1, 1]
+    assert isinstance(ds.annotations.loc[(3, "bbox_3_0"), "data"], URIComponents)
+    assert isinstance(ds.elements.loc[(3, "bbox_3_0"), "data"], URIComponents)
+    assert not isinstance(ds.annotations.loc[(3, "bbox_3_1"), "data"], URIComponents)
+
+
+def test_cache_mechanism_leaves_parent_partitions(dummy_singular_dataset, tmp_path):
+    cache_mechanisms = {"bbox": CacheMechanism(root_uri=URIComponents(path=str(tmp_path)))}
+    samples, annotations = dummy_singular_dataset.samples, dummy_singular_dataset.annotations
+    parent = SingularDataset(samples, annotations, cache_mechanisms=cache_mechanisms)
+    child = parent.assign_samples(flag=1)  # shares the annotations partition with `parent`
+    assert child._table.annotations is parent._table.annotations
+    _ = child.get(3).annotations["bbox"][0].data
+    assert isinstance(child.annotations.loc[(3, "bbox_3_0"), "data"], URIComponents)
+    assert not isinstance(parent.annotations.loc[(3, "bbox_3_0"), "data"], URIComponents)
+    assert not isinstance(parent.elements.loc[(3, "bbox_3_0"), "data"], URIComponents)
+    assert not isinstance(annotations.loc[(3, "bbox_3_0"), "data"], URIComponents)
+
+    # once a table has copied a partition it writes in place, until it shares the partition again
+    table = child._table
+    table.update_element("bbox_3_1", {"data": "first", "category": "obj"})
+    copied = table.annotations
+    table.update_element("bbox_3_2", {"data": "second", "category": "obj"})
+    assert table.annotations is copied
+    grandchild = table.with_samples(table.samples)
+    table.update_element("bbox_3_1", {"data": "third", "category": "obj"})
+    assert grandchild.annotations.loc[(3, "bbox_3_1"), "data"] == "first"
+
+
+def test_update_element_writes_unshared_partitions_in_place(dummy_singular_dataset):
+    ds = dummy_singular_dataset.select_samples(lambda samples, annotations: samples["width"] > 10)
+    table = ds._table
+    samples, annotations = table.samples, table.annotations
+    table.update_element("bbox_3_1", {"data": "cached", "category": "obj"})
+    table.update_element("img_3", {"data": "cached", "category": "obj"})
+    assert table.samples is samples and table.annotations is annotations
+    assert ds.annotations.loc[(3, "bbox_3_1"), "data"] == "cached"
+    assert dummy_singular_dataset.annotations.loc[(3, "bbox_3_1"), "data"] != "cached"
+
+    ds.append([], [Element("bbox_20_0", "bbox", LoadMechanism("cached", "obj"), sample_id=3)])
+    assert len(ds) == 17
+    assert ds.sample_ids == dummy_singular_dataset.sample_ids[3:]
+    assert ds._table._pandas is None  # the sample index is built from the partitions
+    expected = SampleIndex.from_elements(ds.elements)
+    assert ds.sample_index.rows_for_id(3).tolist() == expected.rows_for_id(3).tolist() == [0, 17, 18, 19, 44]
+
+
+def test_select_samples_prunes_with_annotation_index(dummy_singular_dataset):
+    ds = dummy_singular_dataset.select_samples(lambda samples, annotations: samples["width"] % 2 == 1)
+    expected = dummy_singular_dataset._prune_annotations(ds.samples, dummy_singular_dataset.annotations)
+    assert ds.annotations.index.equals(expected.index)
+    assert ds._table._annotation_index is not None  # carried over, not rebuilt
+    assert ds.sample_ids == [i for i in range(20) if i % 2 == 1]
+
+    ds = ds.sort_samples("width", ascending=False).select_samples(lambda samples, annotations: samples["width"] > 12)
+    assert ds.sample_ids == [i for i in reversed(range(20)) if i % 2 == 1 and i > 4]
+    assert [len(ds.get(i).annotations.get("bbox", [])) for i in ds.sample_ids] == [i % 4 for i in ds.sample_ids]
+
+
+def test_select_samples_interleaved_annotations(dummy_singular_dataset):
+    ds = dummy_singular_dataset.sort_annotations("category_id")
+    assert not ds._table.annotation_index.is_grouped
+    selected = ds.select_samples(lambda samples, annotations: samples.index.get_level_values("sample_id") < 8)
+    expected = ds._prune_annotations(selected.samples, ds.annotations)
+    assert selected.annotations.index.equals(expected.index)
+    assert selected.annotations["category_id"].is_monotonic_increasing
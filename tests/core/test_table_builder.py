@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bridge.primitives.dataset import Dataset
+from bridge.primitives.dataset.table_builder import ElementTableBuilder
+from bridge.primitives.element.data.load_mechanism import LoadMechanism
+from bridge.primitives.element.element import Element
+from bridge.utils.constants import ELEMENT_COLS
+from bridge.utils.data_objects import ClassLabel
+
+
+def test_append_matches_elements():
+    elements = [
+        Element(element_id=0, sample_id=0, etype="image", load_mechanism=LoadMechanism(1, "obj"), metadata={"w": 5}),
+        Element(element_id="l0", sample_id=0, etype="class_label", load_mechanism=LoadMechanism(ClassLabel(1), "obj")),
+    ]
+    builder = ElementTableBuilder()
+    builder.append(element_id=0, sample_id=0, etype="image", url_or_data=1, category="obj", w=5)
+    builder.append(element_id="l0", sample_id=0, etype="class_label", url_or_data=ClassLabel(1), category="obj")
+    expected = pd.DataFrame([e.to_pd_series() for e in elements]).set_index([ELEMENT_COLS.SAMPLE_ID, ELEMENT_COLS.ID])
+    pd.testing.assert_frame_equal(builder.build(), expected)
+
+
+def test_extend_columns():
+    images = np.zeros((10, 4, 4, 3), dtype="uint8")
+    builder = ElementTableBuilder()
+    builder.extend_columns(
+        element_id=np.arange(10), sample_id=np.arange(10), etype="image", url_or_data=images, category="image"
+    )
+    builder.extend_columns(
+        element_id=[f"label_{i}" for i in range(10)],
+        sample_id=np.arange(10),
+        etype="class_label",
+        url_or_data=[ClassLabel(i % 3) for i in range(10)],
+        category="obj",
+        score=np.linspace(0, 1, 10),
+    )
+    builder.append(element_id="extra", sample_id=3, etype="class_label", url_or_data=ClassLabel(0), category="obj")
+    assert len(builder) == 21
+    df = builder.build()
+    assert df.shape == (21, 4)
+    assert df[ELEMENT_COLS.LOAD_MECHANISM.URL_OR_DATA].iloc[0].shape == (4, 4, 3)
+    assert df["score"].isna().sum() == 11
+    ds = Dataset(df)
+    assert len(ds) == 10
+    assert len(ds.get(3)) == 3
+
+
+def test_metadata_column_order():
+    builder = ElementTableBuilder()
+    builder.append(element_id=0, sample_id=0, etype="box", url_or_data=0, category="obj", zeta=1, alpha=2, mid=3)
+    builder.append(element_id=1, sample_id=0, etype="box", url_or_data=1, category="obj", omega=4, beta=5, alpha=6)
+    builder.append(element_id=2, sample_id=1, etype="box", url_or_data=2, category="obj", gamma=7)
+    columns = ["element_type", "data", "category", "zeta", "alpha", "mid", "omega", "beta", "gamma"]
+    assert builder.build().columns.to_list() == columns
+
+
+def test_reserved_metadata():
+    builder = ElementTableBuilder()
+    with pytest.raises(AssertionError):
+        builder.extend_columns(element_id=[0], sample_id=[0], etype="a", url_or_data=[0], category="obj", data=[1])
+
+
+def test_unregistered_category():
+    builder = ElementTableBuilder()
+    builder.append(element_id=0, sample_id=0, etype="image", url_or_data=1, category="not_a_category")
+    with pytest.raises(AssertionError):
+        builder.build()